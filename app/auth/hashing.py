@@ -0,0 +1,11 @@
+# auth/hashing.py
+# 비밀번호 해시 프로세스 풀에서 실행되는 함수. 풀 프로세스가 이 모듈만 불러오도록 bcrypt 외의 의존성을 두지 않음
+import bcrypt
+
+
+def hash_password(password: bytes, rounds: int) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds))
+
+
+def check_password(password: bytes, hashed: bytes) -> bool:
+    return bcrypt.checkpw(password, hashed)
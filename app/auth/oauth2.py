@@ -5,12 +5,25 @@ from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from config import Config
-from sqlalchemy.orm import Session
-from database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import AsyncSessionLocal
 from models import User as UserModel
+from util.cache import InMemoryCache
 
 auth_scheme = HTTPBearer()
 
+# 사용자 id → 현재 token_version. 인증된 요청마다 DB를 조회하지 않도록 프로세스 내부에 잠시 보관.
+# 로그아웃(버전 증가)은 이 프로세스에서는 즉시, 다른 프로세스에서는 최대 AUTH_USER_CACHE_TTL초 안에 반영됨
+user_versions = InMemoryCache(Config.AUTH_USER_CACHE_MAX_ENTRIES, Config.AUTH_USER_CACHE_TTL)
+
+
+def token_claims(user: UserModel) -> dict:
+    """
+    토큰에 담을 사용자 정보 (사용자 id와 토큰 버전을 담아 요청마다 사용자 조회가 필요 없도록 함)
+    """
+    return {"sub": user.username, "uid": user.id, "ver": user.token_version or 0}
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -25,11 +38,11 @@ def create_refresh_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
     expire = datetime.utcnow() + (expires_delta or timedelta(days=Config.REFRESH_TOKEN_EXPIRE_DAYS))
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, Config.JWT_SECRET, algorithm=Config.JWT_ALGORITHM)
+    return jwt.encode(to_encode, Config.JWT_REFRESH_SECRET, algorithm=Config.JWT_ALGORITHM)
 
-def verify_refresh_token(token: str) -> str:
+def verify_refresh_token(token: str) -> dict:
     """
-    Refresh Token의 유효성을 검사하고 사용자 이름(username)을 반환합니다.
+    Refresh Token의 유효성을 검사하고 토큰의 사용자 정보(sub, uid, ver)를 반환합니다.
     """
     try:
         payload = jwt.decode(token, Config.JWT_REFRESH_SECRET, algorithms=[Config.JWT_ALGORITHM])
@@ -40,7 +53,7 @@ def verify_refresh_token(token: str) -> str:
                 detail="Invalid refresh token",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return username
+        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -48,8 +61,34 @@ def verify_refresh_token(token: str) -> str:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+
+async def _load_user_version(user_id: int) -> Optional[int]:
+    """
+    사용자의 현재 토큰 버전 (캐시에 없을 때만 DB 조회, 없는 사용자면 None)
+    """
+    version = user_versions.get(user_id)
+    if version is None:
+        async with AsyncSessionLocal() as db:
+            version = (
+                await db.execute(
+                    select(UserModel.token_version).filter(UserModel.id == user_id, UserModel.deleted_at.is_(None))
+                )
+            ).scalar()
+        if version is None:
+            return None
+        user_versions.set(user_id, version)
+    return version
+
+
+async def _load_user_id(db: AsyncSession, username: str) -> Optional[int]:
+    user = (
+        await db.execute(select(UserModel.id).filter(UserModel.username == username))
+    ).first()
+    return user.id if user is not None else None
+
+
 # JWT 검증 함수
-def get_current_user(token: str = Depends(auth_scheme), db: Session = Depends(get_db)) -> int:
+async def get_current_user(token: str = Depends(auth_scheme)) -> int:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Invalid token",
@@ -58,13 +97,24 @@ def get_current_user(token: str = Depends(auth_scheme), db: Session = Depends(ge
     try:
         # JWT 토큰 디코딩
         payload = jwt.decode(token.credentials, Config.JWT_SECRET, algorithms=[Config.JWT_ALGORITHM])
-        username: str = payload.get("sub")
-        if username is None:
-            raise credentials_exception
-        user = db.query(UserModel).filter(UserModel.username == username).first()
-        if user is None:
+    except JWTError:
+        raise credentials_exception
+
+    username: str = payload.get("sub")
+    user_id = payload.get("uid")
+    if username is None:
+        raise credentials_exception
+
+    if user_id is None:
+        # 사용자 id가 없는 이전 형식의 토큰 (만료될 때까지만 사용자 이름으로 조회)
+        async with AsyncSessionLocal() as db:
+            user_id = await _load_user_id(db, username)
+        if user_id is None:
             raise credentials_exception
+        return user_id
 
-        return user.id
-    except JWTError:
-        raise credentials_exception
\ No newline at end of file
+    # 로그아웃 등으로 토큰 버전이 올라갔으면 이전 토큰은 거부
+    version = await _load_user_version(user_id)
+    if version is None or payload.get("ver", 0) != version:
+        raise credentials_exception
+    return user_id
@@ -0,0 +1,95 @@
+# auth/password_hasher.py
+import asyncio
+import logging
+import multiprocessing
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from auth.hashing import hash_password, check_password
+from config import Config
+from util.metrics import PASSWORD_HASH_IN_FLIGHT, PASSWORD_HASH_REJECTED, PASSWORD_HASH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+_COST_PATTERN = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+
+class PasswordHasherBusy(Exception):
+    """
+    해시 작업 대기열이 가득 참 (잠시 후 다시 시도)
+    """
+
+
+def hash_cost(hashed: str) -> Optional[int]:
+    """
+    bcrypt 해시 문자열에 기록된 cost 값
+    """
+    match = _COST_PATTERN.match(hashed or "")
+    return int(match.group(1)) if match else None
+
+
+class PasswordHasher:
+    """
+    bcrypt 해시/검증을 전용 프로세스 풀에서 실행하여 API 스레드풀과 CPU를 점유하지 않도록 함.
+    실행 중이거나 대기 중인 작업이 max_pending개를 넘으면 바로 PasswordHasherBusy를 발생시킴 (429로 응답).
+    이벤트 루프에서만 호출하므로 대기 수는 잠금 없이 셈.
+    """
+
+    def __init__(self, workers: int, max_pending: int, rounds: int):
+        self.workers = max(workers, 1)
+        self.max_pending = max(max_pending, 1)
+        self.rounds = rounds
+        self.pending = 0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # 스레드가 여러 개인 API 프로세스를 fork하지 않도록 spawn으로 시작
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, operation: str, fn, *args):
+        if self.pending >= self.max_pending:
+            PASSWORD_HASH_REJECTED.labels(operation).inc()
+            raise PasswordHasherBusy(f"{self.pending} password hash jobs pending")
+        self.pending += 1
+        PASSWORD_HASH_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.pending -= 1
+            PASSWORD_HASH_IN_FLIGHT.dec()
+            PASSWORD_HASH_SECONDS.labels(operation).observe(time.perf_counter() - start)
+
+    async def hash(self, password: str) -> str:
+        hashed = await self._run("hash", hash_password, password.encode("utf-8"), self.rounds)
+        return hashed.decode("utf-8")
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        try:
+            return await self._run("verify", check_password, password.encode("utf-8"), hashed.encode("utf-8"))
+        except ValueError:
+            # bcrypt 형식이 아닌 저장값
+            logger.warning("Stored password hash is not a valid bcrypt hash")
+            return False
+
+    def needs_rehash(self, hashed: str) -> bool:
+        """
+        설정된 cost와 다른 cost로 만들어진 해시인지 (로그인 성공 시 새 cost로 다시 저장)
+        """
+        return hash_cost(hashed) != self.rounds
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    Config.PASSWORD_HASH_WORKERS, Config.PASSWORD_HASH_MAX_PENDING, Config.BCRYPT_ROUNDS
+)
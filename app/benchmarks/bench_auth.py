@@ -0,0 +1,90 @@
+"""
+인증된 no-op 라우트의 처리량 벤치마크.
+기존 get_current_user(토큰 디코딩 후 요청마다 세션을 열어 users를 사용자 이름으로 조회)와
+현재 get_current_user(토큰의 uid/ver + 프로세스 내부 캐시)를 같은 앱에서 비교합니다.
+설정된 DB에 벤치마크용 사용자를 만들었다가 끝나면 삭제합니다.
+
+실행: cd app && python -m benchmarks.bench_auth [요청 수] [동시 요청 수]
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from jose import jwt, JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from auth.oauth2 import auth_scheme, create_access_token, get_current_user, token_claims
+from config import Config
+from database import SessionLocal, get_async_db
+from models import User as UserModel
+
+BENCH_USERNAME = "__bench_auth__"
+
+
+async def legacy_get_current_user(token=Depends(auth_scheme), db: AsyncSession = Depends(get_async_db)) -> int:
+    try:
+        payload = jwt.decode(token.credentials, Config.JWT_SECRET, algorithms=[Config.JWT_ALGORITHM])
+    except JWTError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    user = (await db.execute(select(UserModel.id).filter(UserModel.username == payload.get("sub")))).first()
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return user.id
+
+
+app = FastAPI()
+
+
+@app.get("/legacy")
+async def legacy_route(user_id: int = Depends(legacy_get_current_user)):
+    return {"user_id": user_id}
+
+
+@app.get("/current")
+async def current_route(user_id: int = Depends(get_current_user)):
+    return {"user_id": user_id}
+
+
+async def run(path: str, token: str, total: int, concurrency: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench",
+                                 headers={"Authorization": f"Bearer {token}"}) as client:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def call():
+            async with semaphore:
+                response = await client.get(path)
+                assert response.status_code == 200, response.text
+
+        await call()  # 워밍업 (커넥션 풀, 캐시)
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(total)))
+        return total / (time.perf_counter() - start)
+
+
+async def compare(token: str, total: int, concurrency: int):
+    return await run("/legacy", token, total, concurrency), await run("/current", token, total, concurrency)
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    db = SessionLocal()
+    user = UserModel(username=BENCH_USERNAME, password="-")
+    db.add(user)
+    db.commit()
+    try:
+        token = create_access_token(data=token_claims(user))
+        # 비동기 엔진의 커넥션은 이벤트 루프에 묶여 있으므로 한 루프에서 모두 실행
+        legacy, current = asyncio.run(compare(token, total, concurrency))
+        print(f"requests: {total}, concurrency: {concurrency}")
+        print(f"legacy  (DB lookup per request): {legacy:8.0f} req/s")
+        print(f"current (token claims + cache) : {current:8.0f} req/s ({current / legacy:.1f}x)")
+    finally:
+        db.delete(user)
+        db.commit()
+        db.close()
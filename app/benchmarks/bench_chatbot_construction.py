@@ -0,0 +1,65 @@
+"""
+get_chatbot의 요청당 객체 생성 비용 비교 마이크로 벤치마크.
+기존 방식(요청마다 ChatOpenAI + CallbackManager + ConversationChain 생성)과
+공유 모델에 채팅방 메모리만 붙이는 현재 방식을 비교합니다. 네트워크 호출은 하지 않으므로
+첫 요청의 TLS 핸드셰이크 절감분은 포함되지 않습니다.
+
+실행: cd app && python -m benchmarks.bench_chatbot_construction [반복 횟수]
+"""
+import sys
+import time
+import warnings
+
+from langchain.callbacks.manager import CallbackManager
+from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+from langchain.chains import ConversationChain
+from langchain_community.chat_models import ChatOpenAI
+from langchain.memory import ConversationBufferMemory
+from langchain_core.messages import AIMessage, HumanMessage
+
+from langchainbot.llm import chat_model
+
+warnings.filterwarnings("ignore")
+
+HISTORY = [
+    message
+    for i in range(10)
+    for message in (HumanMessage(content=f"질문 {i}"), AIMessage(content=f"답변 {i}"))
+]
+
+
+def build_memory():
+    memory = ConversationBufferMemory(return_messages=True)
+    memory.chat_memory.messages.extend(HISTORY)
+    return memory
+
+
+def build_per_request():
+    model = ChatOpenAI(temperature=0.7,
+                       model="gpt-4o",
+                       streaming=True,
+                       callback_manager=CallbackManager([StreamingStdOutCallbackHandler()]),
+                       verbose=True)
+    return ConversationChain(llm=model, memory=build_memory())
+
+
+def build_shared():
+    return ConversationChain(llm=chat_model, memory=build_memory())
+
+
+def measure(fn, iterations: int) -> float:
+    fn()  # 워밍업
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1_000_000
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    per_request = measure(build_per_request, iterations)
+    shared = measure(build_shared, iterations)
+    print(f"iterations: {iterations}")
+    print(f"per-request ChatOpenAI : {per_request:8.1f} us/request")
+    print(f"shared ChatOpenAI      : {shared:8.1f} us/request")
+    print(f"eliminated             : {per_request - shared:8.1f} us/request ({per_request / shared:.1f}x)")
@@ -0,0 +1,75 @@
+"""
+학생 context 압축 벤치마크.
+기존 방식(카테고리 섹션을 json.dumps 후 17000자에서 자름)과 render_context(공백/빈 값 정리, 반복 머리말·꼬리말 제거,
+긴 서술형 요약, 카테고리별 토큰 예산)를 문서 크기별로 비교합니다.
+- tokens: context 토큰 수
+- coverage: 세특 항목 중 context에 남은 비율 (앞부분이 잘려 나가지 않았는지)
+- chrome: context에 남은 쪽 머리말 수 (OCR 띄어쓰기 차이로 EXCLUDE_PATTERN이 놓친 것)
+요약은 오프라인으로 재현할 수 있도록 앞부분 1/3을 남기는 요약기를 사용합니다 (--llm이면 실제 요약 모델).
+
+실행: cd app && python -m benchmarks.bench_context_compaction [--llm]
+"""
+import json
+import sys
+
+from benchmarks.bench_parse_ocr_text import synthetic_document
+from util.ocr_parser import parse_ocr_text
+from util.student_context import CATEGORY_SECTIONS, render_contexts
+from util.tokens import count_tokens
+
+PAGE_COUNTS = (8, 15, 25, 40)
+
+
+def noisy_document(pages: int, seed: int) -> str:
+    # OCR이 머리말을 조금 다르게 인식한 경우 (EXCLUDE_PATTERN에 걸리지 않음)
+    return (synthetic_document(pages, seed)
+            .replace("문서확인번호:", "문서확인번호 :")
+            .replace("정부24 gov.kr", "정부 24 gov.kr")
+            .replace("2024년 3월", "2024년 3 월"))
+
+
+def lead_summary(text: str) -> str:
+    words = text.split()
+    return " ".join(words[:max(len(words) // 3, 1)])
+
+
+def legacy_context(data: dict, category: str) -> str:
+    filtered = {name: data.get(name, "") for name in CATEGORY_SECTIONS[category]}
+    return json.dumps(filtered, ensure_ascii=False)[:17000]
+
+
+def detail_labels(data: dict) -> list:
+    labels = []
+    for grade_data in data.get("교과학습발달상황", {}).values():
+        for item in grade_data.get("세부능력 및 특기사항", []):
+            label, _, text = item.partition(": ")
+            labels.append(f"{label}: {' '.join(text.split()[:3])}")
+    return labels
+
+
+def coverage(content: str, labels: list) -> float:
+    if not labels:
+        return 1.0
+    return sum(1 for label in labels if label in content) / len(labels)
+
+
+if __name__ == "__main__":
+    if "--llm" in sys.argv:
+        from langchainbot.summarizer import summarize_passage as summarize
+    else:
+        summarize = lead_summary
+
+    print(f"{'pages':>5} {'category':<15} {'legacy tok':>10} {'new tok':>8} {'saved':>6} "
+          f"{'legacy cov':>10} {'new cov':>8} {'legacy chrome':>13} {'new chrome':>10}")
+    for pages in PAGE_COUNTS:
+        data = json.loads(json.dumps(parse_ocr_text(noisy_document(pages, seed=pages))))
+        snapshots = render_contexts(data, summarize)
+        for category in CATEGORY_SECTIONS:
+            legacy = legacy_context(data, category)
+            new = snapshots[category].content
+            labels = detail_labels(data) if "교과학습발달상황" in CATEGORY_SECTIONS[category] else []
+            legacy_tokens = count_tokens(legacy)
+            print(f"{pages:>5} {category:<15} {legacy_tokens:>10} {snapshots[category].token_count:>8} "
+                  f"{1 - snapshots[category].token_count / legacy_tokens:>6.0%} "
+                  f"{coverage(legacy, labels):>10.0%} {coverage(new, labels):>8.0%} "
+                  f"{legacy.count('문서확인번호'):>13} {new.count('문서확인번호'):>10}")
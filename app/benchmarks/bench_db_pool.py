@@ -0,0 +1,82 @@
+"""
+LLM 호출 동안 커넥션을 잡고 있는 방식과 반납하는 방식(release_async_db)의 비교 벤치마크.
+send_message처럼 조회 → LLM 대기 → 저장 순서로 동작하는 요청을 동시에 보내고, 요청 지연과
+커넥션 풀 대기 시간/타임아웃 수를 측정합니다. 설정된 DB와 풀 설정(DB_POOL_SIZE, DB_MAX_OVERFLOW,
+DB_POOL_TIMEOUT)을 그대로 사용하며 데이터는 변경하지 않습니다.
+
+실행: cd app && python -m benchmarks.bench_db_pool [동시 요청 수] [LLM 지연(초)]
+"""
+import asyncio
+import sys
+import time
+
+from sqlalchemy import exc, text
+
+from config import Config
+from database import AsyncSessionLocal, async_engine, release_async_db
+from db_pool import DB_POOL_CHECKOUT_SECONDS, DB_POOL_CHECKOUT_TIMEOUTS
+
+
+def checkout_totals() -> tuple:
+    seconds = DB_POOL_CHECKOUT_SECONDS.labels("async", "background")
+    count = sum(sample.value for metric in seconds.collect() for sample in metric.samples
+                if sample.name.endswith("_count"))
+    total = sum(sample.value for metric in seconds.collect() for sample in metric.samples
+                if sample.name.endswith("_sum"))
+    timeouts = DB_POOL_CHECKOUT_TIMEOUTS.labels("async", "background")._value.get()
+    return count, total, timeouts
+
+
+async def handle(release: bool, llm_latency: float) -> float:
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        await db.execute(text("SELECT 1"))  # context/대화 기록 조회
+        if release:
+            await release_async_db(db)
+        await asyncio.sleep(llm_latency)  # LLM 응답 대기
+        await db.execute(text("SELECT 1"))  # 메시지 저장
+        await db.commit()
+    return time.perf_counter() - start
+
+
+async def run(release: bool, concurrency: int, llm_latency: float) -> dict:
+    before = checkout_totals()
+    start = time.perf_counter()
+    results = await asyncio.gather(*(handle(release, llm_latency) for _ in range(concurrency)),
+                                   return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    after = checkout_totals()
+
+    latencies = sorted(result for result in results if not isinstance(result, BaseException))
+    failures = [result for result in results if isinstance(result, BaseException)]
+    assert all(isinstance(failure, exc.TimeoutError) for failure in failures), failures
+    checkouts = after[0] - before[0]
+    return {
+        "elapsed": elapsed,
+        "ok": len(latencies),
+        "timeouts": int(after[2] - before[2]),
+        "p95": latencies[int(len(latencies) * 0.95)] if latencies else float("nan"),
+        "wait_avg": (after[1] - before[1]) / checkouts * 1000 if checkouts else 0.0,
+    }
+
+
+async def compare(concurrency: int, llm_latency: float):
+    # 풀을 미리 채워 커넥션 생성 시간은 제외
+    await run(True, Config.DB_POOL_SIZE, 0)
+    held = await run(False, concurrency, llm_latency)
+    released = await run(True, concurrency, llm_latency)
+    await async_engine.dispose()
+    return held, released
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    llm_latency = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+    held, released = asyncio.run(compare(concurrency, llm_latency))
+    print(f"concurrency: {concurrency}, llm latency: {llm_latency}s, pool_size: {Config.DB_POOL_SIZE}, "
+          f"max_overflow: {Config.DB_MAX_OVERFLOW}, pool_timeout: {Config.DB_POOL_TIMEOUT}s")
+    print(f"{'':<9} {'elapsed s':>9} {'ok':>5} {'timeouts':>8} {'p95 s':>7} {'avg checkout wait ms':>20}")
+    for name, result in (("held", held), ("released", released)):
+        print(f"{name:<9} {result['elapsed']:>9.2f} {result['ok']:>5} {result['timeouts']:>8} "
+              f"{result['p95']:>7.2f} {result['wait_avg']:>20.1f}")
@@ -0,0 +1,67 @@
+"""
+요청 처리 중 로그 출력 비용 벤치마크.
+기존 방식(요청마다 print로 학생 context 전체를 stdout에 출력)과 현재 방식(JSON 로그를 대기열에 넣고 별도 스레드에서
+출력, context는 크기만 기록하고 DEBUG 로그는 샘플링)을 비교합니다. 로그 수집기가 느린 상황을 흉내 내기 위해
+출력 스트림은 쓰기마다 지연(sleep)이 있는 가짜 스트림을 사용하며, 요청 처리 쪽(호출 스레드)에서 걸린 시간을 측정합니다.
+
+실행: cd app && python -m benchmarks.bench_logging [요청 수] [쓰기 지연(ms)] [context 크기(자)]
+"""
+import logging
+import statistics
+import sys
+import time
+
+import log_config
+from config import Config
+
+logger = logging.getLogger("benchmarks.bench_logging")
+
+
+class SlowStream:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.chars = 0
+
+    def write(self, text: str):
+        time.sleep(self.latency)
+        self.chars += len(text)
+
+    def flush(self):
+        pass
+
+
+def measure(emit, requests: int) -> dict:
+    latencies = []
+    for i in range(requests):
+        start = time.perf_counter()
+        emit(i)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies) * 1e6,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1e6,
+        "total": sum(latencies) * 1000,
+    }
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    write_latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.001
+    context = "가" * (int(sys.argv[3]) if len(sys.argv) > 3 else 17000)
+
+    legacy_stream = SlowStream(write_latency)
+    legacy = measure(lambda i: print(f"최종 전달 context : {context}", file=legacy_stream), requests)
+
+    log_config.configure_logging()
+    current_stream = SlowStream(write_latency)
+    log_config._listener.handlers[0].setStream(current_stream)
+    current = measure(lambda i: logger.debug("Student context built",
+                                             extra={"student_id": i, "category": "summary",
+                                                    "context_chars": len(context)}), requests)
+    log_config.stop_logging()
+
+    print(f"requests: {requests}, write latency: {write_latency * 1000:.1f}ms, context: {len(context)} chars, "
+          f"debug sample rate: {Config.LOG_DEBUG_SAMPLE_RATE}, log level: {Config.LOG_LEVEL}")
+    print(f"{'':<8} {'p50 us':>8} {'p95 us':>8} {'total ms':>9} {'chars written':>13}")
+    for name, result, stream in (("legacy", legacy, legacy_stream), ("queued", current, current_stream)):
+        print(f"{name:<8} {result['p50']:>8.1f} {result['p95']:>8.1f} {result['total']:>9.1f} {stream.chars:>13}")
@@ -0,0 +1,77 @@
+"""
+메트릭 수집 오버헤드 벤치마크.
+아무 일도 하지 않는 라우트(/chatrooms/{chatroom_id}/ping)의 처리량을 MetricsMiddleware 유무로 비교하고,
+메시지 처리 단계 span(MESSAGE_STAGE_SECONDS.labels(stage).time())과 히스토그램 observe 한 번의 비용을 측정합니다.
+PROMETHEUS_MULTIPROC_DIR를 지정하고 실행하면 멀티프로세스 모드(값을 mmap 파일에 기록)의 비용을 측정합니다.
+
+실행: cd app && python -m benchmarks.bench_metrics_overhead [요청 수] [observe 반복 수]
+"""
+import asyncio
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from util.metrics import MESSAGE_STAGE_SECONDS, MULTIPROC_DIR, MetricsMiddleware
+
+
+def build_app(instrumented: bool) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/chatrooms/{chatroom_id}/ping")
+    async def ping(chatroom_id: int):
+        return {}
+
+    if instrumented:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def throughput(app: FastAPI, requests: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # 첫 요청(라우터/미들웨어 스택 생성)은 측정에서 제외
+        await client.get("/chatrooms/1/ping")
+        start = time.perf_counter()
+        for i in range(requests):
+            await client.get(f"/chatrooms/{i}/ping")
+        return requests / (time.perf_counter() - start)
+
+
+def per_call_us(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def span():
+    with MESSAGE_STAGE_SECONDS.labels("bench").time():
+        pass
+
+
+async def compare(requests: int):
+    # 순서에 따른 차이를 줄이기 위해 번갈아 두 번씩 측정하고 좋은 값을 사용
+    plain, instrumented = [], []
+    for _ in range(2):
+        plain.append(await throughput(build_app(False), requests))
+        instrumented.append(await throughput(build_app(True), requests))
+    return max(plain), max(instrumented)
+
+
+if __name__ == "__main__":
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+
+    plain, instrumented = asyncio.run(compare(requests))
+    histogram = MESSAGE_STAGE_SECONDS.labels("bench")
+    observe_us = per_call_us(lambda: histogram.observe(0.1), repeat)
+    span_us = per_call_us(span, repeat)
+
+    print(f"requests: {requests}, mode: {'multiprocess' if MULTIPROC_DIR else 'single process'}")
+    print(f"{'':<13} {'req/s':>8} {'us/request':>10}")
+    for name, rate in (("plain", plain), ("instrumented", instrumented)):
+        print(f"{name:<13} {rate:>8.0f} {1e6 / rate:>10.1f}")
+    print(f"middleware overhead: {1e6 / instrumented - 1e6 / plain:.1f} us/request")
+    print(f"histogram observe: {observe_us:.2f} us, stage span (labels + time): {span_us:.2f} us")
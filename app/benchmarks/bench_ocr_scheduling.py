@@ -0,0 +1,92 @@
+"""
+문서 크기별 OCR 종단 지연 벤치마크 (스텁 OCR 서버 사용).
+기존 방식(10쪽 고정 분할, 페이지 순서대로 실행)과 plan_chunks(워커 수/요청당 쪽수 제한 기반 균등 분할,
+긴 조각 우선)를 비교합니다. Celery 워커 동시 실행은 같은 수의 스레드로 흉내 내며,
+분할(PdfWriter) 시간과 OCR 요청 시간을 모두 포함합니다.
+
+실행: cd app && python -m benchmarks.bench_ocr_scheduling [워커 수] [쪽당 지연(초)] [요청당 지연(초)]
+"""
+import io
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from benchmarks.stub_ocr_server import serve
+from util.ocr_client import OCRClient, build_session
+from util.ocr_scheduler import Chunk, plan_chunks
+from util.rate_limit import TokenBucket
+
+PAGE_COUNTS = (3, 10, 25, 45, 80, 110, 200)
+PORT = 8092
+
+
+def blank_pdf(pages: int) -> bytes:
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(595, 842)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def legacy_plan(total_pages: int) -> list:
+    max_pages = 10
+    return [
+        Chunk(i, i * max_pages, min((i + 1) * max_pages, total_pages))
+        for i in range((total_pages + max_pages - 1) // max_pages)
+    ]
+
+
+def split(file_bytes: bytes, chunks: list) -> list:
+    reader = PdfReader(io.BytesIO(file_bytes))
+    total_pages = len(reader.pages)
+    parts = []
+    for chunk in chunks:
+        if chunk.pages == total_pages:
+            parts.append(file_bytes)
+            continue
+        writer = PdfWriter()
+        for j in range(chunk.start_page, chunk.end_page):
+            writer.add_page(reader.pages[j])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        parts.append(buffer.getvalue())
+    return parts
+
+
+def run_document(client: OCRClient, file_bytes: bytes, chunks: list, workers: int) -> float:
+    start = time.perf_counter()
+    parts = split(file_bytes, chunks)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(client.recognize, part, f"split_{chunk.index + 1}.pdf")
+                   for chunk, part in zip(chunks, parts)]
+        texts = [future.result() for future in futures]
+    # 페이지 순서로 되돌려 모든 쪽이 처리되었는지 확인
+    ordered = [text for _, text in sorted(zip([chunk.index for chunk in chunks], texts))]
+    assert sum(text.count("쪽 텍스트") for text in ordered) == sum(chunk.pages for chunk in chunks)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    page_latency = float(sys.argv[2]) if len(sys.argv) > 2 else 0.05
+    request_latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+
+    server, state = serve(PORT, page_latency, 0.0, request_latency=request_latency)
+    client = OCRClient(f"http://127.0.0.1:{PORT}/ocr", "stub", TokenBucket(None, "bench", 0, 1),
+                       build_session(workers), max_attempts=1)
+    try:
+        print(f"workers: {workers}, stub latency: {request_latency}s/request + {page_latency}s/page")
+        print(f"{'pages':>5} {'legacy chunks':>13} {'legacy s':>9} {'planned chunks':>14} {'planned s':>10} {'speedup':>8}")
+        for pages in PAGE_COUNTS:
+            file_bytes = blank_pdf(pages)
+            legacy_chunks = legacy_plan(pages)
+            planned_chunks = plan_chunks(pages, workers, max_pages_per_request=10)
+            legacy = run_document(client, file_bytes, legacy_chunks, workers)
+            planned = run_document(client, file_bytes, planned_chunks, workers)
+            print(f"{pages:>5} {len(legacy_chunks):>13} {legacy:>9.2f} {len(planned_chunks):>14} {planned:>10.2f} "
+                  f"{legacy / planned:>7.1f}x")
+    finally:
+        server.shutdown()
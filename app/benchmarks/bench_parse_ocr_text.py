@@ -0,0 +1,201 @@
+"""
+parse_ocr_text 문서 길이별 파싱 시간 벤치마크.
+기존 구현(호출마다 정규식 컴파일 + 10개 분기 lazy 매칭)을 골든 기준으로 두고,
+합성 OCR 텍스트(10~200쪽)와 예외 케이스에서 현재 파서의 결과가 동일한지 확인한 뒤 시간을 비교합니다.
+
+실행: cd app && python -m benchmarks.bench_parse_ocr_text [반복 횟수]
+"""
+import json
+import random
+import re
+import sys
+import time
+from collections import defaultdict
+from typing import Dict
+
+from util.ocr_parser import parse_ocr_text
+
+PAGE_SIZES = (10, 25, 50, 100, 200)
+
+
+def legacy_parse_ocr_text(text: str) -> Dict:
+    """
+    기존 parse_ocr_text 구현 (비교 기준)
+    """
+    exclude_pattern = re.compile(
+        r"문서확인번호:\s*\d+-\d+-\d+-\d+\s*\(신청인:\s*[\S\s]+?\)\s*|"
+        r"문서확인번호:\s*\d+-\d+-\d+-\d+\s*\(신청인\s*:\s*.*?\)\s*|"
+        r"정부24\s+gov\.kr|"
+        r"\S+고등학교\s*\d{4}년\s*\d{1,2}월\s*\d{1,2}일\s*\d+/\d+\s*반\s*\d+\s*번호\s*\d+\s*이름\s*\S+|"
+        r"본\s증명서는\s열람용이며,\s법적\s효력이\s없습니다\."
+    )
+    pattern = re.compile(
+        r"(1\.\s*인적\s*사항)(.*?)(?=2\.\s*학적\s*사항|$)|"
+        r"(2\.\s*학적\s*사항)(.*?)(?=3\.\s*출결\s*상황|$)|"
+        r"(3\.\s*출결\s*상황)(.*?)(?=4\.\s*수\s*상\s*경\s*력|$)|"
+        r"(4\.\s*수\s*상\s*경\s*력)(.*?)(?=5\.\s*자격증\s*및\s*인증\s*취득\s*상황|$)|"
+        r"(5\.\s*자격증\s*및\s*인증\s*취득\s*상황)(.*?)(?=6\.\s*진로\s*희망\s*사항|$)|"
+        r"(6\.\s*진로\s*희망\s*사항)(.*?)(?=7\.\s*창의적\s*체험\s*활동\s*상황|$)|"
+        r"(7\.\s*창의적\s*체험\s*활동\s*상황)(.*?)(?=8\.\s*교과\s*학습\s*발달\s*상황|$)|"
+        r"(8\.\s*교과\s*학습\s*발달\s*상황)(.*?)(?=9\.\s*독서\s*활동\s*상황|$)|"
+        r"(9\.\s*독서\s*활동\s*상황)(.*?)(?=10\.\s*행동\s*특성\s*및\s*종합\s*의견|$)|"
+        r"(10\.\s*행동\s*특성\s*및\s*종합\s*의견)(.*?)(?=$)",
+        re.DOTALL
+    )
+    names = ["인적사항", "학적사항", "출결사항", "수상경력", "자격증 및 인증 취득상황", "진로희망사항",
+             "창의적 체험활동상황", "교과학습발달상황", "독서활동상황", "행동특성 및 종합의견"]
+    split_text = {name: "" for name in names}
+    for match in pattern.finditer(text):
+        section_content = next((match.group(i) for i in range(2, 21, 2) if match.group(i)), "").strip()
+        section_content = exclude_pattern.sub("", section_content).strip()
+        for index, name in enumerate(names):
+            if match.group(index * 2 + 1):
+                split_text[name] = section_content
+                break
+    split_text["교과학습발달상황"] = legacy_parse_academic_performance(split_text["교과학습발달상황"])
+    return split_text
+
+
+def legacy_parse_academic_performance(text: str) -> Dict:
+    grades_data = defaultdict(lambda: {"성적": [], "세부능력 및 특기사항": [], "체육 및 예술": [], "특기사항": []})
+    grade_pattern = re.compile(r"\[(\d학년)\](.*?)(?=(\[\d학년\]|$))", re.DOTALL)
+    subject_pattern = re.compile(
+        r"(?P<교과>[\w()]+)\s(?P<과목>[^\s\d]+(?:\s[I]+)?)\s(?P<단위수>\d+)\s(?P<원점수_과목평균>\d+/[\d.]+)\((?P<표준편차>[\d.]+)\)\s("
+        r"?P<성취도>[A-E])\((?P<수강자수>\d+)\)\s(?P<석차>\d+)",
+        re.DOTALL
+    )
+    extra_pattern = re.compile(
+        r"세부능력및특기사항(.*?)(?=<\s*체육\s*[·.]?\s*예술\s*\(음악/미술\)\s*>|세부능력및특기사항|특기사항|$)|"
+        r"<\s*체육\s*[·.]?\s*예술\s*\(음악/미술\)\s*>(.*?)(?=특기사항|$)|"
+        r"특기사항(.*?)(?=(\[\d학년\]|$))",
+        re.DOTALL
+    )
+    individual_subject_pattern = re.compile(r"([가-힣]+(?:I{1,2}|[A-Z]?)?):\s*(.*?)(?=([가-힣]+(?:I{1,2}|[A-Z]?)?:|$))",
+                                            re.DOTALL)
+    physical_arts_pattern = re.compile(
+        r"(?P<교과>체육|예술\(음악/미술\))\s(?P<과목>.+?)\s(?P<단위수_1학기>\d+)\s(?P<성취도_1학기>[A-E])\s(?P<단위수_2학기>\d+)\s(?P<성취도_2학기>[A-E])",
+        re.DOTALL
+    )
+    for grade_match in grade_pattern.finditer(text):
+        grade = grade_match.group(1)
+        grade_text = grade_match.group(2)
+        for m in subject_pattern.finditer(grade_text):
+            grades_data[grade]["성적"].append({
+                key: m.group(key) for key in ("교과", "과목", "단위수", "원점수_과목평균", "성취도", "석차", "표준편차", "수강자수")
+            })
+        for match in extra_pattern.findall(grade_text):
+            if match[0]:
+                for sub_match in individual_subject_pattern.finditer(match[0].strip()):
+                    grades_data[grade]["세부능력 및 특기사항"].append(f"{sub_match.group(1)}: {sub_match.group(2).strip()}")
+            if match[1]:
+                for m in physical_arts_pattern.finditer(match[1].strip()):
+                    grades_data[grade]["체육 및 예술"].append({
+                        key: m.group(key) for key in ("교과", "과목", "단위수_1학기", "성취도_1학기", "단위수_2학기", "성취도_2학기")
+                    })
+            if match[2]:
+                grades_data[grade]["특기사항"].append(match[2].strip())
+    return grades_data
+
+
+SUBJECTS = [("국어", "문학"), ("수학", "수학I"), ("수학", "수학II"), ("영어", "영어I"), ("과학", "물리학I"),
+            ("사회", "한국지리"), ("과학", "화학I"), ("한국사", "한국사")]
+WORDS = ["수업", "시간에", "적극적으로", "참여하며", "탐구", "보고서를", "작성함", "발표", "능력이", "뛰어나고",
+         "친구들과", "협력하여", "문제를", "해결함", "꾸준히", "성장하는", "모습을", "보임"]
+
+
+def page_header(rng: random.Random, page: int, total: int) -> str:
+    return (f" 정부24 gov.kr 한빛고등학교 2024년 3월 {rng.randint(1, 28)}일 {page}/{total} 반 3 번호 12 이름 홍길동 "
+            f"문서확인번호: 1234-5678-{rng.randint(1000, 9999)}-3456 (신청인: 홍길동) ")
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def grade_block(rng: random.Random, grade: int, pages: int, total: int, page_no: int) -> str:
+    parts = [f"[{grade}학년] 학기 교과 과목 단위수 원점수/과목평균(표준편차) 성취도(수강자수) 석차등급 "]
+    for subject, course in SUBJECTS:
+        parts.append(f"{subject} {course} {rng.randint(2, 5)} {rng.randint(50, 100)}/{rng.randint(50, 90)}.{rng.randint(0, 9)}"
+                     f"({rng.randint(5, 25)}.{rng.randint(0, 9)}) {rng.choice('ABCDE')}({rng.randint(100, 300)}) {rng.randint(1, 9)} ")
+    for page in range(pages):
+        parts.append(page_header(rng, page_no + page, total))
+        parts.append("세부능력및특기사항 ")
+        for _, course in SUBJECTS:
+            parts.append(f"{course}: {sentence(rng, 25)}. ")
+    parts.append("< 체육 · 예술 (음악/미술) > 체육 운동과건강 2 A 2 A 예술(음악/미술) 음악 2 B 2 A ")
+    parts.append(f"특기사항 {sentence(rng, 20)}. ")
+    return "".join(parts)
+
+
+def synthetic_document(pages: int, seed: int = 0) -> str:
+    """
+    pages쪽 분량의 생활기록부 OCR 텍스트 생성 (교과학습발달상황이 대부분을 차지)
+    """
+    rng = random.Random(seed)
+    detail_pages = max(pages - 6, 3)
+    per_grade = [detail_pages // 3 + (1 if i < detail_pages % 3 else 0) for i in range(3)]
+    parts = [
+        page_header(rng, 1, pages),
+        "1. 인적 사항 학생성명: 홍길동 성별: 남 주민등록번호: 070101-3****** 주소: 서울특별시 ",
+        "2. 학적사항 2023년 03월 02일 한빛고등학교 제1학년 입학 ",
+        "3. 출결상황 학년 수업일수 결석일수 1 190 0 2 190 1 3 190 0 ",
+        "4. 수 상 경 력 " + " ".join(f"교내 경시대회 우수상({i}위) 2023.05.{i:02d} 한빛고등학교장" for i in range(1, 8)) + " ",
+        "5. 자격증 및 인증 취득상황 해당 사항 없음 ",
+        "6. 진로희망사항 1학년 소프트웨어 개발자 2학년 데이터 과학자 ",
+        "7. 창의적 체험활동상황 자율활동 " + sentence(rng, 200) + " 동아리활동 " + sentence(rng, 200) + " ",
+        page_header(rng, 2, pages),
+        "8. 교과학습발달상황 ",
+    ]
+    page_no = 3
+    for grade, grade_pages in enumerate(per_grade, start=1):
+        parts.append(grade_block(rng, grade, grade_pages, pages, page_no))
+        page_no += grade_pages
+    parts.append("9. 독서활동상황 " + sentence(rng, 150) + " ")
+    parts.append("10. 행동특성 및 종합의견 " + sentence(rng, 300) + " 본 증명서는 열람용이며, 법적 효력이 없습니다. ")
+    return "".join(parts)
+
+
+def edge_cases() -> list:
+    base = synthetic_document(10, seed=1)
+    return [
+        "",
+        "헤더가 없는 텍스트",
+        base + "\n",
+        base.replace("2. 학적사항", "2.학적  사항"),
+        base.replace("2. 학적사항", "학적사항"),  # 다음 헤더가 없으면 끝까지
+        base.replace("9. 독서활동상황", ""),
+        base + " 1. 인적사항 다시 나온 인적사항 ",  # 같은 섹션이 두 번 나오면 나중 값
+        "10. 행동특성 및 종합의견 1. 인적사항 홍길동 2. 학적사항 입학\n",
+        "8. 교과학습발달상황 [1학년] 국어 문학 4 90/70.1(10.2) A(200) 2\n",
+        base.replace("[2학년]", "[2학년]\n"),
+        # 직전 성적 행이 토큰 중간에서 끝나는 경우, 띄어쓰기 없이 이어진 과목명 라벨
+        "8. 교과학습발달상황 [1학년] 국어 문학 4 90/70.1(10.2) A(200) 2국어 문학 3 88/71.0(9.9) B(180) 3 "
+        "세부능력및특기사항 가나다라마바사수학I:탐구함 국어:발표함영어A: 토론함:정리함",
+    ]
+
+
+def as_json(result: Dict) -> str:
+    return json.dumps(result, ensure_ascii=False, sort_keys=True)
+
+
+def measure(fn, text: str, iterations: int) -> float:
+    fn(text)  # 워밍업
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn(text)
+    return (time.perf_counter() - start) / iterations * 1000
+
+
+if __name__ == "__main__":
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    corpus = [synthetic_document(pages, seed=pages) for pages in PAGE_SIZES] + edge_cases()
+    mismatches = [i for i, text in enumerate(corpus) if as_json(parse_ocr_text(text)) != as_json(legacy_parse_ocr_text(text))]
+    print(f"golden corpus: {len(corpus)} documents, mismatches: {mismatches or 'none'}")
+
+    print(f"{'pages':>5} {'chars':>9} {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    for pages in PAGE_SIZES:
+        text = synthetic_document(pages, seed=pages)
+        legacy = measure(legacy_parse_ocr_text, text, iterations)
+        current = measure(parse_ocr_text, text, iterations)
+        print(f"{pages:>5} {len(text):>9} {legacy:>10.2f} {current:>11.2f} {legacy / current:>7.1f}x")
@@ -0,0 +1,45 @@
+"""
+생활기록부 문단 검색 벤치마크 (오프라인 해싱 임베딩 사용).
+문서 크기별로 인덱스 생성 시간, 질문당 검색 시간(memory-mapped 인덱스), 전체 context 대비 검색 context의 토큰 수와
+특정 활동을 묻는 질문에서 그 활동을 적은 세특 문단(needle)이 검색되는지를 측정합니다.
+
+실행: cd app && python -m benchmarks.bench_passage_retrieval
+"""
+import json
+import tempfile
+import time
+
+from benchmarks.bench_parse_ocr_text import synthetic_document
+from config import Config
+from langchainbot.embeddings import HashingEmbedder
+from util.ocr_parser import parse_ocr_text
+from util.passage_index import RELATED_KEY, build_passage_index, retrieve_context
+from util.student_context import render_contexts
+from util.tokens import count_tokens
+
+PAGE_COUNTS = (15, 25, 40)
+QUERIES = 50
+NEEDLE = "물리학I: 전자기 유도 실험을 설계하고 코일 감은 수에 따른 유도 전류 변화를 측정하여 결과를 발표함."
+QUESTION = "전자기 유도 실험에서 보인 탐구 역량을 바탕으로 학과를 추천해 주세요"
+
+if __name__ == "__main__":
+    Config.PASSAGE_INDEX_DIR = tempfile.mkdtemp(prefix="passage-index-")
+    embedder = HashingEmbedder()
+    print(f"{'pages':>5} {'passages':>8} {'build ms':>8} {'query ms':>8} {'full tok':>8} {'retrieved tok':>13} {'needle found':>12}")
+    for record_id, pages in enumerate(PAGE_COUNTS, start=1):
+        data = json.loads(json.dumps(parse_ocr_text(synthetic_document(pages, seed=pages))))
+        data["교과학습발달상황"]["2학년"]["세부능력 및 특기사항"].insert(3, NEEDLE)
+        start = time.perf_counter()
+        passages = build_passage_index(record_id, data, embedder)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(QUERIES):
+            context = retrieve_context(record_id, "recommendation", QUESTION, embedder)
+        query_ms = (time.perf_counter() - start) * 1000 / QUERIES
+
+        full = render_contexts(data)["recommendation"]
+        related = json.loads(context)[RELATED_KEY]
+        found = any(NEEDLE in item for item in related)
+        print(f"{pages:>5} {passages:>8} {build_ms:>8.1f} {query_ms:>8.2f} {full.token_count:>8} "
+              f"{count_tokens(context):>13} {str(found):>12}")
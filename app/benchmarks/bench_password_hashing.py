@@ -0,0 +1,108 @@
+"""
+로그인 폭주 중 다른 동기 라우트의 지연 벤치마크.
+기존 방식(동기 핸들러 안에서 bcrypt.checkpw 실행, API 스레드풀 점유)과 PasswordHasher(전용 프로세스 풀 +
+대기열 한도, 넘으면 429)를 비교합니다. 채팅 라우트처럼 스레드풀에서 실행되는 짧은 동기 라우트(/ping)를
+로그인 요청과 동시에 일정 간격으로 호출하여 지연을 측정합니다.
+
+실행: cd app && python -m benchmarks.bench_password_hashing [로그인 요청 수] [bcrypt cost]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import bcrypt
+import httpx
+from fastapi import FastAPI, HTTPException
+
+from auth.password_hasher import PasswordHasher, PasswordHasherBusy
+from config import Config
+
+PASSWORD = "correct horse battery staple"
+PING_INTERVAL = 0.02
+
+app = FastAPI()
+hasher = PasswordHasher(Config.PASSWORD_HASH_WORKERS, Config.PASSWORD_HASH_MAX_PENDING, Config.BCRYPT_ROUNDS)
+stored_hash = b""
+
+
+@app.post("/legacy-login")
+def legacy_login():
+    if not bcrypt.checkpw(PASSWORD.encode("utf-8"), stored_hash):
+        raise HTTPException(status_code=400)
+    return {}
+
+
+@app.post("/login")
+async def login():
+    try:
+        if not await hasher.verify(PASSWORD, stored_hash.decode("utf-8")):
+            raise HTTPException(status_code=400)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=429)
+    return {}
+
+
+@app.get("/ping")
+def ping():
+    time.sleep(0.002)
+    return {}
+
+
+async def storm(path: str, logins: int) -> dict:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        statuses = []
+        ping_latencies = []
+        done = asyncio.Event()
+
+        async def login_call():
+            statuses.append((await client.post(path)).status_code)
+
+        async def pinger():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.get("/ping")
+                ping_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(PING_INTERVAL)
+
+        start = time.perf_counter()
+        ping_task = asyncio.create_task(pinger())
+        await asyncio.gather(*(login_call() for _ in range(logins)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await ping_task
+
+    ping_latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "ok": statuses.count(200),
+        "rejected": statuses.count(429),
+        "ping_p50": statistics.median(ping_latencies) * 1000,
+        "ping_p95": ping_latencies[int(len(ping_latencies) * 0.95)] * 1000,
+        "ping_max": ping_latencies[-1] * 1000,
+    }
+
+
+async def compare(logins: int):
+    # 프로세스 풀 시작 비용은 측정에서 제외
+    await hasher.verify(PASSWORD, stored_hash.decode("utf-8"))
+    return await storm("/legacy-login", logins), await storm("/login", logins)
+
+
+if __name__ == "__main__":
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    hasher.rounds = int(sys.argv[2]) if len(sys.argv) > 2 else Config.BCRYPT_ROUNDS
+    stored_hash = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(hasher.rounds))
+
+    try:
+        legacy, current = asyncio.run(compare(logins))
+    finally:
+        hasher.shutdown()
+
+    print(f"logins: {logins}, bcrypt cost: {hasher.rounds}, hash workers: {hasher.workers}, "
+          f"max pending: {hasher.max_pending}")
+    print(f"{'':<8} {'elapsed s':>9} {'ok':>5} {'429':>5} {'ping p50 ms':>11} {'ping p95 ms':>11} {'ping max ms':>11}")
+    for name, result in (("legacy", legacy), ("pool", current)):
+        print(f"{name:<8} {result['elapsed']:>9.2f} {result['ok']:>5} {result['rejected']:>5} "
+              f"{result['ping_p50']:>11.1f} {result['ping_p95']:>11.1f} {result['ping_max']:>11.1f}")
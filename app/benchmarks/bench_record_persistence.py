@@ -0,0 +1,142 @@
+"""
+OCR 결과 DB 저장 벤치마크.
+기존 방식(작업마다 next(get_db())로 세션을 열어 create_pdf_file로 커밋 + refresh, 세션을 닫지 않고 문단 인덱스 생성)과
+현재 방식(저장 대기열에서 OCR_PERSIST_BATCH_SIZE개씩 create_pdf_files로 한 트랜잭션 저장, 세션은 바로 닫고
+인덱스는 별도 태스크)을 비교합니다. Celery 워커 동시 실행은 같은 수의 스레드로 흉내 내며, 문단 인덱스 생성은
+지연(sleep)으로 대신합니다. context는 미리 만들어 두어 요약 시간은 제외합니다.
+- statements/record: 기록 하나당 실행한 SQL 문 수 (executemany는 한 번)
+- peak connections: 동시에 사용 중이던 커넥션 수의 최댓값
+- leaked: 모든 작업이 끝난 뒤에도 반납되지 않은 커넥션 수 (닫지 않은 세션은 순환 참조 GC 전까지 커넥션을 잡고 있음)
+- failed: 커넥션 풀 타임아웃 등으로 실패한 작업 수
+설정된 DB에 벤치마크용 사용자와 기록을 만들었다가 끝나면 삭제합니다.
+
+실행: cd app && python -m benchmarks.bench_record_persistence [작업 수] [워커 수] [인덱스 지연(초)]
+"""
+import gc
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import delete, event, select
+
+from benchmarks.bench_parse_ocr_text import synthetic_document
+from config import Config
+from crud.student_record_crud import build_pdf_file, create_pdf_files, render_record_contexts
+from database import SessionLocal, engine, get_db, session_scope
+from models import StudentGrade, StudentRecord, StudentRecordContext, StudentRecordSection, User as UserModel
+from util.ocr_parser import parse_ocr_text
+
+BENCH_USERNAME = "__bench_persistence__"
+
+
+class PoolWatcher:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.statements = 0
+        self.peak = 0
+        event.listen(engine, "before_cursor_execute", self.on_execute)
+        event.listen(engine, "checkout", self.on_checkout)
+
+    def on_execute(self, *args):
+        with self.lock:
+            self.statements += 1
+
+    def on_checkout(self, *args):
+        with self.lock:
+            self.peak = max(self.peak, engine.pool.checkedout())
+
+    def reset(self):
+        with self.lock:
+            self.statements = 0
+            self.peak = engine.pool.checkedout()
+
+
+def legacy_job(item: dict, index_latency: float):
+    db = next(get_db())
+    new_file = build_pdf_file(**item)
+    db.add(new_file)
+    db.commit()
+    db.refresh(new_file)
+    time.sleep(index_latency)  # 세션을 닫지 않은 채 문단 인덱스 생성
+    return new_file.id
+
+
+def batched_run(items: list, workers: int, index_latency: float):
+    batch_size = Config.OCR_PERSIST_BATCH_SIZE
+    batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    def persist(batch):
+        with session_scope() as db:
+            return create_pdf_files(db, batch)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # 저장은 잠금을 잡은 한 워커가 순서대로, 인덱스 태스크는 워커들이 나누어 실행
+        index_futures = []
+        for batch in batches:
+            for record_id in persist(batch):
+                index_futures.append(executor.submit(time.sleep, index_latency))
+        for future in index_futures:
+            future.result()
+
+
+def cleanup(user_id: int):
+    with SessionLocal() as db:
+        record_ids = select(StudentRecord.id).where(StudentRecord.user_id == user_id)
+        for model in (StudentRecordSection, StudentGrade, StudentRecordContext):
+            db.execute(delete(model).where(model.student_record_id.in_(record_ids)))
+        db.execute(delete(StudentRecord).where(StudentRecord.user_id == user_id))
+        db.execute(delete(UserModel).where(UserModel.id == user_id))
+        db.commit()
+
+
+if __name__ == "__main__":
+    jobs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    index_latency = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+
+    documents = [parse_ocr_text(synthetic_document(8, seed)) for seed in range(10)]
+    contexts = [render_record_contexts(data) for data in documents]
+
+    with SessionLocal() as db:
+        user = UserModel(username=BENCH_USERNAME, password="-")
+        db.add(user)
+        db.commit()
+        user_id = user.id
+
+    def items(tag: str) -> list:
+        return [
+            {"file_name": f"{tag}_{i}.pdf", "file_url": f"bench/{tag}_{i}.pdf", "user_id": user_id,
+             "ocr_data": documents[i % len(documents)], "file_hash": f"{tag}-{i}",
+             "contexts": contexts[i % len(documents)]}
+            for i in range(jobs)
+        ]
+
+    watcher = PoolWatcher()
+    results = {}
+    try:
+        watcher.reset()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(legacy_job, item, index_latency) for item in items("legacy")]
+            failed = sum(1 for future in futures if future.exception() is not None)
+        results["legacy"] = (time.perf_counter() - start, watcher.statements, watcher.peak,
+                             engine.pool.checkedout(), failed)
+        gc.collect()
+
+        watcher.reset()
+        start = time.perf_counter()
+        batched_run(items("batched"), workers, index_latency)
+        results["batched"] = (time.perf_counter() - start, watcher.statements, watcher.peak,
+                              engine.pool.checkedout(), 0)
+    finally:
+        gc.collect()
+        cleanup(user_id)
+
+    print(f"jobs: {jobs}, workers: {workers}, index latency: {index_latency}s, "
+          f"batch size: {Config.OCR_PERSIST_BATCH_SIZE}, pool: {Config.DB_POOL_SIZE}+{Config.DB_MAX_OVERFLOW}")
+    print(f"{'':<8} {'elapsed s':>9} {'records/s':>9} {'statements/record':>17} {'peak connections':>16} "
+          f"{'leaked':>6} {'failed':>6}")
+    for name, (elapsed, statements, peak, leaked, failed) in results.items():
+        print(f"{name:<8} {elapsed:>9.2f} {jobs / elapsed:>9.1f} {statements / jobs:>17.1f} {peak:>16} "
+              f"{leaked:>6} {failed:>6}")
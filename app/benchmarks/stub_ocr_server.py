@@ -0,0 +1,119 @@
+"""
+OCR API를 흉내 내는 로컬 스텁 서버. 재시도/레이트 리밋/동시 처리 동작을 실제 API 없이 확인할 때 사용합니다.
+요청으로 받은 PDF의 쪽수만큼 필드를 돌려주며, 요청당/쪽당 지연과 429/503 실패 비율을 지정할 수 있습니다.
+
+실행: cd app && python -m benchmarks.stub_ocr_server --port 8081 --page-latency 0.2 --fail-rate 0.2
+      OCR_API_INVOKE_URL=http://localhost:8081/ocr 로 워커를 실행
+"""
+import argparse
+import email
+import email.policy
+import io
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from PyPDF2 import PdfReader
+
+
+class StubState:
+    def __init__(self, page_latency: float, fail_rate: float, retry_after: int, request_latency: float = 0.0):
+        self.page_latency = page_latency
+        self.request_latency = request_latency
+        self.fail_rate = fail_rate
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+
+def read_pdf(content_type: str, body: bytes) -> bytes:
+    message = email.message_from_bytes(
+        f"Content-Type: {content_type}\r\n\r\n".encode() + body, policy=email.policy.default
+    )
+    for part in message.iter_parts():
+        if part.get_param("name", header="content-disposition") == "file":
+            return part.get_payload(decode=True)
+    return b""
+
+
+def make_handler(state: StubState):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status: int, data: dict, headers: dict = None):
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            # 누적 통계 조회
+            with state.lock:
+                self._send_json(200, {
+                    "requests": state.requests,
+                    "failures": state.failures,
+                    "max_in_flight": state.max_in_flight,
+                })
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            with state.lock:
+                state.requests += 1
+                fail = random.random() < state.fail_rate
+                if fail:
+                    state.failures += 1
+                    status = random.choice((429, 503))
+                else:
+                    state.in_flight += 1
+                    state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            if fail:
+                self._send_json(status, {"error": "stub failure"}, {"Retry-After": str(state.retry_after)})
+                return
+
+            try:
+                pages = len(PdfReader(io.BytesIO(read_pdf(self.headers["Content-Type"], body))).pages)
+                time.sleep(state.request_latency + state.page_latency * pages)
+                fields = [{"inferText": f"{page + 1}쪽 텍스트"} for page in range(pages)]
+                self._send_json(200, {"images": [{"fields": fields}]})
+            finally:
+                with state.lock:
+                    state.in_flight -= 1
+
+    return Handler
+
+
+def serve(port: int, page_latency: float, fail_rate: float, retry_after: int = 1, request_latency: float = 0.0):
+    """
+    스텁 서버를 백그라운드 스레드로 시작하고 (서버, 상태)를 반환
+    """
+    state = StubState(page_latency, fail_rate, retry_after, request_latency)
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--page-latency", type=float, default=0.2, help="쪽당 처리 시간(초)")
+    parser.add_argument("--request-latency", type=float, default=0.0, help="요청당 고정 처리 시간(초)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="429/503 응답 비율")
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    server, _ = serve(args.port, args.page_latency, args.fail_rate, args.retry_after, args.request_latency)
+    print(f"stub OCR server on http://127.0.0.1:{args.port}/ocr")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,5 +1,12 @@
+import os
 from celery import Celery
+from celery.signals import (
+    before_task_publish, setup_logging, task_postrun, task_prerun, worker_init, worker_process_init,
+    worker_process_shutdown,
+)
 from config import Config
+from database import engine
+import log_config
 
 # Celery 앱 설정
 celery_app = Celery(
@@ -19,3 +26,54 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60  # 30분
 )
+
+# prefork 워커는 부모 프로세스를 fork해서 만들어지므로, 부모에서 열린 커넥션을 물려받아 함께 쓰지 않도록
+# 자식 프로세스 시작 시 풀을 새로 만듦 (close=False: 부모의 커넥션은 닫지 않고 참조만 버림)
+@worker_process_init.connect
+def reset_db_pool(**kwargs):
+    engine.dispose(close=False)
+
+
+@worker_process_shutdown.connect
+def close_db_pool(**kwargs):
+    engine.dispose()
+    # prefork 자식 프로세스는 atexit 없이 종료되므로 남은 로그를 여기서 출력
+    log_config.stop_logging()
+    # util 패키지가 이 모듈을 다시 불러오므로 메트릭 모듈은 시그널 안에서 불러옴
+    from util.metrics import mark_process_dead
+    mark_process_dead(os.getpid())
+
+
+# 워커 메인 프로세스에서 메트릭 HTTP 서버 실행 (prefork 자식 프로세스의 값은 PROMETHEUS_MULTIPROC_DIR로 합쳐짐)
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    if Config.CELERY_METRICS_PORT:
+        from prometheus_client import start_http_server
+        from util.metrics import metrics_registry
+        start_http_server(Config.CELERY_METRICS_PORT, registry=metrics_registry())
+
+
+# Celery 기본 로깅 대신 API와 같은 JSON 로그 사용
+@setup_logging.connect
+def configure_logging(**kwargs):
+    log_config.configure_logging()
+
+
+# 작업을 보낼 때 현재 요청 id를 메시지 헤더에 담아, 작업 로그에서도 같은 요청 id로 추적
+@before_task_publish.connect
+def attach_request_id(headers=None, **kwargs):
+    current = log_config.request_id.get()
+    if current and headers is not None:
+        headers.setdefault("request_id", current)
+
+
+@task_prerun.connect
+def bind_log_context(task_id=None, task=None, **kwargs):
+    log_config.request_id.set(getattr(task.request, "request_id", None))
+    log_config.task_id.set(task_id)
+
+
+@task_postrun.connect
+def clear_log_context(**kwargs):
+    log_config.request_id.set(None)
+    log_config.task_id.set(None)
@@ -7,6 +7,12 @@ class Config:
     MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD")
     MYSQL_DATABASE = os.getenv("MYSQL_DATABASE")
     DATABASE_HOST = os.getenv("DATABASE_HOST")
+    # DB 커넥션 풀 (동기/비동기 엔진에 각각 적용). MySQL wait_timeout보다 먼저 재연결하고 꺼낼 때 연결을 확인
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 10))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 20))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
 
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     JWT_SECRET = os.getenv("JWT_SECRET")
@@ -14,6 +20,14 @@ class Config:
     REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS"))
     JWT_ALGORITHM = os.getenv("JWT_ALGORITHM")
     ACCESS_TOKEN_EXPIRE_HOURS = int(os.getenv("ACCESS_TOKEN_EXPIRE_HOURS"))
+    # 인증 시 사용자 토큰 버전을 프로세스 내부에 보관하는 기간(초)과 최대 사용자 수
+    AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", 60))
+    AUTH_USER_CACHE_MAX_ENTRIES = int(os.getenv("AUTH_USER_CACHE_MAX_ENTRIES", 10000))
+    # 비밀번호 해시 (bcrypt cost, 전용 프로세스 수, 대기 작업 최대 수. 넘으면 429)
+    BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", 12))
+    PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", 32))
+    PASSWORD_HASH_RETRY_AFTER = int(os.getenv("PASSWORD_HASH_RETRY_AFTER", 1))
 
     LANGCHAIN_API_KEY = os.getenv("LANGCHAIN_API_KEY")
     LANGCHAIN_ENDPOINT = os.getenv("LANGCHAIN_ENDPOINT")
@@ -28,5 +42,102 @@ class Config:
 
     OCR_SECRET_KEY = os.getenv("OCR_SECRET_KEY")
     OCR_API_INVOKE_URL = os.getenv("OCR_API_INVOKE_URL")
+    # OCR API 호출 (타임아웃, 요청 내 재시도, 커넥션 풀, 워커 전체가 공유하는 초당 요청 한도)
+    OCR_CONNECT_TIMEOUT = float(os.getenv("OCR_CONNECT_TIMEOUT", 5))
+    OCR_READ_TIMEOUT = float(os.getenv("OCR_READ_TIMEOUT", 120))
+    OCR_MAX_ATTEMPTS = int(os.getenv("OCR_MAX_ATTEMPTS", 3))
+    OCR_BACKOFF_BASE = float(os.getenv("OCR_BACKOFF_BASE", 1))
+    OCR_BACKOFF_MAX = float(os.getenv("OCR_BACKOFF_MAX", 30))
+    OCR_POOL_SIZE = int(os.getenv("OCR_POOL_SIZE", 10))
+    OCR_RATE_LIMIT = float(os.getenv("OCR_RATE_LIMIT", 5))  # 0이면 제한 없음
+    OCR_RATE_BURST = int(os.getenv("OCR_RATE_BURST", 5))
+    OCR_RATE_LIMIT_TIMEOUT = float(os.getenv("OCR_RATE_LIMIT_TIMEOUT", 60))
+    OCR_RATE_LIMIT_REDIS_URL = os.getenv("OCR_RATE_LIMIT_REDIS_URL", os.getenv("CELERY_BROKER_URL"))
+    # PDF 분할 기준 (OCR 워커 동시 실행 수, OCR API 요청당 최대 쪽수, 조각당 최소 쪽수)
+    OCR_WORKER_CONCURRENCY = int(os.getenv("OCR_WORKER_CONCURRENCY", 10))
+    OCR_MAX_PAGES_PER_REQUEST = int(os.getenv("OCR_MAX_PAGES_PER_REQUEST", 10))
+    OCR_MIN_PAGES_PER_CHUNK = int(os.getenv("OCR_MIN_PAGES_PER_CHUNK", 1))
+    # OCR 작업 진행 상황 (Redis 해시 + 채널, SSE 하트비트/최대 연결 시간)
+    JOB_PROGRESS_REDIS_URL = os.getenv("JOB_PROGRESS_REDIS_URL", os.getenv("CELERY_BROKER_URL"))
+    JOB_PROGRESS_TTL = int(os.getenv("JOB_PROGRESS_TTL", 24 * 60 * 60))
+    JOB_EVENTS_HEARTBEAT = float(os.getenv("JOB_EVENTS_HEARTBEAT", 15))
+    JOB_EVENTS_TIMEOUT = float(os.getenv("JOB_EVENTS_TIMEOUT", 30 * 60))
+    # PDF 조각 OCR 결과 캐시 (조각 내용의 SHA-256 기준)
+    OCR_RESULT_CACHE_TTL = int(os.getenv("OCR_RESULT_CACHE_TTL", 30 * 24 * 60 * 60))
+    # 요청 내 재시도가 모두 실패한 조각만 Celery 태스크 단위로 다시 실행
+    OCR_TASK_MAX_RETRIES = int(os.getenv("OCR_TASK_MAX_RETRIES", 5))
+    # OCR 결과 DB 저장 (Redis 대기열에 모았다가 배치 크기만큼 한 트랜잭션으로 저장, 첫 기록 후 모으는 시간(초), 저장 잠금 만료(초))
+    OCR_PERSIST_REDIS_URL = os.getenv("OCR_PERSIST_REDIS_URL", os.getenv("CELERY_BROKER_URL"))
+    OCR_PERSIST_BATCH_SIZE = int(os.getenv("OCR_PERSIST_BATCH_SIZE", 20))
+    OCR_PERSIST_BATCH_DELAY = float(os.getenv("OCR_PERSIST_BATCH_DELAY", 1))
+    OCR_PERSIST_LOCK_TTL = int(os.getenv("OCR_PERSIST_LOCK_TTL", 60))
 
-    CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
\ No newline at end of file
+    CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL")
+    # Celery 워커 메트릭 HTTP 포트 (0이면 사용 안 함)
+    CELERY_METRICS_PORT = int(os.getenv("CELERY_METRICS_PORT", 0))
+
+    # 업로드 스테이징 저장소 (s3 | local). local은 API와 워커가 공유하는 볼륨 경로 사용
+    UPLOAD_STORAGE = os.getenv("UPLOAD_STORAGE", "s3")
+    UPLOAD_STAGING_DIR = os.getenv("UPLOAD_STAGING_DIR", "uploads")
+    UPLOAD_STAGING_PREFIX = os.getenv("UPLOAD_STAGING_PREFIX", "staging/")
+    # 업로드 최대 크기와 멀티파트 업로드 파트 크기(S3 최소 5MB)/동시 업로드 수
+    UPLOAD_MAX_SIZE = int(os.getenv("UPLOAD_MAX_SIZE", 50 * 1024 * 1024))
+    UPLOAD_PART_SIZE = max(int(os.getenv("UPLOAD_PART_SIZE", 8 * 1024 * 1024)), 5 * 1024 * 1024)
+    UPLOAD_PART_CONCURRENCY = int(os.getenv("UPLOAD_PART_CONCURRENCY", 4))
+
+    # 질문 의도 로컬 분류기 (학습 모델 경로, LLM 분류 결과 로그 경로)
+    CLASSIFIER_MODEL_PATH = os.getenv("CLASSIFIER_MODEL_PATH")
+    CLASSIFIER_LOG_PATH = os.getenv("CLASSIFIER_LOG_PATH")
+
+    # 분류/답변 캐시 (Redis가 없으면 프로세스 내부 캐시 사용)
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", os.getenv("CELERY_BROKER_URL"))
+    CACHE_DEFAULT_TTL = int(os.getenv("CACHE_DEFAULT_TTL", 60 * 60))
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 10000))
+    # Redis 오류 후 내부 캐시만 사용하는 시간 (초)
+    CACHE_REDIS_RETRY_AFTER = float(os.getenv("CACHE_REDIS_RETRY_AFTER", 30))
+    CLASSIFICATION_CACHE_TTL = int(os.getenv("CLASSIFICATION_CACHE_TTL", 7 * 24 * 60 * 60))
+    ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", 24 * 60 * 60))
+
+    # 학생 context (카테고리별 토큰 예산, 조회 캐시)
+    CONTEXT_TOKEN_BUDGETS = {
+        category: int(os.getenv(f"CONTEXT_TOKEN_BUDGET_{category.upper()}", default))
+        for category, default in (("performance", 6000), ("summary", 4000), ("counseling", 5000), ("recommendation", 6000))
+    }
+    CONTEXT_CACHE_TTL = int(os.getenv("CONTEXT_CACHE_TTL", 24 * 60 * 60))
+    # 예산을 넘을 때 요약하는 서술형 항목의 최소 토큰 수와 요약문 캐시 기간
+    CONTEXT_SUMMARY_MIN_TOKENS = int(os.getenv("CONTEXT_SUMMARY_MIN_TOKENS", 150))
+    PASSAGE_SUMMARY_CACHE_TTL = int(os.getenv("PASSAGE_SUMMARY_CACHE_TTL", 30 * 24 * 60 * 60))
+
+    # 생활기록부 문단 검색 (EMBEDDER: openai | hashing, 인덱스는 API와 워커가 공유하는 경로에 저장)
+    EMBEDDER = os.getenv("EMBEDDER", "openai")
+    EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    PASSAGE_INDEX_DIR = os.getenv("PASSAGE_INDEX_DIR", "indexes")
+    PASSAGE_MAX_TOKENS = int(os.getenv("PASSAGE_MAX_TOKENS", 200))
+    # context가 이 토큰 수 이상인 긴 기록만 검색한 문단으로 context를 구성
+    RETRIEVAL_MIN_CONTEXT_TOKENS = int(os.getenv("RETRIEVAL_MIN_CONTEXT_TOKENS", 3000))
+    RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", 8))
+
+    # 대화 기록 윈도우 (최근 N턴 + 토큰 예산, 밀려난 턴은 BATCH 단위로 요약)
+    CHAT_HISTORY_MAX_TURNS = int(os.getenv("CHAT_HISTORY_MAX_TURNS", 10))
+    CHAT_HISTORY_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", 4000))
+    CHAT_SUMMARY_BATCH_TURNS = int(os.getenv("CHAT_SUMMARY_BATCH_TURNS", 10))
+
+    # OpenAI HTTP 커넥션 풀
+    OPENAI_MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", 100))
+    OPENAI_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("OPENAI_MAX_KEEPALIVE_CONNECTIONS", 20))
+    OPENAI_KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", 60))
+    OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 120))
+
+    # 로깅 (JSON 한 줄 로그, DEBUG 로그 샘플링 비율, 학생 데이터가 담기는 필드는 길이만 기록)
+    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+    LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", 0.01))
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+    LOG_MAX_FIELD_CHARS = int(os.getenv("LOG_MAX_FIELD_CHARS", 2000))
+    LOG_REDACT_FIELDS = frozenset(
+        field.strip()
+        for field in os.getenv(
+            "LOG_REDACT_FIELDS",
+            "context,question,answer,content,ocr_data,text_data,user_message,bot_response,password,token",
+        ).split(",")
+        if field.strip()
+    )
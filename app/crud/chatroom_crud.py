@@ -1,10 +1,35 @@
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from models import ChatRoom
 from schemas import ChatRoomCreate
 from fastapi.encoders import jsonable_encoder
+from typing import Optional
 def create_chatroom(db: Session, chatroom: ChatRoomCreate, user_id: int):
     db_chatroom = ChatRoom(**jsonable_encoder(chatroom), user_id=user_id)
     db.add(db_chatroom)
     db.commit()
     db.refresh(db_chatroom)
-    return db_chatroom
\ No newline at end of file
+    return db_chatroom
+
+async def update_chatroom_summary(
+    db: AsyncSession,
+    chatroom_id: int,
+    summary: str,
+    until_message_id: int,
+    previous_until_message_id: Optional[int],
+) -> bool:
+    """
+    대화 요약을 갱신. 다른 요청이 먼저 갱신했다면(요약 기준 id가 달라졌다면) 덮어쓰지 않음.
+    """
+    if previous_until_message_id is None:
+        unchanged = ChatRoom.summary_until_message_id.is_(None)
+    else:
+        unchanged = ChatRoom.summary_until_message_id == previous_until_message_id
+    result = await db.execute(
+        update(ChatRoom)
+        .where(ChatRoom.id == chatroom_id, unchanged)
+        .values(history_summary=summary, summary_until_message_id=until_message_id)
+    )
+    await db.commit()
+    return result.rowcount == 1
@@ -1,9 +1,35 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import ChatRoom
 from models import Message as MessageModel
 
-def create_message(db: Session, question: str, answer: str, chatroom_id: int):
+# 채팅방 목록에 표시할 마지막 메시지 미리보기 길이
+PREVIEW_LENGTH = 255
+
+async def create_message(db: AsyncSession, question: str, answer: str, chatroom_id: int):
+    """
+    메시지를 저장하고, 같은 트랜잭션에서 채팅방의 마지막 메시지 정보를 갱신.
+    """
     db_message = MessageModel(question=question, answer=answer, chatroom_id=chatroom_id)
     db.add(db_message)
-    db.commit()
-    db.refresh(db_message)
-    return db_message
\ No newline at end of file
+    await db.flush()
+    await db.refresh(db_message)
+    await db.execute(
+        update(ChatRoom)
+        .where(ChatRoom.id == chatroom_id)
+        .values(
+            last_message_at=db_message.created_at,
+            last_message_preview=(answer or "")[:PREVIEW_LENGTH],
+        )
+    )
+    await db.commit()
+    return db_message
+
+async def has_messages(db: AsyncSession, chatroom_id: int) -> bool:
+    """
+    채팅방에 이전 대화가 있는지 확인
+    """
+    result = await db.execute(
+        select(MessageModel.id).where(MessageModel.chatroom_id == chatroom_id).limit(1)
+    )
+    return result.first() is not None
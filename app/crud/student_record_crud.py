@@ -1,27 +1,329 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from models import StudentRecord
-from typing import Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, insert, inspect, select
+from sqlalchemy.exc import IntegrityError
+from models import StudentRecord, StudentRecordSection, StudentGrade, StudentRecordContext
+from util.student_context import ContextSnapshot, render_contexts
+from langchainbot.summarizer import summarize_passage
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
 
-def create_pdf_file(db: Session, file_name: str, file_url: str, user_id: int, ocr_data: dict) -> StudentRecord:
+# 성적 행으로 따로 저장하는 섹션과 키
+ACADEMIC_SECTION = "교과학습발달상황"
+GRADE_ROWS_KEY = "성적"
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _format_number(value) -> str:
+    return "" if value is None else f"{value:g}"
+
+
+def load_text_data(text_data) -> dict:
+    """
+    text_data(JSON 컬럼, 예전 기록은 JSON 문자열)를 dict로 변환
+    """
+    if isinstance(text_data, str):
+        try:
+            text_data = json.loads(text_data)
+        except json.JSONDecodeError:
+            return {}
+    return text_data if isinstance(text_data, dict) else {}
+
+
+def build_record_details(ocr_data) -> Tuple[List[StudentRecordSection], List[StudentGrade]]:
+    """
+    파싱된 생활기록부를 섹션 행과 과목별 성적 행으로 나눔.
+    교과학습발달상황 섹션에는 성적을 뺀 학년별 세특/체육·예술/특기사항만 남김.
+    """
+    sections, grades = [], []
+    for name, value in load_text_data(ocr_data).items():
+        if name == ACADEMIC_SECTION and isinstance(value, dict):
+            remainder = {}
+            for grade, grade_data in value.items():
+                for row in grade_data.get(GRADE_ROWS_KEY, []):
+                    raw_score, _, average = (row.get("원점수_과목평균") or "").partition("/")
+                    grades.append(StudentGrade(
+                        grade=grade,
+                        subject_group=row.get("교과"),
+                        subject=row.get("과목"),
+                        credits=_to_int(row.get("단위수")),
+                        raw_score=_to_float(raw_score),
+                        subject_average=_to_float(average),
+                        standard_deviation=_to_float(row.get("표준편차")),
+                        achievement=row.get("성취도"),
+                        enrolled=_to_int(row.get("수강자수")),
+                        rank=_to_int(row.get("석차")),
+                    ))
+                remainder[grade] = {key: data for key, data in grade_data.items() if key != GRADE_ROWS_KEY}
+            value = remainder
+        sections.append(StudentRecordSection(name=name, content=json.dumps(value, ensure_ascii=False)))
+    return sections, grades
+
+
+def grade_row(grade: StudentGrade) -> dict:
+    """
+    성적 행을 파싱 결과와 같은 형태의 dict로 변환
+    """
+    return {
+        "교과": grade.subject_group,
+        "과목": grade.subject,
+        "단위수": _format_number(grade.credits),
+        "원점수_과목평균": f"{_format_number(grade.raw_score)}/{_format_number(grade.subject_average)}",
+        "성취도": grade.achievement,
+        "석차": _format_number(grade.rank),
+        "표준편차": _format_number(grade.standard_deviation),
+        "수강자수": _format_number(grade.enrolled),
+    }
+
+
+def assemble_academic_performance(section: dict, grades: Iterable[StudentGrade]) -> dict:
+    """
+    교과학습발달상황 섹션과 성적 행을 합쳐 파싱 결과와 같은 구조로 되돌림
+    """
+    rows_by_grade: Dict[str, list] = {}
+    for grade in grades:
+        rows_by_grade.setdefault(grade.grade, []).append(grade_row(grade))
+    result = {}
+    for grade in list(section) + [grade for grade in rows_by_grade if grade not in section]:
+        result[grade] = {GRADE_ROWS_KEY: rows_by_grade.get(grade, []), **section.get(grade, {})}
+    return result
+
+
+def render_record_contexts(ocr_data: dict) -> Dict[str, ContextSnapshot]:
+    """
+    카테고리별 context 생성 (요약 LLM 호출이 포함될 수 있으므로 DB 커넥션을 잡기 전에 호출)
+    """
+    return render_contexts(load_text_data(ocr_data), summarize_passage)
+
+
+def build_record_contexts(contexts: Dict[str, ContextSnapshot]) -> List[StudentRecordContext]:
+    return [
+        StudentRecordContext(category=category, content=snapshot.content, token_count=snapshot.token_count)
+        for category, snapshot in contexts.items()
+    ]
+
+
+def build_pdf_file(file_name: str, file_url: str, user_id: int, ocr_data: dict, file_hash: Optional[str] = None,
+                   contexts: Optional[Dict[str, ContextSnapshot]] = None) -> StudentRecord:
+    """
+    섹션/성적 행과 카테고리별 context를 포함한 StudentRecord 생성 (세션에는 추가하지 않음)
+    """
+    if contexts is None:
+        contexts = render_record_contexts(ocr_data)
+    new_file = StudentRecord(
+        file_name=file_name, file_url=file_url, user_id=user_id, text_data=ocr_data, file_hash=file_hash
+    )
+    new_file.sections, new_file.grades = build_record_details(ocr_data)
+    new_file.contexts = build_record_contexts(contexts)
+    return new_file
+
+
+def create_pdf_file(db: Session, file_name: str, file_url: str, user_id: int, ocr_data: dict,
+                    file_hash: Optional[str] = None) -> StudentRecord:
     """
     PDF 파일 정보를 생성하고 DB에 저장.
     """
-    new_file = StudentRecord(file_name=file_name, file_url=file_url, user_id=user_id, text_data=ocr_data)
+    # 섹션/성적 행과 카테고리별 context도 같은 트랜잭션에서 저장
+    new_file = build_pdf_file(file_name, file_url, user_id, ocr_data, file_hash=file_hash)
     db.add(new_file)
     db.commit()
     db.refresh(new_file)
     return new_file
 
+
+def _row_values(obj) -> dict:
+    # 생성 시 지정한 컬럼 값만 (지정하지 않은 컬럼은 INSERT 시 기본값 적용)
+    state = inspect(obj)
+    return {attr.key: state.dict[attr.key] for attr in state.mapper.column_attrs if attr.key in state.dict}
+
+
+def create_pdf_files(db: Session, items: List[dict]) -> List[int]:
+    """
+    여러 OCR 작업의 결과를 한 트랜잭션으로 저장하고 항목 순서대로 기록 id를 반환.
+    items의 각 항목은 build_pdf_file의 인자(file_name, file_url, user_id, ocr_data, file_hash, contexts).
+    같은 사용자의 같은 파일(file_hash)이 이미 저장되어 있으면 새로 만들지 않고 기존 id를 반환하므로
+    같은 항목을 다시 저장해도 중복 기록이 생기지 않음.
+    """
+    hashes = {item["file_hash"] for item in items if item.get("file_hash")}
+    existing = {}
+    if hashes:
+        rows = db.execute(
+            select(StudentRecord.id, StudentRecord.user_id, StudentRecord.file_hash)
+            .where(
+                StudentRecord.file_hash.in_(hashes),
+                StudentRecord.text_data.isnot(None),
+                StudentRecord.deleted_at.is_(None),
+            )
+        ).all()
+        existing = {(row.user_id, row.file_hash): row.id for row in rows}
+
+    new_records = {}  # 같은 배치 안에 같은 파일이 두 번 있어도 기록은 하나만 생성
+    records = []
+    details = []
+    for item in items:
+        key = (item["user_id"], item.get("file_hash"))
+        if key in existing:
+            records.append(existing[key])
+            continue
+        if key in new_records:
+            records.append(new_records[key])
+            continue
+        record = StudentRecord(
+            file_name=item["file_name"], file_url=item["file_url"], user_id=item["user_id"],
+            text_data=item["ocr_data"], file_hash=item.get("file_hash"),
+        )
+        sections, grades = build_record_details(item["ocr_data"])
+        details.append((record, sections + grades + build_record_contexts(item["contexts"])))
+        if item.get("file_hash"):
+            new_records[key] = record
+        db.add(record)
+        records.append(record)
+
+    # 기록은 자동 증가 id를 받아야 하므로 한 행씩 INSERT (MySQL은 RETURNING이 없음)
+    db.flush()
+    # 섹션/성적/context 행은 id를 돌려받을 필요가 없으므로 배치 전체를 테이블별 executemany 한 번으로 INSERT
+    rows_by_model = {StudentRecordSection: [], StudentGrade: [], StudentRecordContext: []}
+    for record, children in details:
+        for child in children:
+            rows_by_model[type(child)].append({**_row_values(child), "student_record_id": record.id})
+    for model, rows in rows_by_model.items():
+        if rows:
+            db.execute(insert(model), rows)
+
+    ids = [record if isinstance(record, int) else record.id for record in records]
+    db.commit()
+    return ids
+
+
 def get_pdf_file(db: Session, file_id: int) -> Optional[StudentRecord]:
     """
     PDF 파일 정보를 ID로 조회.
     """
     return db.query(StudentRecord).filter(StudentRecord.id == file_id).first()
 
+def get_pdf_file_by_hash(db: Session, file_hash: str, user_id: Optional[int] = None) -> Optional[StudentRecord]:
+    """
+    같은 내용(SHA-256)의 PDF 파일 정보를 조회. user_id를 주면 해당 사용자의 삭제되지 않은 파일만 조회.
+    """
+    query = db.query(StudentRecord).filter(StudentRecord.file_hash == file_hash, StudentRecord.text_data.isnot(None))
+    if user_id is not None:
+        query = query.filter(StudentRecord.user_id == user_id, StudentRecord.deleted_at.is_(None))
+    return query.order_by(StudentRecord.id.desc()).first()
+
 def soft_delete_pdf_file(db: Session, pdf_file: StudentRecord):
     """
     PDF 파일을 소프트 삭제.
     """
     pdf_file.deleted_at = func.now()
-    db.commit()
\ No newline at end of file
+    db.commit()
+
+async def get_record_sections(db: AsyncSession, record_id: int, names: Iterable[str]) -> dict:
+    """
+    생활기록부에서 필요한 섹션만 조회 (교과학습발달상황은 성적 행과 합쳐 반환).
+    섹션 행이 없는 예전 기록이면 text_data에서 꺼내 반환.
+    """
+    names = list(names)
+    rows = (
+        await db.execute(
+            select(StudentRecordSection.name, StudentRecordSection.content)
+            .where(StudentRecordSection.student_record_id == record_id, StudentRecordSection.name.in_(names))
+        )
+    ).all()
+    if not rows:
+        has_sections = (
+            await db.execute(
+                select(StudentRecordSection.id).where(StudentRecordSection.student_record_id == record_id).limit(1)
+            )
+        ).first()
+        if has_sections is None:
+            text_data = (
+                await db.execute(select(StudentRecord.text_data).where(StudentRecord.id == record_id))
+            ).scalar()
+            text_data = load_text_data(text_data)
+            return {name: text_data[name] for name in names if name in text_data}
+
+    sections = {name: json.loads(content) for name, content in rows if content is not None}
+    if ACADEMIC_SECTION in sections:
+        grades = (
+            await db.execute(
+                select(StudentGrade)
+                .where(StudentGrade.student_record_id == record_id)
+                .order_by(StudentGrade.id)
+            )
+        ).scalars().all()
+        sections[ACADEMIC_SECTION] = assemble_academic_performance(sections[ACADEMIC_SECTION], grades)
+    return sections
+
+
+def load_record_sections(db: Session, record_id: int) -> dict:
+    """
+    기록의 모든 섹션 조회 (Celery 워커용 동기 세션, 교과학습발달상황은 성적 행과 합쳐 반환).
+    섹션 행이 없는 예전 기록이면 text_data를 반환.
+    """
+    rows = db.execute(
+        select(StudentRecordSection.name, StudentRecordSection.content)
+        .where(StudentRecordSection.student_record_id == record_id)
+        .order_by(StudentRecordSection.id)
+    ).all()
+    if not rows:
+        return load_text_data(db.scalar(select(StudentRecord.text_data).where(StudentRecord.id == record_id)))
+
+    sections = {name: json.loads(content) for name, content in rows if content is not None}
+    if ACADEMIC_SECTION in sections:
+        grades = db.scalars(
+            select(StudentGrade).where(StudentGrade.student_record_id == record_id).order_by(StudentGrade.id)
+        ).all()
+        sections[ACADEMIC_SECTION] = assemble_academic_performance(sections[ACADEMIC_SECTION], grades)
+    return sections
+
+
+async def get_record_context(db: AsyncSession, record_id: int, category: str) -> Optional[ContextSnapshot]:
+    """
+    미리 만들어 둔 카테고리별 context 조회
+    """
+    row = (
+        await db.execute(
+            select(StudentRecordContext.content, StudentRecordContext.token_count)
+            .where(StudentRecordContext.student_record_id == record_id, StudentRecordContext.category == category)
+        )
+    ).first()
+    return ContextSnapshot(row.content, row.token_count) if row is not None else None
+
+
+async def save_record_context(db: AsyncSession, record_id: int, category: str, snapshot: ContextSnapshot):
+    """
+    context가 없던 기록(이전 버전에서 저장된 기록)의 context를 저장. 동시에 저장된 경우에는 무시.
+    """
+    db.add(StudentRecordContext(
+        student_record_id=record_id, category=category, content=snapshot.content, token_count=snapshot.token_count
+    ))
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+
+
+def get_student_grades(db: Session, record_id: int, grade: Optional[str] = None,
+                       subject: Optional[str] = None) -> List[StudentGrade]:
+    """
+    생활기록부의 과목별 성적 행 조회 (학년/과목으로 필터링)
+    """
+    query = db.query(StudentGrade).filter(StudentGrade.student_record_id == record_id)
+    if grade is not None:
+        query = query.filter(StudentGrade.grade == grade)
+    if subject is not None:
+        query = query.filter(StudentGrade.subject == subject)
+    return query.order_by(StudentGrade.id).all()
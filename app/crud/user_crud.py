@@ -1,10 +1,30 @@
+from typing import Optional
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update
 from schemas import UserCreate
 from models import User as UserModel
 
-def create_user(db: Session, user: UserCreate):
+async def get_user_by_username(db: AsyncSession, username: str) -> Optional[UserModel]:
+    return (await db.execute(select(UserModel).where(UserModel.username == username))).scalars().first()
+
+async def create_user(db: AsyncSession, user: UserCreate):
     db_user = UserModel(username=user.username, password=user.password)
     db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def update_password_hash(db: AsyncSession, user_id: int, hashed_password: str):
+    """
+    로그인 시 새 cost로 다시 만든 비밀번호 해시 저장
+    """
+    await db.execute(update(UserModel).where(UserModel.id == user_id).values(password=hashed_password))
+    await db.commit()
+
+def increment_token_version(db: Session, user_id: int):
+    """
+    사용자의 토큰 버전을 올려 이전에 발급한 Access/Refresh Token을 모두 무효화
+    """
+    db.execute(update(UserModel).where(UserModel.id == user_id).values(token_version=UserModel.token_version + 1))
     db.commit()
-    db.refresh(db_user)
-    return db_user
\ No newline at end of file
@@ -1,18 +1,50 @@
+from contextlib import contextmanager
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, Session
 from config import Config
+from db_pool import InstrumentedQueuePool, InstrumentedAsyncQueuePool, instrument_engine, pool_options
 
 # 데이터베이스 설정
 DATABASE_URL = f"mysql+pymysql://{Config.MYSQL_USER}:{Config.MYSQL_PASSWORD}@{Config.DATABASE_HOST}:3306/{Config.MYSQL_DATABASE}"
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **pool_options(InstrumentedQueuePool))
+instrument_engine(engine, "sync")
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# 비동기 데이터베이스 설정 (API 요청 경로에서 사용)
+ASYNC_DATABASE_URL = f"mysql+aiomysql://{Config.MYSQL_USER}:{Config.MYSQL_PASSWORD}@{Config.DATABASE_HOST}:3306/{Config.MYSQL_DATABASE}"
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **pool_options(InstrumentedAsyncQueuePool))
+instrument_engine(async_engine.sync_engine, "async")
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # 데이터베이스 의존성
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+# 요청 밖(Celery 태스크 등)에서 쓰는 세션. 블록이 끝나면 항상 닫아 커넥션을 풀에 반납 (커밋은 crud 함수에서)
+@contextmanager
+def session_scope():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# 비동기 데이터베이스 의존성
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# LLM/OCR처럼 오래 걸리는 호출 전에 세션이 잡고 있는 커넥션을 풀에 반납 (다음 쿼리에서 다시 가져옴).
+# 읽기만 한 뒤에 호출해야 함. 조회한 객체는 세션에서 분리되지만 이미 읽은 값은 그대로 사용할 수 있음
+def release_db(db: Session):
+    db.close()
+
+async def release_async_db(db: AsyncSession):
+    await db.close()
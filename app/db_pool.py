@@ -0,0 +1,132 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from config import Config
+
+# util.metrics를 불러오면 util 패키지 초기화 과정에서 database를 다시 불러오므로 풀 메트릭은 여기에 정의
+DB_POOL_CHECKOUT_SECONDS = Histogram(
+    "db_pool_checkout_seconds",
+    "커넥션 풀에서 커넥션을 꺼내는 데 걸린 시간 (대기 + pre-ping, 초)",
+    ["engine", "endpoint"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+DB_POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "커넥션 풀이 가득 차 pool_timeout 안에 커넥션을 얻지 못한 수",
+    ["engine", "endpoint"],
+)
+DB_POOL_OVERFLOW_OPENED = Counter(
+    "db_pool_overflow_opened_total",
+    "pool_size를 넘어 새로 연 overflow 커넥션 수",
+    ["engine"],
+)
+DB_POOL_IN_USE = Gauge(
+    "db_pool_connections_in_use",
+    "사용 중인(꺼내 간) 커넥션 수",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "현재 열려 있는 overflow 커넥션 수",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+# 요청 처리 중이면 ASGI scope (커넥션을 꺼낸 엔드포인트를 라벨로 남기기 위함)
+request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+
+def current_endpoint() -> str:
+    """
+    커넥션을 꺼내는 코드가 실행 중인 엔드포인트 경로 템플릿. 요청 밖(Celery 등)이면 "background"
+    """
+    scope = request_scope.get()
+    if scope is None:
+        return "background"
+    route = scope.get("route")
+    return getattr(route, "path", "unmatched")
+
+
+class RequestScopeMiddleware:
+    """
+    요청마다 ASGI scope를 request_scope에 넣어 둠. 라우팅 후 scope에 채워지는 route로 엔드포인트를 구분
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            request_scope.reset(token)
+
+
+class _InstrumentedPoolMixin:
+    engine_name = "sync"
+
+    def connect(self):
+        endpoint = current_endpoint()
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            DB_POOL_CHECKOUT_TIMEOUTS.labels(self.engine_name, endpoint).inc()
+            raise
+        finally:
+            DB_POOL_CHECKOUT_SECONDS.labels(self.engine_name, endpoint).observe(time.perf_counter() - start)
+
+    def _inc_overflow(self) -> bool:
+        opened = super()._inc_overflow()
+        # _overflow는 -pool_size에서 시작하므로 0보다 크면 pool_size를 넘어 연 커넥션
+        if opened and self._overflow > 0:
+            DB_POOL_OVERFLOW_OPENED.labels(self.engine_name).inc()
+        return opened
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    engine_name = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    engine_name = "async"
+
+
+def pool_options(poolclass) -> dict:
+    """
+    create_engine/create_async_engine에 넘길 커넥션 풀 설정
+    """
+    return {
+        "poolclass": poolclass,
+        "pool_size": Config.DB_POOL_SIZE,
+        "max_overflow": Config.DB_MAX_OVERFLOW,
+        "pool_timeout": Config.DB_POOL_TIMEOUT,
+        "pool_recycle": Config.DB_POOL_RECYCLE,
+        "pool_pre_ping": Config.DB_POOL_PRE_PING,
+    }
+
+
+def instrument_engine(engine: Engine, name: str):
+    """
+    커넥션을 꺼내고 반납할 때마다 사용 중/overflow 커넥션 수를 갱신 (dispose로 풀이 바뀌어도 현재 풀 기준)
+    """
+
+    def update(returning: int):
+        pool = engine.pool
+        DB_POOL_IN_USE.labels(name).set(pool.checkedout() - returning)
+        DB_POOL_OVERFLOW.labels(name).set(max(pool.overflow(), 0))
+
+    # checkin 이벤트는 커넥션이 풀로 돌아가기 전에 발생하므로 반납 중인 커넥션을 빼고 셈
+    event.listen(engine, "checkout", lambda *args: update(0))
+    event.listen(engine, "checkin", lambda *args: update(1))
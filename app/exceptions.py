@@ -1,8 +1,14 @@
+import logging
+
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
+from log_config import REQUEST_ID_HEADER
+
+logger = logging.getLogger(__name__)
+
 class CustomException(Exception):
     def __init__(self, message: str, status_code: int = 400):
         self.message = message
@@ -17,6 +23,7 @@ async def http_exception_handler(request, exc: HTTPException):
             "message": exc.detail,
             "data": None,
         },
+        headers=exc.headers,
     )
 
 async def validation_exception_handler(request, exc: RequestValidationError):
@@ -42,6 +49,9 @@ async def custom_exception_handler(request, exc: CustomException):
     )
 
 async def global_exception_handler(request, exc: Exception):
+    current_request_id = request.scope.get("request_id")
+    logger.error("Unhandled exception", exc_info=exc,
+                 extra={"request_id": current_request_id, "method": request.method, "path": request.url.path})
     return JSONResponse(
         status_code=500,
         content={
@@ -50,4 +60,5 @@ async def global_exception_handler(request, exc: Exception):
             "message": "Internal server error",
             "data": None,
         },
+        headers={REQUEST_ID_HEADER: current_request_id} if current_request_id else None,
     )
\ No newline at end of file
@@ -1,41 +1,157 @@
 from langchain.chains import ConversationChain
-from langchain.chat_models import ChatOpenAI
 from langchain.memory import ConversationBufferMemory
-from langchain_core.messages import HumanMessage, AIMessage
-from sqlalchemy.orm import Session
-from models import Message
-from langchain.callbacks.manager import CallbackManager
-from langchain.callbacks.streaming_stdout import StreamingStdOutCallbackHandler
+from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from models import ChatRoom, Message
+from langchain.callbacks.base import AsyncCallbackHandler
+from langchainbot.llm import chat_model, summary_model
+from typing import Optional
+from config import Config
+from crud.chatroom_crud import update_chatroom_summary
+from database import AsyncSessionLocal
+from util.tokens import count_tokens
+import asyncio
+import logging
 
-def load_chat_history_from_db(chatroom_id: int, db: Session) -> list:
+logger = logging.getLogger(__name__)
+
+# 스트림 종료를 알리는 센티널 값
+STREAM_END = object()
+
+
+class QueueCallbackHandler(AsyncCallbackHandler):
+    """
+    LLM이 생성하는 토큰을 asyncio 큐에 넣어 SSE 응답 제너레이터에서 읽을 수 있게 하는 콜백 핸들러.
+    """
+
+    def __init__(self, token_queue: "asyncio.Queue"):
+        self.queue = token_queue
+
+    async def on_llm_new_token(self, token: str, **kwargs) -> None:
+        await self.queue.put(token)
+
+
+SUMMARY_PROMPT = """
+다음은 교사와 생활기록부 분석 챗봇의 이전 대화 요약과 그 이후의 대화입니다.
+기존 요약에 새 대화 내용을 반영하여, 이후 대화에 필요한 핵심 정보(학생에 대한 분석 결과, 교사의 요청 사항, 결론)를 유지한 요약을 한국어로 10문장 이내로 작성해 주세요.
+
+기존 요약:
+{summary}
+
+새 대화:
+{conversation}
+"""
+
+# 같은 채팅방의 요약이 동시에 여러 번 실행되지 않도록 추적
+_summarizing_chatrooms = set()
+_background_tasks = set()
+
+
+def message_to_turn(message) -> list:
+    """
+    Message 한 행(질문 + 답변)을 LangChain 메시지 목록으로 변환
+    """
+    turn = []
+    if message.question:
+        turn.append(HumanMessage(content=message.question))
+    if message.answer:
+        turn.append(AIMessage(content=message.answer))
+    return turn
+
+
+async def summarize_history(previous_summary: Optional[str], messages: list) -> str:
+    conversation = "\n".join(
+        f"교사: {message.question}\n챗봇: {message.answer}" for message in messages
+    )
+    prompt = SUMMARY_PROMPT.format(summary=previous_summary or "(없음)", conversation=conversation)
+    return (await summary_model.ainvoke(prompt)).content
+
+
+async def refresh_history_summary(
+    chatroom_id: int,
+    previous_summary: Optional[str],
+    previous_until_message_id: Optional[int],
+    messages: list,
+):
+    """
+    윈도우 밖으로 밀려난 대화를 기존 요약에 합쳐 채팅방에 저장 (응답과 별도로 백그라운드 실행)
+    """
+    try:
+        summary = await summarize_history(previous_summary, messages)
+        async with AsyncSessionLocal() as db:
+            await update_chatroom_summary(db, chatroom_id, summary, messages[-1].id, previous_until_message_id)
+    except Exception as e:
+        logger.warning(f"Failed to summarize chat history for chatroom {chatroom_id}: {e}")
+    finally:
+        _summarizing_chatrooms.discard(chatroom_id)
+
+
+def schedule_summary_refresh(chatroom_id: int, previous_summary, previous_until_message_id, messages: list):
+    if chatroom_id in _summarizing_chatrooms:
+        return
+    _summarizing_chatrooms.add(chatroom_id)
+    task = asyncio.create_task(
+        refresh_history_summary(chatroom_id, previous_summary, previous_until_message_id, messages)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+async def load_chat_history_from_db(chatroom_id: int, db: AsyncSession) -> list:
     """
     DB에서 chatroom_id에 해당하는 대화 기록을 가져와 LangChain 메시지 형식의 리스트로 변환.
+    전체 기록 대신 저장된 요약 + 요약 이후의 최근 대화만 로드하고, 토큰 예산을 넘는 오래된 턴은 제외.
+    요약되지 않은 턴이 MAX_TURNS + BATCH_TURNS에 도달하면 오래된 BATCH_TURNS를 요약에 합침.
     """
-    messages = db.query(Message).filter(Message.chatroom_id == chatroom_id).order_by(Message.created_at).all()
-    return [
-        HumanMessage(content=msg.question) if msg.question else AIMessage(content=msg.answer)
-        for msg in messages
-    ]
+    chatroom = (
+        await db.execute(
+            select(ChatRoom.history_summary, ChatRoom.summary_until_message_id)
+            .filter(ChatRoom.id == chatroom_id)
+        )
+    ).first()
+    summary, summary_until_message_id = chatroom if chatroom else (None, None)
+
+    query = select(Message.id, Message.question, Message.answer).filter(Message.chatroom_id == chatroom_id)
+    if summary_until_message_id is not None:
+        query = query.filter(Message.id > summary_until_message_id)
+    limit = Config.CHAT_HISTORY_MAX_TURNS + Config.CHAT_SUMMARY_BATCH_TURNS
+    messages = list(reversed((await db.execute(query.order_by(Message.id.desc()).limit(limit))).all()))
+
+    if len(messages) >= limit:
+        schedule_summary_refresh(
+            chatroom_id, summary, summary_until_message_id, messages[:-Config.CHAT_HISTORY_MAX_TURNS]
+        )
 
+    # 최근 대화부터 토큰 예산 안에서 포함
+    used_tokens = count_tokens(summary) if summary else 0
+    chat_history = []
+    for message in reversed(messages):
+        turn = message_to_turn(message)
+        turn_tokens = sum(count_tokens(m.content) for m in turn)
+        if used_tokens + turn_tokens > Config.CHAT_HISTORY_TOKEN_BUDGET:
+            break
+        used_tokens += turn_tokens
+        chat_history[:0] = turn
 
-def get_chatbot(chatroom_id: int, db: Session) -> ConversationChain:
+    if summary:
+        chat_history.insert(0, SystemMessage(content=f"이전 대화 요약: {summary}"))
+    return chat_history
+
+
+async def get_chatbot(chatroom_id: int, db: AsyncSession) -> ConversationChain:
     """
     LangChain ConversationChain 생성.
     이전 대화를 DB에서 로드하고 ConversationBufferMemory에 연동.
+    모델(과 HTTP 커넥션 풀)은 프로세스 전체에서 공유하고, 채팅방별 메모리만 요청마다 붙임.
+    토큰 스트리밍 콜백은 ainvoke 호출 시 config={"callbacks": [...]}로 전달.
     """
-    # ChatGPT 모델 설정
-    chat_model = ChatOpenAI(temperature=0.7, 
-                            model="gpt-4o",
-                            streaming=True,
-                            callback_manager=CallbackManager([StreamingStdOutCallbackHandler()]),
-                            verbose=True)
-
     # DB에서 대화 기록 로드
-    chat_history = load_chat_history_from_db(chatroom_id, db)
+    chat_history = await load_chat_history_from_db(chatroom_id, db)
 
     # ConversationBufferMemory에 대화 기록 추가
     memory = ConversationBufferMemory(return_messages=True)
     memory.chat_memory.messages.extend(chat_history)
 
     # ConversationChain 생성
-    return ConversationChain(llm=chat_model, memory=memory)
\ No newline at end of file
+    return ConversationChain(llm=chat_model, memory=memory)
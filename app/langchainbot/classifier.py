@@ -0,0 +1,256 @@
+import json
+import logging
+import math
+import os
+import re
+import sys
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from config import Config
+from langchainbot.llm import openai_client
+from util.cache import cache, cached_get, make_key, normalize_question
+from util.metrics import CLASSIFIER_LOCAL_HITS, CLASSIFIER_LLM_FALLBACKS
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES = ("performance", "summary", "counseling", "recommendation")
+# 분류 결과로 허용하는 값 (카테고리 + 어디에도 속하지 않는 질문)
+LABELS = CATEGORIES + ("unknown",)
+
+CLASSIFICATION_PROMPT = """
+You are an expert in identifying the intent of user queries based on a question.
+Categorize the question into one of the following categories:
+1. performance: Questions related to analyzing academic performance and trends, and suggesting learning strategies.
+2. summary: Questions requiring a summary opinion based on volunteer activities, creative activities, and detailed skills.
+3. counseling: Questions requesting counseling plans or strategies for parent-student discussions.
+4. recommendation: Questions recommending suitable academic majors or career paths based on student records.
+5. unknown: For questions that do not fit into the above categories.
+
+Respond with the category name only.
+"""
+
+# 카테고리별 키워드 규칙 (패턴, 가중치)
+KEYWORD_RULES = {
+    "performance": [
+        (r"성적", 3), (r"등급", 3), (r"내신", 3), (r"석차", 3), (r"성취\s*도", 3),
+        (r"학업\s*성취", 3), (r"점수", 2), (r"추세", 2), (r"과목", 1), (r"평균", 1),
+        (r"학습\s*(방안|전략|방법|계획)", 2), (r"공부\s*(방법|전략)", 2), (r"상위\s*\d*\s*%", 2),
+    ],
+    "summary": [
+        (r"종합\s*의견", 3), (r"세\s*특", 3), (r"세부\s*능력", 3), (r"특기\s*사항", 2),
+        (r"봉사", 3), (r"창\s*체", 3), (r"창의적\s*체험", 3), (r"행동\s*특성", 3),
+        (r"요약", 2), (r"총평", 3), (r"독서", 1),
+    ],
+    "counseling": [
+        (r"상담", 3), (r"학부모", 3), (r"부모님?", 2), (r"면담", 3), (r"소통", 2),
+        (r"대화\s*(방법|방안)", 2),
+    ],
+    "recommendation": [
+        (r"진로", 3), (r"학과", 3), (r"전공", 3), (r"추천", 2), (r"대학", 2),
+        (r"직업", 3), (r"계열", 2), (r"적성", 2), (r"진학", 2),
+    ],
+}
+
+COMPILED_RULES = {
+    category: [(re.compile(pattern), weight) for pattern, weight in rules]
+    for category, rules in KEYWORD_RULES.items()
+}
+
+# 규칙 결과를 신뢰하기 위한 최소 점수와 1위 카테고리의 점수 비율
+RULE_MIN_SCORE = 3
+RULE_MIN_SHARE = 0.7
+
+# 학습 모델 결과를 신뢰하기 위한 최소 확률
+MODEL_MIN_PROBABILITY = 0.85
+
+def classify_by_rules(question: str) -> Tuple[Optional[str], float]:
+    """
+    키워드 규칙으로 질문을 분류하여 (카테고리, 신뢰도)를 반환.
+    확신할 수 없으면 카테고리는 None.
+    """
+    scores = {
+        category: sum(weight for pattern, weight in rules if pattern.search(question))
+        for category, rules in COMPILED_RULES.items()
+    }
+    total = sum(scores.values())
+    if total == 0:
+        return None, 0.0
+
+    category, top_score = max(scores.items(), key=lambda item: item[1])
+    share = top_score / total
+    if top_score >= RULE_MIN_SCORE and share >= RULE_MIN_SHARE:
+        return category, share
+    return None, share
+
+
+def _char_ngrams(text: str, n: int = 2) -> list:
+    text = re.sub(r"\s+", " ", text.strip().lower())
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+class NaiveBayesClassifier:
+    """
+    질문→카테고리 로그로 학습하는 문자 bigram 기반 나이브 베이즈 분류기.
+    한국어는 형태소 분석 없이도 bigram만으로 충분히 구분됨.
+    """
+
+    def __init__(self, class_counts: Dict[str, int], token_counts: Dict[str, Dict[str, int]]):
+        self.class_counts = class_counts
+        self.token_counts = token_counts
+        self.vocab_size = len({token for counts in token_counts.values() for token in counts}) or 1
+        self.class_totals = {category: sum(counts.values()) for category, counts in token_counts.items()}
+        self.total_docs = sum(class_counts.values())
+
+    @classmethod
+    def train(cls, samples: Iterable[Tuple[str, str]]) -> "NaiveBayesClassifier":
+        class_counts = Counter()
+        token_counts = defaultdict(Counter)
+        for question, category in samples:
+            class_counts[category] += 1
+            token_counts[category].update(_char_ngrams(question))
+        return cls(dict(class_counts), {category: dict(counts) for category, counts in token_counts.items()})
+
+    def predict(self, question: str) -> Tuple[Optional[str], float]:
+        if not self.total_docs:
+            return None, 0.0
+
+        tokens = _char_ngrams(question)
+        log_scores = {}
+        for category, doc_count in self.class_counts.items():
+            counts = self.token_counts.get(category, {})
+            denominator = self.class_totals.get(category, 0) + self.vocab_size
+            score = math.log(doc_count / self.total_docs)
+            for token in tokens:
+                score += math.log((counts.get(token, 0) + 1) / denominator)
+            log_scores[category] = score
+
+        # softmax로 확률 변환
+        best = max(log_scores.values())
+        exp_scores = {category: math.exp(score - best) for category, score in log_scores.items()}
+        normalizer = sum(exp_scores.values())
+        category = max(exp_scores, key=exp_scores.get)
+        return category, exp_scores[category] / normalizer
+
+    def to_dict(self) -> dict:
+        return {"class_counts": self.class_counts, "token_counts": self.token_counts}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "NaiveBayesClassifier":
+        return cls(data["class_counts"], data["token_counts"])
+
+
+def load_model(model_path: Optional[str]) -> Optional[NaiveBayesClassifier]:
+    """
+    학습된 모델 파일이 있으면 로드, 없으면 None
+    """
+    if not model_path or not os.path.exists(model_path):
+        return None
+    with open(model_path, encoding="utf-8") as f:
+        return NaiveBayesClassifier.from_dict(json.load(f))
+
+
+def train_model(log_path: str, model_path: str) -> NaiveBayesClassifier:
+    """
+    LLM 분류 로그(JSON Lines: {"question", "category"})로 모델을 학습하고 저장
+    """
+    samples = []
+    with open(log_path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            # 검증 없이 기록되던 예전 로그의 잘못된 분류 값은 학습에서 제외
+            if row.get("category") in LABELS:
+                samples.append((row["question"], row["category"]))
+
+    model = NaiveBayesClassifier.train(samples)
+    with open(model_path, "w", encoding="utf-8") as f:
+        json.dump(model.to_dict(), f, ensure_ascii=False)
+    return model
+
+
+local_model = load_model(Config.CLASSIFIER_MODEL_PATH)
+
+
+def classify_locally(question: str) -> Optional[str]:
+    """
+    규칙 → 학습 모델 순서로 로컬 분류를 시도. 확신할 수 없으면 None.
+    """
+    category, _ = classify_by_rules(question)
+    if category:
+        CLASSIFIER_LOCAL_HITS.labels(stage="rules").inc()
+        return category
+
+    if local_model is not None:
+        category, probability = local_model.predict(question)
+        if category in LABELS and probability >= MODEL_MIN_PROBABILITY:
+            CLASSIFIER_LOCAL_HITS.labels(stage="model").inc()
+            return category
+
+    return None
+
+
+def log_classification(question: str, category: str):
+    """
+    LLM 분류 결과를 학습용 로그로 남김 (CLASSIFIER_LOG_PATH가 설정된 경우, 허용된 분류 값만).
+    파일 쓰기이므로 이벤트 루프에서는 run_in_threadpool로 호출
+    """
+    if not Config.CLASSIFIER_LOG_PATH or category not in LABELS:
+        return
+    with open(Config.CLASSIFIER_LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"question": question, "category": category}, ensure_ascii=False) + "\n")
+
+
+def parse_label(reply: str) -> Optional[str]:
+    """
+    LLM 응답에서 분류 값을 꺼냄 ("performance.", "Category: summary" 등). 허용된 값이 없으면 None
+    """
+    for word in re.findall(r"[a-z]+", reply.lower()):
+        if word in LABELS:
+            return word
+    return None
+
+
+async def classify_with_llm(question: str) -> Optional[str]:
+    classification_response = await openai_client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": CLASSIFICATION_PROMPT},
+            {"role": "user", "content": f"Question: {question}"}
+        ]
+    )
+    return parse_label(classification_response.choices[0].message.content or "")
+
+
+async def classify_question(question: str) -> str:
+    """
+    질문 의도를 분류하여 카테고리 이름을 반환.
+    로컬 분류기로 확신할 수 있는 질문은 LLM 호출 없이 바로 반환하고,
+    나머지는 캐시를 확인한 뒤 없을 때만 LLM으로 분류.
+    LLM 응답이 허용된 값이 아니면 "unknown"으로 처리하며, 이 결과는 캐시/학습 로그에 남기지 않음.
+    """
+    category = classify_locally(question)
+    if not category:
+        cache_key = make_key("classification", normalize_question(question))
+        category = await cached_get("classification", cache_key)
+        if category not in LABELS:
+            CLASSIFIER_LLM_FALLBACKS.inc()
+            category = await classify_with_llm(question)
+            if category is None:
+                logger.warning("LLM returned an invalid classification label")
+                return "unknown"
+            await run_in_threadpool(log_classification, question, category)
+            await cache.aset(cache_key, category, ttl=Config.CLASSIFICATION_CACHE_TTL)
+
+    logger.debug("Question classified", extra={"category": category})
+    return category
+
+
+if __name__ == "__main__":
+    # 사용법: python -m langchainbot.classifier <분류 로그 경로> <모델 저장 경로>
+    trained = train_model(sys.argv[1], sys.argv[2])
+    print(f"학습 완료: {trained.total_docs}개 질문, 카테고리 {sorted(trained.class_counts)}")
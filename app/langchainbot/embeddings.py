@@ -0,0 +1,69 @@
+import re
+import zlib
+from typing import List
+
+import numpy as np
+
+from config import Config
+from langchainbot.llm import sync_openai_client
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (vectors / norms).astype(np.float32)
+
+
+class HashingEmbedder:
+    """
+    단어와 문자 2-gram을 해싱한 임베딩 (빈도는 log 스케일). 외부 호출 없이 결정적으로 동작 (테스트/오프라인용)
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        words = WORD_PATTERN.findall(text)
+        joined = " ".join(words)
+        return words + [joined[i:i + 2] for i in range(len(joined) - 1)]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                digest = zlib.crc32(feature.encode("utf-8"))
+                vectors[row, digest % self.dim] += 1.0 if digest & 0x80000000 else -1.0
+        vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+        return _normalize(vectors)
+
+
+class OpenAIEmbedder:
+    """
+    OpenAI 임베딩 API (batch_size개씩 나누어 요청)
+    """
+
+    def __init__(self, model: str, batch_size: int = 100):
+        self.name = model
+        self.batch_size = batch_size
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = []
+        for start in range(0, len(texts), self.batch_size):
+            response = sync_openai_client.embeddings.create(model=self.name, input=texts[start:start + self.batch_size])
+            vectors.extend(item.embedding for item in sorted(response.data, key=lambda item: item.index))
+        return _normalize(np.array(vectors, dtype=np.float32))
+
+
+def get_embedder():
+    """
+    EMBEDDER 설정에 따라 임베딩 생성기 선택 (openai | hashing)
+    """
+    if Config.EMBEDDER == "hashing":
+        return HashingEmbedder()
+    return OpenAIEmbedder(Config.EMBEDDING_MODEL)
+
+
+embedder = get_embedder()
@@ -0,0 +1,45 @@
+import httpx
+from langchain_community.chat_models import ChatOpenAI
+from openai import AsyncOpenAI, OpenAI
+
+from config import Config
+
+# 프로세스 전체에서 공유하는 OpenAI HTTP 커넥션 풀 (keep-alive로 TLS 핸드셰이크 재사용)
+http_client = httpx.AsyncClient(
+    limits=httpx.Limits(
+        max_connections=Config.OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=Config.OPENAI_KEEPALIVE_EXPIRY,
+    ),
+    timeout=httpx.Timeout(Config.OPENAI_TIMEOUT, connect=5.0),
+)
+
+openai_client = AsyncOpenAI(http_client=http_client)
+
+# Celery 워커 등 동기 코드에서 사용하는 클라이언트 (생활기록부 항목 요약)
+sync_openai_client = OpenAI(
+    http_client=httpx.Client(
+        limits=httpx.Limits(
+            max_connections=Config.OPENAI_MAX_CONNECTIONS,
+            max_keepalive_connections=Config.OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=Config.OPENAI_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(Config.OPENAI_TIMEOUT, connect=5.0),
+    )
+)
+
+# 답변 생성 모델. 요청별 콜백은 생성자 대신 호출 시 config로 전달
+chat_model = ChatOpenAI(temperature=0.7,
+                        model="gpt-4o",
+                        streaming=True,
+                        async_client=openai_client.chat.completions,
+                        verbose=True)
+
+# 대화 요약 모델. 답변 생성보다 가벼운 모델로 충분
+summary_model = ChatOpenAI(temperature=0,
+                           model="gpt-4o-mini",
+                           async_client=openai_client.chat.completions)
+
+
+async def close_clients():
+    await http_client.aclose()
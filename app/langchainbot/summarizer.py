@@ -0,0 +1,31 @@
+from config import Config
+from langchainbot.llm import sync_openai_client
+from util.cache import cache, cached_get_sync, make_key
+
+PASSAGE_SUMMARY_MODEL = "gpt-4o-mini"
+
+PASSAGE_SUMMARY_PROMPT = """
+다음은 학생 생활기록부의 한 항목입니다.
+학생의 활동, 역량, 태도가 드러나는 구체적인 내용(과목, 활동명, 탐구 주제, 성과)은 유지하고
+중복되거나 수식적인 표현은 줄여 원문의 3분의 1 이내 분량으로 요약해 주세요.
+요약문만 한국어로 작성해 주세요.
+
+{text}
+"""
+
+
+def summarize_passage(text: str) -> str:
+    """
+    생활기록부 서술형 항목(세특, 행동특성 등)을 요약. 같은 문장은 한 번만 요약하도록 결과를 캐시
+    """
+    cache_key = make_key("passage_summary", text)
+    summary = cached_get_sync("passage_summary", cache_key)
+    if summary is None:
+        response = sync_openai_client.chat.completions.create(
+            model=PASSAGE_SUMMARY_MODEL,
+            temperature=0,
+            messages=[{"role": "user", "content": PASSAGE_SUMMARY_PROMPT.format(text=text)}],
+        )
+        summary = (response.choices[0].message.content or "").strip()
+        cache.set(cache_key, summary, ttl=Config.PASSAGE_SUMMARY_CACHE_TTL)
+    return summary
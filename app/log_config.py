@@ -0,0 +1,206 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from prometheus_client import Counter
+
+from config import Config
+
+# util 패키지를 불러오면 Celery 설정을 다시 불러오므로 (celery_config에서 사용) 로깅 설정은 여기에 정의
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total",
+    "로그 대기열이 가득 차 버린 로그 수",
+)
+
+# 요청/작업 추적 id (API 요청에서 만들어 Celery 작업 헤더로 전달)
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+task_id: ContextVar[Optional[str]] = ContextVar("task_id", default=None)
+
+REQUEST_ID_HEADER = "x-request-id"
+# 클라이언트가 보낸 요청 id는 형식이 맞을 때만 사용 (로그 주입 방지)
+_REQUEST_ID_PATTERN = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# LogRecord 기본 속성 (이 외의 속성은 extra로 넘긴 필드)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message", "asctime", "sample_rate", "request_id", "task_id",
+}
+
+_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex
+
+
+def redact(key: str, value):
+    """
+    학생 데이터 필드는 길이만 남기고, 그 밖의 긴 문자열은 잘라서 기록
+    """
+    if key in Config.LOG_REDACT_FIELDS:
+        return f"[redacted {len(str(value))} chars]"
+    if isinstance(value, str) and len(value) > Config.LOG_MAX_FIELD_CHARS:
+        return value[:Config.LOG_MAX_FIELD_CHARS] + f"...[{len(value)} chars]"
+    return value
+
+
+class ContextFilter(logging.Filter):
+    """
+    로그를 남긴 시점의 요청/작업 id를 기록에 붙임 (대기열을 거친 뒤에는 컨텍스트가 달라지므로 호출 스레드에서 실행)
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if getattr(record, "request_id", None) is None:
+            record.request_id = request_id.get()
+        record.task_id = task_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    양이 많은 DEBUG 로그는 비율만큼만 남김. extra={"sample_rate": ...}로 로그마다 비율 지정 가능
+    """
+
+    def __init__(self, debug_rate: float):
+        super().__init__()
+        self.debug_rate = debug_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = getattr(record, "sample_rate", self.debug_rate if record.levelno <= logging.DEBUG else 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    한 줄짜리 JSON 로그. extra로 넘긴 필드는 최상위 키로 기록하고 학생 데이터 필드는 가림
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact("message", record.getMessage()),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        if getattr(record, "task_id", None):
+            entry["task_id"] = record.task_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key not in entry:
+                entry[key] = redact(key, value)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    대기열이 가득 차면 기다리지 않고 버림 (로그 출력이 느려져도 요청 처리는 막히지 않도록)
+    """
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc()
+
+
+def configure_logging():
+    """
+    루트 로거를 JSON + 대기열 핸들러로 설정. 직렬화는 호출 스레드에서, stdout 쓰기는 별도 스레드에서 수행.
+    API(main)와 Celery 워커(setup_logging 시그널)에서 한 번씩 호출
+    """
+    global _handler
+    if _handler is not None:
+        return
+
+    _handler = DroppingQueueHandler(queue.Queue(Config.LOG_QUEUE_SIZE))
+    _handler.setFormatter(JsonFormatter())
+    _handler.addFilter(ContextFilter())
+    _handler.addFilter(SamplingFilter(Config.LOG_DEBUG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(Config.LOG_LEVEL)
+
+    # uvicorn은 자체 핸들러로 바로 출력하므로 루트 로거(대기열)로 넘김
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        logger = logging.getLogger(name)
+        logger.handlers.clear()
+        logger.propagate = True
+    # httpx는 OpenAI/OCR 호출마다 INFO 로그를 남기므로 경고 이상만 기록
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    _start_listener()
+    atexit.register(stop_logging)
+    # Celery prefork 자식 프로세스에는 출력 스레드가 복제되지 않으므로 fork 후 새 대기열로 다시 시작
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def _start_listener():
+    global _listener
+    output = logging.StreamHandler()
+    output.setFormatter(logging.Formatter("%(message)s"))
+    _listener = logging.handlers.QueueListener(_handler.queue, output)
+    _listener.start()
+
+
+def _restart_after_fork():
+    # 부모의 출력 스레드가 대기열 잠금을 잡은 채로 fork되었을 수 있으므로 대기열도 새로 만듦
+    _handler.queue = queue.Queue(Config.LOG_QUEUE_SIZE)
+    _start_listener()
+
+
+def stop_logging():
+    """
+    대기열에 남은 로그를 모두 출력하고 출력 스레드를 종료
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """
+    요청마다 요청 id를 정해 request_id에 넣고 응답 헤더(X-Request-ID)로 돌려줌.
+    클라이언트/프록시가 보낸 X-Request-ID가 있으면 그대로 사용.
+    처리되지 않은 예외는 이 미들웨어 밖(ServerErrorMiddleware)에서 처리되므로 scope["request_id"]에도 남김
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(REQUEST_ID_HEADER.encode("latin-1"), b"").decode("latin-1")
+        current = incoming if _REQUEST_ID_PATTERN.match(incoming) else new_request_id()
+        scope["request_id"] = current
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (REQUEST_ID_HEADER.encode("latin-1"), current.encode("latin-1"))
+                ]
+            await send(message)
+
+        token = request_id.set(current)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
@@ -1,10 +1,31 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from exceptions import http_exception_handler, validation_exception_handler, global_exception_handler, custom_exception_handler, CustomException
 from fastapi.exceptions import RequestValidationError
 from fastapi import HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import make_asgi_app
 from routes import user, chatroom, message, student_record
-app = FastAPI()
+from langchainbot.llm import close_clients
+from db_pool import RequestScopeMiddleware
+from util.metrics import MetricsMiddleware, mark_process_dead, metrics_registry
+from auth.password_hasher import password_hasher
+from log_config import RequestIdMiddleware, configure_logging
+
+# JSON 로그 (uvicorn 로그 포함, stdout 출력은 별도 스레드에서)
+configure_logging()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # 공유 OpenAI 커넥션 풀과 비밀번호 해시 프로세스 풀 정리, 이 워커의 게이지 값은 집계에서 제외
+    await close_clients()
+    password_hasher.shutdown()
+    mark_process_dead(os.getpid())
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 설정
 origins = [
@@ -19,6 +40,12 @@ app.add_middleware(
     allow_methods=["*"],  # 허용할 HTTP 메서드 (GET, POST 등)
     allow_headers=["*"],  # 허용할 HTTP 헤더
 )
+# DB 커넥션 풀 메트릭에 엔드포인트를 남기기 위해 요청 scope를 보관
+app.add_middleware(RequestScopeMiddleware)
+# 요청 수/처리 시간 메트릭
+app.add_middleware(MetricsMiddleware)
+# 요청 id (로그와 Celery 작업에 전달, 응답 헤더 X-Request-ID) - 가장 바깥에서 실행되도록 마지막에 추가
+app.add_middleware(RequestIdMiddleware)
 
 app.add_exception_handler(HTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
@@ -29,6 +56,8 @@ app.include_router(user.router, prefix="/users", tags=["Users"])
 app.include_router(chatroom.router, prefix="/chatrooms", tags=["ChatRooms"])
 app.include_router(message.router, prefix="/chatrooms/{chatroom_id}/messages", tags=["Messages"])
 app.include_router(student_record.router, prefix="/student-records", tags=["Student Records"])
+# Prometheus 메트릭 (uvicorn 워커가 여러 개면 PROMETHEUS_MULTIPROC_DIR의 값을 합쳐서 내보냄)
+app.mount("/metrics", make_asgi_app(registry=metrics_registry()))
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Chatbot API"}
\ No newline at end of file
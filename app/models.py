@@ -1,8 +1,8 @@
-from sqlalchemy import Integer, String, ForeignKey, Text, DateTime
+from sqlalchemy import Integer, String, ForeignKey, Text, DateTime, Index, Float
 from sqlalchemy.orm import relationship
 from database import Base
 from sqlalchemy import Column, DateTime, func
-from sqlalchemy.dialects.mysql import JSON
+from sqlalchemy.dialects.mysql import JSON, MEDIUMTEXT
 
 class BaseModelMixin:
     created_at = Column(DateTime, default=func.now(), nullable=False)
@@ -13,6 +13,8 @@ class User(Base, BaseModelMixin):
     id = Column(Integer, primary_key=True, autoincrement=True)
     username = Column(String(255), unique=True, index=True)
     password = Column(String(255))
+    # 로그아웃 시 증가시켜 이전에 발급한 토큰을 모두 무효화
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
     chatrooms = relationship("ChatRoom", back_populates="owner")
 
 class ChatRoom(Base, BaseModelMixin):
@@ -20,9 +22,19 @@ class ChatRoom(Base, BaseModelMixin):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
+    # 목록 조회용 비정규화 컬럼 (create_message에서 갱신)
+    last_message_at = Column(DateTime, nullable=True)
+    last_message_preview = Column(String(255), nullable=True)
+    # 대화 윈도우 밖으로 밀려난 이전 대화의 요약과, 요약에 포함된 마지막 메시지 id
+    history_summary = Column(Text, nullable=True)
+    summary_until_message_id = Column(Integer, nullable=True)
     messages = relationship("Message", back_populates="chatroom")
     owner = relationship("User", back_populates="chatrooms")
 
+    __table_args__ = (
+        Index("ix_chatrooms_user_id_last_message_at", "user_id", "last_message_at"),
+    )
+
 class Message(Base, BaseModelMixin):
     __tablename__ = "messages"
     id = Column(Integer, primary_key=True, index=True)
@@ -30,6 +42,10 @@ class Message(Base, BaseModelMixin):
     answer = Column(Text)
     chatroom_id = Column(Integer, ForeignKey("chatrooms.id"))
     chatroom = relationship("ChatRoom", back_populates="messages")
+
+    __table_args__ = (
+        Index("ix_messages_chatroom_id_id", "chatroom_id", "id"),
+    )
 class StudentRecord(Base, BaseModelMixin):
     __tablename__ = "student_records"
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -37,3 +53,63 @@ class StudentRecord(Base, BaseModelMixin):
     file_url = Column(String(2092), nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     text_data = Column(JSON)
+    # 원본 PDF의 SHA-256. 같은 파일이 다시 업로드되면 OCR 없이 기존 결과를 재사용
+    file_hash = Column(String(64), nullable=True, index=True)
+    sections = relationship("StudentRecordSection", back_populates="student_record", cascade="all, delete-orphan")
+    grades = relationship("StudentGrade", back_populates="student_record", cascade="all, delete-orphan")
+    contexts = relationship("StudentRecordContext", back_populates="student_record", cascade="all, delete-orphan")
+
+class StudentRecordSection(Base, BaseModelMixin):
+    """
+    생활기록부 섹션별 내용 (값은 JSON 문자열). 교과학습발달상황은 성적 행을 제외한 학년별 세특/체육·예술/특기사항.
+    """
+    __tablename__ = "student_record_sections"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    student_record_id = Column(Integer, ForeignKey("student_records.id"), nullable=False)
+    name = Column(String(50), nullable=False)
+    content = Column(MEDIUMTEXT)
+    student_record = relationship("StudentRecord", back_populates="sections")
+
+    __table_args__ = (
+        Index("ix_student_record_sections_record_id_name", "student_record_id", "name", unique=True),
+    )
+
+class StudentGrade(Base, BaseModelMixin):
+    """
+    교과학습발달상황의 과목별 성적 행
+    """
+    __tablename__ = "student_grades"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    student_record_id = Column(Integer, ForeignKey("student_records.id"), nullable=False)
+    grade = Column(String(10), nullable=False)  # 학년 (1학년, 2학년, ...)
+    subject_group = Column(String(50))  # 교과
+    subject = Column(String(100), nullable=False)  # 과목
+    credits = Column(Integer)  # 단위수
+    raw_score = Column(Float)  # 원점수
+    subject_average = Column(Float)  # 과목평균
+    standard_deviation = Column(Float)  # 표준편차
+    achievement = Column(String(2))  # 성취도
+    enrolled = Column(Integer)  # 수강자수
+    rank = Column(Integer)  # 석차등급
+    student_record = relationship("StudentRecord", back_populates="grades")
+
+    __table_args__ = (
+        Index("ix_student_grades_record_id_grade", "student_record_id", "grade"),
+        Index("ix_student_grades_subject", "subject"),
+    )
+
+class StudentRecordContext(Base, BaseModelMixin):
+    """
+    카테고리별로 미리 만들어 둔 학생 context (압축된 JSON 문자열과 토큰 수)
+    """
+    __tablename__ = "student_record_contexts"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    student_record_id = Column(Integer, ForeignKey("student_records.id"), nullable=False)
+    category = Column(String(20), nullable=False)
+    content = Column(MEDIUMTEXT, nullable=False)
+    token_count = Column(Integer, nullable=False)
+    student_record = relationship("StudentRecord", back_populates="contexts")
+
+    __table_args__ = (
+        Index("ix_student_record_contexts_record_id_category", "student_record_id", "category", unique=True),
+    )
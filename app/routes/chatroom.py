@@ -1,14 +1,17 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import and_, or_
 from schemas import ChatRoomCreate, create_response
 from fastapi.encoders import jsonable_encoder
 from crud.chatroom_crud import create_chatroom
 from database import get_db
-from models import ChatRoom, Message
+from models import ChatRoom
 from util.examples import common_examples, create_example_response
 from fastapi import Query
 from auth.oauth2 import get_current_user
+from util.pagination import encode_cursor, decode_cursor
+from datetime import datetime
+from typing import Optional
 router = APIRouter()
 @router.post(
     "",
@@ -40,41 +43,47 @@ def create_new_chatroom(chatroom: ChatRoomCreate, user_id: int = Depends(get_cur
 def get_chatrooms(
     user_id: int = Depends(get_current_user),
     db: Session = Depends(get_db),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
     size: int = Query(10, ge=1, le=50),
 ):
     """
-    채팅방 목록을 페이지네이션과 함께 반환합니다.
+    채팅방 목록을 최근 메시지 순으로 커서 기반 페이지네이션과 함께 반환합니다.
+    채팅방에 비정규화된 마지막 메시지 정보와 (user_id, last_message_at) 인덱스를 사용하므로
+    전체 메시지 수와 관계없이 페이지 크기만큼만 조회합니다.
     """
-    offset = (page - 1) * size
-
-    # 최신 메시지를 기준으로 각 채팅방의 정보를 가져오기
-    subquery = (
+    query = (
         db.query(
-            Message.chatroom_id,
-            func.max(Message.created_at).label("latest_message_time")
+            ChatRoom.id,
+            ChatRoom.name,
+            ChatRoom.last_message_preview.label("last_message"),
+            ChatRoom.last_message_at.label("last_message_time"),
         )
-        .group_by(Message.chatroom_id)
-        .subquery()
+        .filter(ChatRoom.user_id == user_id, ChatRoom.last_message_at.isnot(None))
     )
 
-    # 채팅방과 최신 메시지 결합
-    chatrooms_query = (
-        db.query(
-            ChatRoom.id,
-            ChatRoom.name,
-            Message.answer.label("last_message"),
-            subquery.c.latest_message_time.label("last_message_time"),
+    if cursor:
+        cursor_time, cursor_id = decode_cursor(cursor, datetime, int)
+        query = query.filter(
+            or_(
+                ChatRoom.last_message_at < cursor_time,
+                and_(ChatRoom.last_message_at == cursor_time, ChatRoom.id < cursor_id),
+            )
         )
-        .join(subquery, ChatRoom.id == subquery.c.chatroom_id)
-        .join(Message, (Message.chatroom_id == ChatRoom.id) & (Message.created_at == subquery.c.latest_message_time))
-        .filter(ChatRoom.user_id == user_id)
-        .order_by(subquery.c.latest_message_time.desc())
-        .offset(offset)
-        .limit(size)
+
+    # 다음 페이지 존재 여부를 알기 위해 한 개 더 조회
+    chatrooms = (
+        query.order_by(ChatRoom.last_message_at.desc(), ChatRoom.id.desc())
+        .limit(size + 1)
+        .all()
     )
+    has_next = len(chatrooms) > size
+    chatrooms = chatrooms[:size]
+
+    next_cursor = None
+    if has_next:
+        last = chatrooms[-1]
+        next_cursor = encode_cursor(last.last_message_time, last.id)
 
-    chatrooms = chatrooms_query.all()
     # 데이터 변환
     data = [
         {
@@ -86,11 +95,8 @@ def get_chatrooms(
         for chatroom in chatrooms
     ]
 
-    # 전체 개수 계산
-    total_count = db.query(ChatRoom).filter(ChatRoom.user_id == user_id).count()
-
     if not chatrooms:
-        return create_response(200, False, "No chatrooms found", {"items": [], "total": 0, "page": page, "size": size})
+        return create_response(200, False, "No chatrooms found", {"items": [], "next_cursor": None, "size": size})
     
     return create_response(
         200,
@@ -98,8 +104,7 @@ def get_chatrooms(
         "Chatroom list retrieved successfully",
         {
             "items": jsonable_encoder(data),
-            "total": total_count,
-            "page": page,
+            "next_cursor": next_cursor,
             "size": size,
         },
-    )
\ No newline at end of file
+    )
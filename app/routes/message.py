@@ -1,30 +1,43 @@
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.encoders import jsonable_encoder
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from schemas import MessageCreate, create_response
 from models import Message as MessageModel
-from crud.message_crud import create_message
-from langchainbot.bot import get_chatbot
-from database import get_db
+from crud.message_crud import create_message, has_messages
+from crud.student_record_crud import get_record_sections, get_record_context, save_record_context
+from util.student_context import CATEGORY_SECTIONS, ContextSnapshot, context_cache_key, render_contexts
+from util.passage_index import retrieve_context
+from langchainbot.embeddings import embedder
+from langchainbot.bot import get_chatbot, QueueCallbackHandler, STREAM_END
+from database import get_async_db, AsyncSessionLocal, release_async_db
 from util.examples import common_examples, create_example_response
 from auth.oauth2 import get_current_user
 from models import StudentRecord
-import openai
-import json
+from langchainbot.classifier import classify_question
+from langchainbot.summarizer import summarize_passage
+from util.cache import cache, cached_get, hash_text, make_key, normalize_question
+from util.sse import SSE_HEADERS, format_sse
+from util.metrics import MESSAGE_STAGE_SECONDS, MESSAGE_TOKENS
+from util.tokens import count_tokens
+from config import Config
+from typing import Optional
+import asyncio
+import logging
 
-router = APIRouter()
+logger = logging.getLogger(__name__)
 
-CLASSIFICATION_PROMPT = """
-You are an expert in identifying the intent of user queries based on a question.
-Categorize the question into one of the following categories:
-1. performance: Questions related to analyzing academic performance and trends, and suggesting learning strategies.
-2. summary: Questions requiring a summary opinion based on volunteer activities, creative activities, and detailed skills.
-3. counseling: Questions requesting counseling plans or strategies for parent-student discussions.
-4. recommendation: Questions recommending suitable academic majors or career paths based on student records.
-5. unknown: For questions that do not fit into the above categories.
+router = APIRouter()
 
-Respond with the category name only.
-"""
+# 메시지 목록 조회 시 선택할 수 있는 필드
+MESSAGE_FIELDS = {
+    "id": MessageModel.id,
+    "chatroom_id": MessageModel.chatroom_id,
+    "question": MessageModel.question,
+    "answer": MessageModel.answer,
+    "created_at": MessageModel.created_at,
+}
 
 TASK_PROMPTS = {
     "performance": """
@@ -57,93 +70,203 @@ TASK_PROMPTS = {
     """
 }
 
+UNKNOWN_CATEGORY_MESSAGE = "학업 성취도, 종합 의견 작성, 상담, 학과 추천에 관한 질문에만 답변할 수 있습니다! 궁금하신 사항이 있으면 다시 질문해주세요~"
+
+
+async def build_student_context(db: AsyncSession, student_id: int, category: str, question: Optional[str] = None) -> str:
+    """
+    카테고리별 학생 context를 반환. 캐시 → 저장된 context → (없으면) 섹션에서 생성하여 저장 순으로 조회.
+    긴 기록이면 질문과 관련된 문단만 검색하여 context를 구성.
+    """
+    cache_key = context_cache_key(student_id, category)
+    cached = await cached_get("context", cache_key)
+    if cached is not None:
+        snapshot = ContextSnapshot(*cached)
+    else:
+        student = (
+            await db.execute(
+                select(StudentRecord.id)
+                .filter(StudentRecord.id == student_id, StudentRecord.deleted_at.is_(None))
+            )
+        ).first()
+        if not student:
+            raise HTTPException(status_code=404, detail="Student not found")
+
+        snapshot = await get_record_context(db, student_id, category)
+        if snapshot is None:
+            sections = await get_record_sections(db, student_id, CATEGORY_SECTIONS[category])
+            # 요약(LLM 호출)이 포함될 수 있으므로 커넥션을 반납하고 스레드풀에서 생성 (저장할 때 다시 가져옴)
+            await release_async_db(db)
+            contexts = await run_in_threadpool(render_contexts, sections, summarize_passage, (category,))
+            snapshot = contexts[category]
+            await save_record_context(db, student_id, category, snapshot)
+        await cache.aset(cache_key, list(snapshot), ttl=Config.CONTEXT_CACHE_TTL)
+
+    result = snapshot.content
+    if question and snapshot.token_count >= Config.RETRIEVAL_MIN_CONTEXT_TOKENS:
+        # 질문 임베딩(API 호출)과 유사도 계산은 커넥션을 반납한 뒤 스레드풀에서 수행
+        await release_async_db(db)
+        retrieved = await run_in_threadpool(retrieve_context, student_id, category, question, embedder)
+        if retrieved is not None:
+            result = retrieved
+
+    # 학생 기록 내용은 남기지 않고 크기만 기록 (요청마다 발생하므로 DEBUG 샘플링 대상)
+    logger.debug("Student context built",
+                 extra={"student_id": student_id, "category": category, "context_chars": len(result)})
+    return result
+
+
+def answer_cache_key(student_id: int, category: str, question: str, context: str) -> str:
+    """
+    답변 캐시 키: 정규화된 질문 + 학생 + 카테고리 + context 해시.
+    생활기록부 내용이 바뀌면 context 해시가 달라져 자동으로 무효화됨.
+    대화 기록은 키에 포함되지 않으므로 이전 대화가 없는 채팅방에서만 사용.
+    """
+    return make_key("answer", student_id, category, normalize_question(question), hash_text(context))
+
+
 @router.post(
     "",
     responses={
         200: create_example_response("Message sent successfully", common_examples["message_sent_success"]),
     },
 )
-def send_message(    
+async def send_message(    
     chatroom_id: int,
     message: MessageCreate,
     student_id: int,  # 학생 id
     user_id: int = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     
     # 1. 판별 단계
-    classification_response = openai.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": CLASSIFICATION_PROMPT},
-            {"role": "user", "content": f"Question: {message.question}"}
-        ]
-    )
-    category = classification_response.choices[0].message.content
-    print(f"사용자의 질문 의도 : {category}")
+    with MESSAGE_STAGE_SECONDS.labels("classify").time():
+        category = await classify_question(message.question)
 
     # 알 수 없음 처리
     if category == "unknown":
-        return {"message": "학업 성취도, 종합 의견 작성, 상담, 학과 추천에 관한 질문에만 답변할 수 있습니다! 궁금하신 사항이 있으면 다시 질문해주세요~"}
+        return {"message": UNKNOWN_CATEGORY_MESSAGE}
     
     # 2. 학생 정보 로드 및 context 생성
-    student = (
-        db.query(StudentRecord)
-        .filter(StudentRecord.id == student_id, StudentRecord.deleted_at.is_(None))
-        .first()
-    )
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
+    with MESSAGE_STAGE_SECONDS.labels("context").time():
+        result = await build_student_context(db, student_id, category, message.question)
+    MESSAGE_TOKENS.labels("context").observe(count_tokens(result))
 
-    text_data = student.text_data
+    # 3. 같은 학생에 대한 같은 질문이면 캐시된 답변 사용 (답변이 이전 대화에 따라 달라지므로 첫 질문만)
+    cache_key = None
+    if not await has_messages(db, chatroom_id):
+        cache_key = answer_cache_key(student_id, category, message.question, result)
+    bot_response = await cached_get("answer", cache_key) if cache_key else None
+    cached = bot_response is not None
 
-    if isinstance(text_data, str):
-        try:
-            text_data = json.loads(text_data)
-        except json.JSONDecodeError:
-            text_data = {}
-    if not isinstance(text_data, dict):
-        text_data = {}
-
-    if category == "performance":
-        filtered_text_data = {
-            "교과학습발달상황": text_data.get("교과학습발달상황", ""),
-        }
-    elif category == "summary":
-        filtered_text_data = {
-            "독서활동상황": text_data.get("독서활동상황", ""),
-            "창의적 체험활동상황": text_data.get("창의적 체험활동상황", ""),
-            "행동특성 및 종합의견": text_data.get("행동특성 및 종합의견", ""),
-            "자격증 및 인증 취득상황": text_data.get("자격증 및 인증 취득상황", ""),
-        }
-    elif category == "counseling":
-        filtered_text_data = {
-            "인적사항": text_data.get("인적사항", ""),
-            "교과학습발달상황": text_data.get("교과학습발달상황", ""),
-            "행동특성 및 종합의견": text_data.get("인적사항", ""),
-        }
-    elif category == "recommendation": 
-        filtered_text_data = {
-            "진로희망사항": text_data.get("진로희망사항", ""),
-            "교과학습발달상황": text_data.get("교과학습발달상황", ""),
-            "독서활동상황": text_data.get("독서활동상황", ""),
-            "수상경력": text_data.get("수상경력", ""),
-        }
-
-    result = json.dumps(filtered_text_data, ensure_ascii=False)
-    if len(result) > 17000:
-        result = result[:17000] 
-    print(f"최종 전달 context : {result}")
-
-    chatbot = get_chatbot(chatroom_id, db)
-
-    bot_response = chatbot.invoke(result)['response']
-
-    create_message(db, question=message.question, answer=bot_response, chatroom_id=chatroom_id)
-
-    data = {"user_message": message.question, "bot_response": bot_response}
+    if not cached:
+        with MESSAGE_STAGE_SECONDS.labels("history").time():
+            chatbot = await get_chatbot(chatroom_id, db)
+        # LLM 응답을 기다리는 동안 커넥션을 잡고 있지 않도록 반납 (메시지 저장 시 다시 가져옴)
+        await release_async_db(db)
+        with MESSAGE_STAGE_SECONDS.labels("generate").time():
+            bot_response = (await chatbot.ainvoke(result))['response']
+        MESSAGE_TOKENS.labels("answer").observe(count_tokens(bot_response))
+        if cache_key:
+            await cache.aset(cache_key, bot_response, ttl=Config.ANSWER_CACHE_TTL)
+
+    with MESSAGE_STAGE_SECONDS.labels("persist").time():
+        await create_message(db, question=message.question, answer=bot_response, chatroom_id=chatroom_id)
+
+    data = {"user_message": message.question, "bot_response": bot_response, "cached": cached}
     return create_response(200, True, "Message sent successfully", data)
 
+
+@router.post(
+    "/stream",
+    responses={
+        200: {
+            "description": "Server-Sent Events 스트림 (token / done / error 이벤트)",
+            "content": {"text/event-stream": {}},
+        },
+    },
+)
+async def send_message_stream(
+    chatroom_id: int,
+    message: MessageCreate,
+    student_id: int,  # 학생 id
+    user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    send_message의 스트리밍 버전.
+    gpt-4o가 생성하는 토큰을 SSE로 즉시 전달하고, 스트림이 끝나면 최종 답변을 DB에 저장합니다.
+    """
+    # 1. 판별 단계 (404 등의 오류는 스트림 시작 전에 일반 응답으로 반환)
+    with MESSAGE_STAGE_SECONDS.labels("classify").time():
+        category = await classify_question(message.question)
+
+    if category == "unknown":
+        async def unknown_stream():
+            yield format_sse("token", {"token": UNKNOWN_CATEGORY_MESSAGE})
+            yield format_sse("done", {"user_message": message.question, "bot_response": UNKNOWN_CATEGORY_MESSAGE})
+        return StreamingResponse(unknown_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    # 2. 학생 정보 로드 및 context 생성
+    with MESSAGE_STAGE_SECONDS.labels("context").time():
+        result = await build_student_context(db, student_id, category, message.question)
+    MESSAGE_TOKENS.labels("context").observe(count_tokens(result))
+
+    # 3. 캐시된 답변이 있으면 한 번에 전달 (이전 대화가 없는 채팅방의 첫 질문만)
+    cache_key = None
+    if not await has_messages(db, chatroom_id):
+        cache_key = answer_cache_key(student_id, category, message.question, result)
+    cached_response = await cached_get("answer", cache_key) if cache_key else None
+    if cached_response is not None:
+        with MESSAGE_STAGE_SECONDS.labels("persist").time():
+            saved = await create_message(db, question=message.question, answer=cached_response, chatroom_id=chatroom_id)
+
+        async def cached_stream():
+            yield format_sse("token", {"token": cached_response})
+            yield format_sse("done", {"message_id": saved.id, "user_message": message.question, "bot_response": cached_response, "cached": True})
+        return StreamingResponse(cached_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+    token_queue = asyncio.Queue()
+    with MESSAGE_STAGE_SECONDS.labels("history").time():
+        chatbot = await get_chatbot(chatroom_id, db)
+    callbacks = [QueueCallbackHandler(token_queue)]
+
+    async def run_chain():
+        try:
+            with MESSAGE_STAGE_SECONDS.labels("generate").time():
+                return (await chatbot.ainvoke(result, config={"callbacks": callbacks}))["response"]
+        finally:
+            await token_queue.put(STREAM_END)
+
+    async def event_stream():
+        chain_task = asyncio.create_task(run_chain())
+        try:
+            while True:
+                token = await token_queue.get()
+                if token is STREAM_END:
+                    break
+                yield format_sse("token", {"token": token})
+            bot_response = await chain_task
+            MESSAGE_TOKENS.labels("answer").observe(count_tokens(bot_response))
+            if cache_key:
+                await cache.aset(cache_key, bot_response, ttl=Config.ANSWER_CACHE_TTL)
+        except asyncio.CancelledError:
+            # 클라이언트 연결이 끊기면 LLM 호출도 중단
+            chain_task.cancel()
+            raise
+        except Exception:
+            yield format_sse("error", {"message": "Failed to generate response"})
+            return
+
+        # 의존성으로 받은 세션은 응답 전송 전에 닫히므로 저장용 세션을 새로 연다
+        with MESSAGE_STAGE_SECONDS.labels("persist").time():
+            async with AsyncSessionLocal() as persist_db:
+                saved = await create_message(persist_db, question=message.question, answer=bot_response, chatroom_id=chatroom_id)
+
+        yield format_sse("done", {"message_id": saved.id, "user_message": message.question, "bot_response": bot_response, "cached": False})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.get(
     "",
     responses={
@@ -151,8 +274,49 @@ def send_message(
         404: create_example_response("No messages found in this chatroom", common_examples["messages_not_found"]),
     },
 )
-def get_messages(chatroom_id: int, user_id: int = Depends(get_current_user), db: Session = Depends(get_db)):
-    messages = db.query(MessageModel).filter(MessageModel.chatroom_id == chatroom_id).all()
-    if not messages:
+async def get_messages(
+    chatroom_id: int,
+    before: Optional[int] = Query(None, description="이 메시지 id보다 이전 메시지를 조회"),
+    after: Optional[int] = Query(None, description="이 메시지 id보다 이후 메시지를 조회"),
+    limit: int = Query(50, ge=1, le=200),
+    fields: Optional[str] = Query(None, description="반환할 필드 (쉼표 구분, 예: id,question,created_at)"),
+    user_id: int = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    채팅방 메시지를 (chatroom_id, id) 커서 기반으로 페이지네이션하여 반환합니다.
+    커서가 없거나 before만 있으면 최신 메시지부터 과거 방향으로, after가 있으면 이후 방향으로 조회하며
+    items는 항상 오래된 순으로 정렬됩니다. has_more는 조회 방향으로 메시지가 더 있는지를 나타냅니다.
+    """
+    if fields:
+        selected = [field.strip() for field in fields.split(",") if field.strip()]
+        unknown = [field for field in selected if field not in MESSAGE_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    else:
+        selected = list(MESSAGE_FIELDS)
+    # 커서로 사용하는 id는 항상 포함
+    if "id" not in selected:
+        selected.insert(0, "id")
+
+    query = select(*(MESSAGE_FIELDS[field] for field in selected)).filter(MessageModel.chatroom_id == chatroom_id)
+    if before is not None:
+        query = query.filter(MessageModel.id < before)
+    if after is not None:
+        query = query.filter(MessageModel.id > after)
+
+    # after만 있으면 이후 방향, 그 외에는 최신 → 과거 방향으로 조회 (다음 페이지 확인용으로 1개 더)
+    forward = after is not None and before is None
+    order = MessageModel.id.asc() if forward else MessageModel.id.desc()
+    rows = (await db.execute(query.order_by(order).limit(limit + 1))).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not forward:
+        rows.reverse()
+
+    if not rows and before is None and after is None:
         raise HTTPException(status_code=404, detail="No messages found in this chatroom")
-    return create_response(200, True, "Messages retrieved successfully", jsonable_encoder(messages))
\ No newline at end of file
+
+    data = {"items": [dict(row._mapping) for row in rows], "has_more": has_more}
+    return create_response(200, True, "Messages retrieved successfully", data, response_class=ORJSONResponse)
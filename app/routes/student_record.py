@@ -1,26 +1,38 @@
 from fastapi import APIRouter, Depends, UploadFile, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, load_only
 from database import get_db
-from util.s3_utils import S3Service
+from util.storage import upload_store, UploadTooLargeError
 from util.ocr_utiles import split_and_ocr_pdf_with_celery, parse_ocr_text
 from util.examples import common_examples, create_example_response
+from util.job_progress import job_progress
+from util.sse import SSE_HEADERS, format_sse
+from util.cache import cache
+from util.student_context import CATEGORY_SECTIONS, context_cache_key
 from schemas import create_response
-from crud.student_record_crud import create_pdf_file, get_pdf_file, soft_delete_pdf_file
+from crud.student_record_crud import create_pdf_file, get_pdf_file, soft_delete_pdf_file, get_student_grades
 from fastapi import Query
 from auth.oauth2 import get_current_user
 from models import StudentRecord
 from fastapi.encoders import jsonable_encoder
 from celery.result import AsyncResult
 from celery_config import celery_app
+from config import Config
+from typing import Optional
+from uuid import uuid4
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 router = APIRouter()
-s3_service = S3Service()
 
 @router.post(
     "",
     responses={
         200: create_example_response("File upload started successfully", common_examples["upload_success"]),
         400: create_example_response("Invalid file format", common_examples["error_400_invalid_format"]),
+        413: create_example_response("File too large", common_examples["error_413_file_too_large"]),
     },
 )
 def upload_pdf(
@@ -34,16 +46,62 @@ def upload_pdf(
             detail="Only PDF files are allowed.",
         )
 
-    # 3. OCR 처리
+    # 파일 크기 검증 (크기를 알 수 없는 경우 업로드 중에 다시 검사)
+    if file.size is not None and file.size > Config.UPLOAD_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File is too large.",
+        )
+
+    # 3. OCR 처리 (파일은 파트 단위로 스테이징 저장소에 스트리밍하고 태스크에는 키와 내용 해시만 전달)
     try:
-        file_bytes = file.file.read()
-        task = split_and_ocr_pdf_with_celery.apply_async(args=[file_bytes, file.filename, user_id])
-        task_id = task.id
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"OCR processing failed {str(e)}")
+        staged = upload_store.save_stream(file.file, file.filename, max_size=Config.UPLOAD_MAX_SIZE)
+        try:
+            # 워커가 진행 상황을 기록하기 전에 요청한 사용자를 남기도록 작업 id를 미리 정함
+            task_id = str(uuid4())
+            job_progress.assign(task_id, user_id)
+            split_and_ocr_pdf_with_celery.apply_async(
+                args=[staged.key, file.filename, user_id, staged.sha256], task_id=task_id
+            )
+        except Exception:
+            # 태스크를 넣지 못하면 스테이징 파일을 지울 워커가 없으므로 여기서 삭제
+            upload_store.delete(staged.key)
+            raise
+    except UploadTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="File is too large.",
+        )
+    except Exception:
+        logger.exception("PDF upload failed", extra={"user_id": user_id})
+        raise HTTPException(status_code=500, detail="OCR processing failed")
 
     return create_response(200, True, "File uploaded successfully", {"task_id": task_id})
 
+def get_own_progress(task_id: str, user_id: int) -> dict:
+    """
+    요청한 사용자의 작업이면 job_progress 기록을 반환. 없거나 다른 사용자의 작업이면 404
+    """
+    progress = job_progress.get(task_id)
+    if progress is None or progress.get("user_id") != user_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found.")
+    return progress
+
+def progress_response(progress: dict) -> dict:
+    """
+    job_progress 기록을 상태 API 응답 형식으로 변환
+    """
+    response = {
+        "status": progress.get("status", "PENDING"),
+        "stage": progress.get("stage"),
+        "progress": {"completed": progress.get("completed", 0), "total": progress.get("total", 0)},
+    }
+    if "result" in progress:
+        response["result"] = progress["result"]
+    if "error" in progress:
+        response["error"] = progress["error"]
+    return response
+
 @router.get(
     "/tasks/{task_id}/status",
     responses={
@@ -57,10 +115,16 @@ def upload_pdf(
         ),
     },
 )
-def get_task_status(task_id: str):
+def get_task_status(task_id: str, user_id: int = Depends(get_current_user)):
     """
-    작업 상태를 반환하는 API
+    작업 상태를 반환하는 API (본인이 올린 파일의 작업만).
+    분할 태스크는 OCR 조각 작업을 보낸 직후 끝나므로, 작업 전체의 진행 상황(단계, 완료된 조각 수)을 우선 반환.
     """
+    progress = get_own_progress(task_id, user_id)
+    if "status" in progress:
+        return create_response(200, True, "Task status retrieved successfully", progress_response(progress))
+
+    # 워커가 아직 진행 상황을 기록하지 않았으면 Celery 태스크 상태로 응답
     task = AsyncResult(task_id, app=celery_app)
 
     if task.state == "PENDING":
@@ -80,6 +144,37 @@ def get_task_status(task_id: str):
 
     return create_response(200, True, "Task status retrieved successfully", response)
 
+@router.get(
+    "/tasks/{task_id}/events",
+    responses={
+        404: create_example_response(
+            "Task not found",
+            common_examples["task_not_found"],
+        ),
+    },
+)
+async def stream_task_status(task_id: str, user_id: int = Depends(get_current_user)):
+    """
+    작업 진행 상황을 Server-Sent Events로 전달 (폴링 대신 사용, 본인이 올린 파일의 작업만).
+    갱신될 때마다 progress 이벤트를 보내고, 작업이 끝나면 스트림을 닫음.
+    """
+    await run_in_threadpool(get_own_progress, task_id, user_id)
+
+    async def event_stream():
+        try:
+            async for progress in job_progress.subscribe(
+                task_id, heartbeat=Config.JOB_EVENTS_HEARTBEAT, timeout=Config.JOB_EVENTS_TIMEOUT
+            ):
+                if progress is None:
+                    # 연결 유지를 위한 주석 이벤트
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse("progress", progress_response(progress))
+        except Exception as e:
+            yield format_sse("error", {"message": f"Progress stream failed: {str(e)}"})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 @router.delete(
     "",
     responses={
@@ -111,6 +206,8 @@ def delete_pdf(file_id: int, user_id: int = Depends(get_current_user), db: Sessi
 
     # 소프트 삭제: deleted_at 필드 업데이트
     soft_delete_pdf_file(db, student_record)
+    for category in CATEGORY_SECTIONS:
+        cache.delete(context_cache_key(file_id, category))
 
     return create_response(200, True, "File deleted successfully")
 
@@ -135,8 +232,10 @@ def get_student_records(
     offset = (page - 1) * size
 
     # 생활기록부 목록 조회
+    # 목록에는 OCR 결과(text_data)가 필요 없으므로 표시할 컬럼만 로드
     records = (
         db.query(StudentRecord)
+        .options(load_only(StudentRecord.id, StudentRecord.file_name, StudentRecord.file_url, StudentRecord.created_at))
         .filter(StudentRecord.user_id == user_id, StudentRecord.deleted_at.is_(None))
         .order_by(StudentRecord.created_at.desc())
         .offset(offset)
@@ -226,4 +325,54 @@ def get_student_record(
         True,
         "Student record retrieved successfully",
         jsonable_encoder(data),
-    )
\ No newline at end of file
+    )
+
+@router.get(
+    "/students/{student_id}/grades",
+    responses={
+        200: create_example_response("Student grades retrieved successfully", common_examples["student_grades_success"]),
+        404: {"description": "Record not found"}
+    },
+)
+def get_student_record_grades(
+    student_id: int,
+    grade: Optional[str] = Query(None, description="학년 (예: 1학년)"),
+    subject: Optional[str] = Query(None, description="과목"),
+    user_id: int = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    생활기록부의 과목별 성적을 학년/과목으로 필터링하여 반환합니다.
+    """
+    record = (
+        db.query(StudentRecord.id)
+        .filter(
+            StudentRecord.user_id == user_id,
+            StudentRecord.id == student_id,
+            StudentRecord.deleted_at.is_(None),
+        )
+        .first()
+    )
+
+    if not record:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Record not found."
+        )
+
+    data = [
+        {
+            "grade": row.grade,
+            "subject_group": row.subject_group,
+            "subject": row.subject,
+            "credits": row.credits,
+            "raw_score": row.raw_score,
+            "subject_average": row.subject_average,
+            "standard_deviation": row.standard_deviation,
+            "achievement": row.achievement,
+            "enrolled": row.enrolled,
+            "rank": row.rank,
+        }
+        for row in get_student_grades(db, student_id, grade=grade, subject=subject)
+    ]
+
+    return create_response(200, True, "Student grades retrieved successfully", {"items": data})
@@ -1,37 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, Cookie, status
+from fastapi import APIRouter, Depends, HTTPException, Cookie, status
 
 # Auth
-from auth.oauth2 import create_access_token, verify_refresh_token, create_refresh_token, get_current_user
+from auth.oauth2 import create_access_token, verify_refresh_token, create_refresh_token, get_current_user, token_claims, user_versions
 
 # Database
-from database import get_db
+from database import get_db, get_async_db
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from models import User as UserModel
 from schemas import UserCreate, create_response
-from crud.user_crud import create_user
+from crud.user_crud import create_user, get_user_by_username, increment_token_version, update_password_hash
 
 from util.examples import common_examples, create_example_response
-import bcrypt
+from auth.password_hasher import password_hasher, PasswordHasherBusy
 
 from config import Config
 
 router = APIRouter()
+
+def hasher_busy() -> HTTPException:
+    # 해시 대기열이 가득 차면 스레드/프로세스를 더 쌓지 않고 바로 거절
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many authentication requests, please retry shortly",
+        headers={"Retry-After": str(Config.PASSWORD_HASH_RETRY_AFTER)},
+    )
+
 @router.post(
     "/signup",
     responses={
         200: create_example_response("Signup successful", common_examples["signup_success"]),
         400: create_example_response("User already registered", common_examples["error_400"]),
+        429: create_example_response("Too many requests", common_examples["error_429"]),
     },
 )
-def create_new_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_new_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # 이메일 중복 확인
-    db_user = db.query(UserModel).filter(UserModel.username == user.username).first()
+    db_user = await get_user_by_username(db, user.username)
     if db_user:
         raise HTTPException(status_code=400, detail="User already registered")
-    salt = bcrypt.gensalt()
-    hashed_password = bcrypt.hashpw(user.password.encode("utf-8"), salt)
-    user.password = hashed_password
-    new_user = create_user(db, user)
+    try:
+        user.password = await password_hasher.hash(user.password)
+    except PasswordHasherBusy:
+        raise hasher_busy()
+    new_user = await create_user(db, user)
     return create_response(200, True, "User created successfully", {"id": new_user.id, "username": new_user.username})
 # 로그인 API
 @router.post(
@@ -39,21 +51,31 @@ def create_new_user(user: UserCreate, db: Session = Depends(get_db)):
     responses={
         200: create_example_response("Login successful", common_examples["login_success"]),
         400: create_example_response("Invalid credentials", common_examples["error_400"]),
+        429: create_example_response("Too many requests", common_examples["error_429"]),
     },
 )
-def login(request: UserCreate, response: Response, db: Session = Depends(get_db)):
+async def login(request: UserCreate, db: AsyncSession = Depends(get_async_db)):
     # 사용자 확인
-    db_user = db.query(UserModel).filter(UserModel.username == request.username).first()
+    db_user = await get_user_by_username(db, request.username)
     if not db_user:
         raise HTTPException(status_code=400, detail="Incorrect username")
-    if not bcrypt.checkpw(request.password.encode('utf-8'), db_user.password.encode('utf-8')):
-        raise HTTPException(status_code=400, detail="Incorrect password")
+    try:
+        if not await password_hasher.verify(request.password, db_user.password):
+            raise HTTPException(status_code=400, detail="Incorrect password")
+        # bcrypt cost 설정이 바뀌었으면 맞는 비밀번호를 받은 지금 새 cost로 다시 저장
+        if password_hasher.needs_rehash(db_user.password):
+            await update_password_hash(db, db_user.id, await password_hasher.hash(request.password))
+    except PasswordHasherBusy:
+        raise hasher_busy()
 
     # Access Token 및 Refresh Token 생성
-    access_token = create_access_token(data={"sub": db_user.username})
-    refresh_token = create_refresh_token(data={"sub": db_user.username})
+    access_token = create_access_token(data=token_claims(db_user))
+    refresh_token = create_refresh_token(data=token_claims(db_user))
+
+    data = {"access_token": access_token, "token_type": "bearer"}
+    response = create_response(200, True, "Login successful", data)
 
-    # HTTP-only 쿠키에 Refresh Token 저장
+    # HTTP-only 쿠키에 Refresh Token 저장 (반환하는 응답 객체에 설정해야 전달됨)
     response.set_cookie(
         key="refresh_token",
         value=refresh_token,
@@ -62,9 +84,7 @@ def login(request: UserCreate, response: Response, db: Session = Depends(get_db)
         samesite="strict",
         max_age=Config.REFRESH_TOKEN_EXPIRE_DAYS * 24 * 60 * 60,
     )
-
-    data = {"access_token": access_token, "token_type": "bearer"}
-    return create_response(200, True, "Login successful", data)
+    return response
 # Access Token 갱신 API
 @router.post(
     "/refresh",
@@ -73,19 +93,42 @@ def login(request: UserCreate, response: Response, db: Session = Depends(get_db)
         401: create_example_response("Refresh token missing or invalid", common_examples["error_401_missing_refresh"]),
     },
 )
-def refresh_token(refresh_token: str = Cookie(None)):
+def refresh_token(refresh_token: str = Cookie(None), db: Session = Depends(get_db)):
     if not refresh_token:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token is missing",
         )
 
-    username = verify_refresh_token(refresh_token)
+    payload = verify_refresh_token(refresh_token)
+
+    # 로그아웃으로 무효화된 Refresh Token인지 확인 (토큰 갱신은 드물므로 DB에서 직접 확인)
+    db_user = db.query(UserModel).filter(UserModel.username == payload["sub"], UserModel.deleted_at.is_(None)).first()
+    if not db_user or payload.get("ver", 0) != db_user.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid refresh token",
+        )
 
-    new_access_token = create_access_token(data={"sub": username})
+    new_access_token = create_access_token(data=token_claims(db_user))
 
     data = {"access_token": new_access_token, "token_type": "bearer"}
     return create_response(200, True, "Token refreshed successfully", data)
+# 로그아웃 API
+@router.post(
+    "/logout",
+    responses={
+        200: create_example_response("Logout successful", common_examples["logout_success"]),
+        401: create_example_response("Unauthorized access", common_examples["error_401_invalid_token"]),
+    },
+)
+def logout(user_id: int = Depends(get_current_user), db: Session = Depends(get_db)):
+    # 토큰 버전을 올려 이 사용자의 모든 Access/Refresh Token을 무효화
+    increment_token_version(db, user_id)
+    user_versions.delete(user_id)
+    response = create_response(200, True, "Logout successful")
+    response.delete_cookie(key="refresh_token", httponly=True, secure=True, samesite="strict")
+    return response
 @router.get(
     "/users/me",
     responses={
@@ -1,16 +1,16 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import List, Optional, Any
+from typing import List, Optional, Any, Type
 from fastapi.responses import JSONResponse
 
 def create_response(
     status: int,
     success: bool,
     message: Optional[str] = None,
-    data: Optional[Any] = None
-
+    data: Optional[Any] = None,
+    response_class: Type[JSONResponse] = JSONResponse,
 ) -> JSONResponse:
-    return JSONResponse(
+    return response_class(
         content={
             "status": status,
             "success": success,
@@ -0,0 +1,17 @@
+import os
+
+# 단위 테스트는 MySQL, Redis, OpenAI 없이 실행. 모듈을 불러올 때 필요한 설정만 채움
+for key, value in {
+    "JWT_SECRET": "test-secret",
+    "JWT_REFRESH_SECRET": "test-refresh-secret",
+    "JWT_ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_HOURS": "1",
+    "REFRESH_TOKEN_EXPIRE_DAYS": "7",
+    "OPENAI_API_KEY": "test-key",
+}.items():
+    os.environ.setdefault(key, value)
+
+# Redis 주소를 비워 캐시/작업 진행 상황/결과 대기열이 프로세스 내부 구현을 사용하도록 함 (.env보다 우선)
+for key in ("CELERY_BROKER_URL", "CACHE_REDIS_URL", "OCR_RATE_LIMIT_REDIS_URL",
+            "JOB_PROGRESS_REDIS_URL", "OCR_PERSIST_REDIS_URL"):
+    os.environ[key] = ""
@@ -0,0 +1,90 @@
+import pytest
+
+import util.cache as cache_module
+from util.cache import InMemoryCache, make_key, normalize_question
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+def test_value_expires_after_default_ttl(clock):
+    cache = InMemoryCache(max_entries=10, default_ttl=60)
+    cache.set("key", {"answer": 1})
+
+    clock.now += 59
+    assert cache.get("key") == {"answer": 1}
+    clock.now += 2
+    assert cache.get("key") is None
+
+
+def test_per_key_ttl_overrides_default(clock):
+    cache = InMemoryCache(max_entries=10, default_ttl=60)
+    cache.set("short", "a", ttl=5)
+    cache.set("long", "b")
+
+    clock.now += 10
+    assert cache.get("short") is None
+    assert cache.get("long") == "b"
+
+
+def test_least_recently_used_entry_is_evicted(clock):
+    cache = InMemoryCache(max_entries=2, default_ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_overwriting_refreshes_value_and_ttl(clock):
+    cache = InMemoryCache(max_entries=2, default_ttl=60)
+    cache.set("a", 1)
+    clock.now += 50
+    cache.set("a", 2)
+    clock.now += 50
+
+    assert cache.get("a") == 2
+
+
+def test_delete(clock):
+    cache = InMemoryCache(max_entries=2, default_ttl=60)
+    cache.set("a", 1)
+    cache.delete("a")
+    cache.delete("missing")
+
+    assert cache.get("a") is None
+
+
+def test_async_interface(clock):
+    import asyncio
+
+    async def scenario():
+        cache = InMemoryCache(max_entries=2, default_ttl=60)
+        await cache.aset("a", 1)
+        value = await cache.aget("a")
+        await cache.adelete("a")
+        return value, await cache.aget("a")
+
+    assert asyncio.run(scenario()) == (1, None)
+
+
+def test_normalized_questions_share_a_key():
+    assert normalize_question("성적  추이는?") == normalize_question("성적추이는")
+    assert make_key("answer", 1, normalize_question("Hello, World!")) == \
+        make_key("answer", 1, normalize_question("hello world"))
+    assert make_key("answer", 1, "a") != make_key("answer", 2, "a")
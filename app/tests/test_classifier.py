@@ -0,0 +1,20 @@
+import pytest
+
+from langchainbot.classifier import parse_label
+
+
+@pytest.mark.parametrize("reply, expected", [
+    ("performance", "performance"),
+    ("Summary.", "summary"),
+    ("Category: counseling", "counseling"),
+    ("  RECOMMENDATION\n", "recommendation"),
+    ("unknown", "unknown"),
+    ("The category is performance, not summary", "performance"),
+])
+def test_parse_label_extracts_allowed_label(reply, expected):
+    assert parse_label(reply) == expected
+
+
+@pytest.mark.parametrize("reply", ["", "성적", "grades", "performances", "I cannot classify this question."])
+def test_parse_label_rejects_unknown_replies(reply):
+    assert parse_label(reply) is None
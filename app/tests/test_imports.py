@@ -0,0 +1,27 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parent.parent
+# 벤치마크/마이그레이션은 실행 스크립트이므로 제외
+SKIP_DIRS = {"tests", "benchmarks", "migrations"}
+
+
+def app_modules():
+    for path in sorted(APP_DIR.rglob("*.py")):
+        parts = path.relative_to(APP_DIR).with_suffix("").parts
+        if parts[0] in SKIP_DIRS or "__pycache__" in parts:
+            continue
+        if parts[-1] == "__init__":
+            parts = parts[:-1]
+        yield ".".join(parts)
+
+
+@pytest.mark.parametrize("module", list(app_modules()))
+def test_module_imports_on_its_own(module):
+    # 다른 모듈을 먼저 불러온 순서에 기대는 순환 import를 잡기 위해 모듈마다 새 프로세스에서 불러옴
+    result = subprocess.run([sys.executable, "-c", f"import {module}"], cwd=APP_DIR,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
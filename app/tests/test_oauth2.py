@@ -0,0 +1,97 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+import auth.oauth2 as oauth2
+from util.cache import InMemoryCache
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar(self):
+        return self.value
+
+
+class FakeSession:
+    """
+    사용자 토큰 버전 조회만 흉내 내는 세션 (조회 횟수를 기록)
+    """
+
+    def __init__(self, versions: dict):
+        self.versions = versions
+        self.queries = 0
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        self.queries += 1
+        user_id = statement.compile().params["id_1"]
+        return FakeResult(self.versions.get(user_id))
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession({1: 0, 2: 3})
+    monkeypatch.setattr(oauth2, "AsyncSessionLocal", fake)
+    monkeypatch.setattr(oauth2, "user_versions", InMemoryCache(100, 60))
+    return fake
+
+
+def authenticate(claims: dict, **kwargs) -> int:
+    token = oauth2.create_access_token(claims, **kwargs)
+    return asyncio.run(oauth2.get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)))
+
+
+def assert_rejected(claims: dict, **kwargs):
+    with pytest.raises(HTTPException) as error:
+        authenticate(claims, **kwargs)
+    assert error.value.status_code == 401
+
+
+def test_current_token_version_is_accepted_and_cached(session):
+    assert authenticate({"sub": "a", "uid": 2, "ver": 3}) == 2
+    assert authenticate({"sub": "a", "uid": 2, "ver": 3}) == 2
+    assert session.queries == 1
+
+
+def test_token_issued_before_version_bump_is_rejected(session):
+    assert_rejected({"sub": "a", "uid": 2, "ver": 2})
+
+
+def test_token_without_version_matches_only_version_zero(session):
+    assert authenticate({"sub": "a", "uid": 1}) == 1
+    assert_rejected({"sub": "a", "uid": 2})
+
+
+def test_logout_in_this_process_rejects_old_tokens_immediately(session):
+    assert authenticate({"sub": "a", "uid": 1, "ver": 0}) == 1
+    # 로그아웃 시 버전을 올리고 이 프로세스의 캐시를 지움 (routes/user.py)
+    session.versions[1] = 1
+    oauth2.user_versions.delete(1)
+
+    assert_rejected({"sub": "a", "uid": 1, "ver": 0})
+    assert authenticate({"sub": "a", "uid": 1, "ver": 1}) == 1
+
+
+def test_unknown_user_is_rejected(session):
+    assert_rejected({"sub": "a", "uid": 99, "ver": 0})
+
+
+def test_invalid_tokens_are_rejected_without_db_lookup(session):
+    assert_rejected({"sub": "a", "uid": 1, "ver": 0}, expires_delta=timedelta(seconds=-1))
+    assert_rejected({"uid": 1, "ver": 0})
+    with pytest.raises(HTTPException):
+        asyncio.run(oauth2.get_current_user(HTTPAuthorizationCredentials(scheme="Bearer", credentials="not-a-jwt")))
+    assert session.queries == 0
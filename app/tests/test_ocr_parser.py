@@ -0,0 +1,28 @@
+import pytest
+
+from benchmarks.bench_parse_ocr_text import (
+    PAGE_SIZES, as_json, edge_cases, legacy_parse_ocr_text, synthetic_document,
+)
+from util.ocr_parser import parse_ocr_text
+
+
+@pytest.mark.parametrize("pages", PAGE_SIZES)
+def test_matches_legacy_parser_on_synthetic_documents(pages):
+    text = synthetic_document(pages, seed=pages)
+    assert as_json(parse_ocr_text(text)) == as_json(legacy_parse_ocr_text(text))
+
+
+@pytest.mark.parametrize("text", edge_cases())
+def test_matches_legacy_parser_on_edge_cases(text):
+    assert as_json(parse_ocr_text(text)) == as_json(legacy_parse_ocr_text(text))
+
+
+def test_parses_sections_and_grades():
+    result = parse_ocr_text(synthetic_document(10, seed=3))
+
+    assert result["인적사항"].startswith("학생성명: 홍길동")
+    assert "문서확인번호" not in result["창의적 체험활동상황"]
+    grades = result["교과학습발달상황"]
+    assert sorted(grades) == ["1학년", "2학년", "3학년"]
+    assert len(grades["1학년"]["성적"]) == 8
+    assert grades["1학년"]["체육 및 예술"][0]["과목"] == "운동과건강"
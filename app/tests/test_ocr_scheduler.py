@@ -0,0 +1,54 @@
+import pytest
+
+from util.ocr_scheduler import plan_chunks
+
+
+def page_order(chunks):
+    return sorted(chunks, key=lambda chunk: chunk.index)
+
+
+@pytest.mark.parametrize("total_pages", [1, 2, 7, 10, 13, 40, 99, 100, 101, 250])
+@pytest.mark.parametrize("workers, max_pages, min_pages", [(1, 10, 1), (4, 10, 1), (10, 10, 1), (10, 5, 3), (16, 20, 2)])
+def test_chunks_cover_every_page_within_limits(total_pages, workers, max_pages, min_pages):
+    chunks = plan_chunks(total_pages, workers=workers, max_pages_per_request=max_pages, min_pages_per_chunk=min_pages)
+
+    ordered = page_order(chunks)
+    assert [chunk.index for chunk in ordered] == list(range(len(chunks)))
+    assert ordered[0].start_page == 0 and ordered[-1].end_page == total_pages
+    assert all(a.end_page == b.start_page for a, b in zip(ordered, ordered[1:]))
+    assert all(chunk.pages <= max_pages for chunk in chunks)
+    assert max(chunk.pages for chunk in chunks) - min(chunk.pages for chunk in chunks) <= 1
+    # 쪽수가 충분하면 조각이 최소 쪽수보다 작아지지 않음
+    if total_pages >= min_pages:
+        assert all(chunk.pages >= min_pages for chunk in chunks)
+
+
+def test_longest_chunks_run_first():
+    chunks = plan_chunks(13, workers=4, max_pages_per_request=10)
+
+    assert [chunk.pages for chunk in chunks] == [4, 3, 3, 3]
+    assert [chunk.index for chunk in chunks] == [0, 1, 2, 3]
+
+
+def test_small_file_is_split_per_page_across_workers():
+    chunks = plan_chunks(5, workers=10, max_pages_per_request=10)
+
+    assert [(chunk.start_page, chunk.end_page) for chunk in page_order(chunks)] == [(i, i + 1) for i in range(5)]
+
+
+def test_min_pages_limits_parallelism():
+    chunks = plan_chunks(10, workers=10, max_pages_per_request=10, min_pages_per_chunk=3)
+
+    assert sorted(chunk.pages for chunk in chunks) == [3, 3, 4]
+
+
+def test_request_limit_rounds_up_to_full_worker_rounds():
+    chunks = plan_chunks(101, workers=10, max_pages_per_request=10)
+
+    # 11조각이면 마지막 차수에 한 조각만 남으므로 워커 수의 배수(20조각)로 나눔
+    assert len(chunks) == 20
+    assert max(chunk.pages for chunk in chunks) == 6
+
+
+def test_empty_document_has_no_chunks():
+    assert plan_chunks(0, workers=10, max_pages_per_request=10) == []
@@ -0,0 +1,45 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+
+from util.pagination import decode_cursor, encode_cursor
+
+
+def test_round_trip_datetime_and_id():
+    created_at = datetime(2024, 3, 2, 9, 30, 15, 123456)
+    cursor = encode_cursor(created_at, 42)
+
+    assert decode_cursor(cursor, datetime, int) == [created_at, 42]
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(datetime(2024, 3, 2), 10 ** 12, "a/b+c")
+
+    assert set(cursor) <= set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_=")
+
+
+def test_values_are_coerced_to_requested_types():
+    cursor = base64.urlsafe_b64encode(json.dumps(["7"]).encode()).decode()
+
+    assert decode_cursor(cursor, int) == [7]
+
+
+@pytest.mark.parametrize("cursor", [
+    "",
+    "not base64!",
+    "한글",
+    base64.urlsafe_b64encode(b"not json").decode(),
+    base64.urlsafe_b64encode(b"5").decode(),
+    encode_cursor(1),  # 값 개수가 다름
+    encode_cursor("yesterday", 1),  # 날짜 형식이 아님
+    encode_cursor(datetime(2024, 3, 2), "abc"),  # 정수가 아님
+])
+def test_invalid_cursor_is_rejected_with_400(cursor):
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(cursor, datetime, int)
+
+    assert error.value.status_code == 400
+    assert error.value.detail == "Invalid cursor"
@@ -1,2 +1 @@
 # util/__init__.py
-from .ocr_utiles import split_and_ocr_pdf_with_celery, ocr_pdf_from_memory
\ No newline at end of file
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from config import Config
+from util.metrics import CACHE_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "yomojomo"
+
+
+class InMemoryCache:
+    """
+    프로세스 내부 TTL + LRU 캐시. Redis를 사용할 수 없을 때의 대체 저장소.
+    """
+
+    def __init__(self, max_entries: int, default_ttl: int):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        expires_at = time.monotonic() + (ttl or self.default_ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str):
+        with self._lock:
+            self._data.pop(key, None)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None):
+        self.set(key, value, ttl)
+
+    async def adelete(self, key: str):
+        self.delete(key)
+
+
+class RedisCache:
+    """
+    Redis 캐시. 값은 JSON으로 저장하며, Redis 오류 시 프로세스 내부 캐시로 대체.
+    동기(Celery 워커)와 비동기(API) 경로 모두에서 사용할 수 있음.
+    Redis 오류가 나면 retry_after초 동안은 Redis에 연결을 시도하지 않고 바로 내부 캐시를 사용
+    (장애 중 요청마다 연결 타임아웃만큼 기다리지 않도록). 삭제는 무효화가 목적이므로 이 동안에도 시도함.
+    """
+
+    def __init__(self, url: str, fallback: InMemoryCache, default_ttl: int, retry_after: float):
+        self.default_ttl = default_ttl
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self._down_until = 0.0
+        self._client = redis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+        self._async_client = aioredis.Redis.from_url(url, socket_timeout=1, socket_connect_timeout=1)
+
+    def _available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _trip(self, operation: str, error: Exception):
+        self._down_until = time.monotonic() + self.retry_after
+        logger.warning(f"Redis cache {operation} failed, using in-process cache for {self.retry_after}s: {error}")
+
+    def get(self, key: str) -> Optional[Any]:
+        if not self._available():
+            return self.fallback.get(key)
+        try:
+            raw = self._client.get(key)
+        except redis.RedisError as e:
+            self._trip("get", e)
+            return self.fallback.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        if not self._available():
+            self.fallback.set(key, value, ttl)
+            return
+        try:
+            self._client.set(key, json.dumps(value, ensure_ascii=False), ex=ttl or self.default_ttl)
+        except redis.RedisError as e:
+            self._trip("set", e)
+            self.fallback.set(key, value, ttl)
+
+    def delete(self, key: str):
+        self.fallback.delete(key)
+        try:
+            self._client.delete(key)
+        except redis.RedisError as e:
+            self._trip("delete", e)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        if not self._available():
+            return self.fallback.get(key)
+        try:
+            raw = await self._async_client.get(key)
+        except redis.RedisError as e:
+            self._trip("get", e)
+            return self.fallback.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    async def aset(self, key: str, value: Any, ttl: Optional[int] = None):
+        if not self._available():
+            self.fallback.set(key, value, ttl)
+            return
+        try:
+            await self._async_client.set(key, json.dumps(value, ensure_ascii=False), ex=ttl or self.default_ttl)
+        except redis.RedisError as e:
+            self._trip("set", e)
+            self.fallback.set(key, value, ttl)
+
+    async def adelete(self, key: str):
+        self.fallback.delete(key)
+        try:
+            await self._async_client.delete(key)
+        except redis.RedisError as e:
+            self._trip("delete", e)
+
+
+def build_cache():
+    """
+    설정에 따라 Redis 캐시(내부 캐시 대체 포함) 또는 프로세스 내부 캐시를 생성
+    """
+    memory_cache = InMemoryCache(Config.CACHE_MAX_ENTRIES, Config.CACHE_DEFAULT_TTL)
+    if not Config.CACHE_REDIS_URL:
+        return memory_cache
+    return RedisCache(Config.CACHE_REDIS_URL, memory_cache, Config.CACHE_DEFAULT_TTL, Config.CACHE_REDIS_RETRY_AFTER)
+
+
+cache = build_cache()
+
+
+def normalize_question(question: str) -> str:
+    """
+    띄어쓰기, 문장부호, 대소문자 차이만 있는 질문을 같은 키로 묶기 위한 정규화
+    """
+    text = unicodedata.normalize("NFKC", question).lower()
+    return re.sub(r"[\s\W_]+", "", text)
+
+
+def hash_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def make_key(namespace: str, *parts: Any) -> str:
+    """
+    캐시 키 생성. 개인정보가 키에 그대로 남지 않도록 구성 요소를 해시함.
+    """
+    digest = hash_text("\x1f".join(str(part) for part in parts))
+    return f"{KEY_PREFIX}:{namespace}:{digest}"
+
+
+def cached_get_sync(namespace: str, key: str) -> Optional[Any]:
+    """
+    cached_get의 동기 버전 (Celery 워커용)
+    """
+    value = cache.get(key)
+    CACHE_REQUESTS.labels(namespace=namespace, result="hit" if value is not None else "miss").inc()
+    return value
+
+
+async def cached_get(namespace: str, key: str) -> Optional[Any]:
+    """
+    캐시 조회 후 hit/miss 메트릭을 기록
+    """
+    value = await cache.aget(key)
+    CACHE_REQUESTS.labels(namespace=namespace, result="hit" if value is not None else "miss").inc()
+    return value
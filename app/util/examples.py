@@ -23,6 +23,12 @@ common_examples = {
             "token_type": "bearer"
         }
     },
+    "logout_success": {
+        "status": 200,
+        "success": True,
+        "message": "Logout successful",
+        "data": None
+    },
     "user_retrieved": {
         "status": 200,
         "success": True,
@@ -59,6 +65,12 @@ common_examples = {
         "message": "Only PDF files are allowed.",
         "data": None,
     },
+    "error_413_file_too_large": {
+        "status": 413,
+        "success": False,
+        "message": "File is too large.",
+        "data": None,
+    },
     "error_404_file_not_found": {
         "status": 404,
         "success": False,
@@ -103,6 +115,12 @@ common_examples = {
         "message": "File not found",
         "data": None
     },
+    "error_429": {
+        "status": 429,
+        "success": False,
+        "message": "Too many authentication requests, please retry shortly",
+        "data": None
+    },
     "error_500": {
         "status": 500,
         "success": False,
@@ -128,7 +146,8 @@ common_examples = {
         "message": "Message sent successfully",
         "data": {
             "user_message": "Hello, how are you?",
-            "bot_response": "I'm fine, thank you!"
+            "bot_response": "I'm fine, thank you!",
+            "cached": False
         },
     },
 
@@ -137,22 +156,25 @@ common_examples = {
         "status": 200,
         "success": True,
         "message": "Messages retrieved successfully",
-        "data": [
-            {
-                "id": 1,
-                "question": "Hello, how are you?",
-                "answer": "I'm fine, thank you!",
-                "timestamp": "2024-11-29T00:00:00",
-                "chatroom_id": 1,
-            },
-            {
-                "id": 2,
-                "question": "What can you do?",
-                "answer": "I can assist you with many tasks!",
-                "timestamp": "2024-11-29T01:00:00",
-                "chatroom_id": 1,
-            },
-        ],
+        "data": {
+            "items": [
+                {
+                    "id": 1,
+                    "chatroom_id": 1,
+                    "question": "Hello, how are you?",
+                    "answer": "I'm fine, thank you!",
+                    "created_at": "2024-11-29T00:00:00",
+                },
+                {
+                    "id": 2,
+                    "chatroom_id": 1,
+                    "question": "What can you do?",
+                    "answer": "I can assist you with many tasks!",
+                    "created_at": "2024-11-29T01:00:00",
+                },
+            ],
+            "has_more": False,
+        },
     },
     "messages_not_found": {
         "status": 404,
@@ -184,6 +206,27 @@ common_examples = {
         "size": 10,
         },
     },
+    "student_grades_success": {
+    "status": 200,
+    "success": True,
+    "message": "Student grades retrieved successfully",
+    "data": {
+        "items": [
+            {
+                "grade": "1학년",
+                "subject_group": "수학",
+                "subject": "수학",
+                "credits": 4,
+                "raw_score": 92.0,
+                "subject_average": 65.3,
+                "standard_deviation": 18.2,
+                "achievement": "A",
+                "enrolled": 240,
+                "rank": 2,
+            },
+        ],
+        },
+    },
     "error_404_no_records": {
     "status": 404,
     "success": False,
@@ -212,17 +255,18 @@ common_examples = {
             "items": [
                 {
                     "id": 1,
+                    "name": "My Chatroom",
                     "last_message": "I am fine, thank you!",
                     "last_message_time": "2024-11-29T10:00:00",
                 },
                 {
                     "id": 2,
+                    "name": "Another Chatroom",
                     "last_message": "Not really, just relaxing.",
                     "last_message_time": "2024-11-29T09:45:00",
                 },
             ],
-            "total": 2,
-            "page": 1,
+            "next_cursor": "WyIyMDI0LTExLTI5VDA5OjQ1OjAwIiwgMl0=",
             "size": 10,
         },
     },
@@ -258,7 +302,9 @@ common_examples = {
         "message": "Task status retrieved successfully",
         "data": {
             "status": "SUCCESS",
-            "result": "OCR completed successfully"
+            "stage": "done",
+            "progress": {"completed": 5, "total": 5},
+            "result": {"record_id": 1, "file_url": "https://example.com/record.pdf"}
         }
     },
     "task_status_failure": {
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from typing import AsyncIterator, Optional
+
+import redis
+import redis.asyncio as aioredis
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "yomojomo:job"
+
+# OCR 작업 단계 (분할 → 조각 OCR → 파싱 → 원본 업로드 → DB 저장 → 문단 인덱스 → 완료)
+STAGES = ("split", "ocr", "parse", "upload", "persist", "index", "done")
+FINISHED_STATUSES = ("SUCCESS", "FAILURE")
+
+
+def _key(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}"
+
+
+def _channel(job_id: str) -> str:
+    return f"{KEY_PREFIX}:{job_id}:events"
+
+
+def _decode(raw: dict) -> Optional[dict]:
+    if not raw:
+        return None
+    return {name: json.loads(value) for name, value in raw.items()}
+
+
+class JobProgress:
+    """
+    OCR 작업(분할 태스크 id 기준)의 진행 상황을 Redis 해시에 모아 두고, 갱신될 때마다 채널로 발행.
+    워커는 동기 메서드로 기록하고, API는 조회 또는 구독(SSE)으로 읽음.
+    진행 상황 기록은 부가 기능이므로 Redis 오류가 작업 자체를 실패시키지 않음.
+    """
+
+    def __init__(self, url: str, ttl: int):
+        self.ttl = ttl
+        self._client = redis.Redis.from_url(
+            url, socket_timeout=2, socket_connect_timeout=2, decode_responses=True
+        )
+        # 구독 연결은 이벤트가 없을 때도 유지되어야 하므로 읽기 타임아웃을 두지 않음
+        self._async_client = aioredis.Redis.from_url(url, socket_connect_timeout=2, decode_responses=True)
+
+    def _apply(self, job_id: str, fields: Optional[dict] = None, increment: Optional[str] = None):
+        if not job_id:
+            return None
+        key = _key(job_id)
+        try:
+            pipe = self._client.pipeline()
+            if fields:
+                pipe.hset(key, mapping={name: json.dumps(value, ensure_ascii=False) for name, value in fields.items()})
+            if increment:
+                pipe.hincrby(key, increment, 1)
+            pipe.hset(key, "updated_at", json.dumps(time.time()))
+            pipe.expire(key, self.ttl)
+            pipe.hgetall(key)
+            snapshot = _decode(pipe.execute()[-1])
+            self._client.publish(_channel(job_id), json.dumps(snapshot, ensure_ascii=False))
+            return snapshot
+        except redis.RedisError as e:
+            logger.warning(f"Failed to record progress for job {job_id}: {e}")
+            return None
+
+    def assign(self, job_id: str, user_id: int):
+        """
+        작업을 요청한 사용자를 기록 (상태 조회 시 본인 작업인지 확인하는 데 사용). 태스크를 보내기 전에 호출
+        """
+        return self._apply(job_id, {"user_id": user_id})
+
+    def start(self, job_id: str, total_pages: int):
+        return self._apply(job_id, {
+            "status": "PROGRESS", "stage": "split", "completed": 0, "total": 0, "total_pages": total_pages,
+        })
+
+    def set_stage(self, job_id: str, stage: str, **fields):
+        return self._apply(job_id, {"stage": stage, **fields})
+
+    def chunk_done(self, job_id: str):
+        return self._apply(job_id, increment="completed")
+
+    def finish(self, job_id: str, result: dict):
+        return self._apply(job_id, {"status": "SUCCESS", "stage": "done", "result": result})
+
+    def fail(self, job_id: str, error: str):
+        return self._apply(job_id, {"status": "FAILURE", "error": error})
+
+    def get(self, job_id: str) -> Optional[dict]:
+        try:
+            return _decode(self._client.hgetall(_key(job_id)))
+        except redis.RedisError as e:
+            logger.warning(f"Failed to read progress for job {job_id}: {e}")
+            return None
+
+    async def subscribe(self, job_id: str, heartbeat: float, timeout: float) -> AsyncIterator[Optional[dict]]:
+        """
+        현재 상태를 먼저 내보낸 뒤 갱신될 때마다 상태를 내보냄. heartbeat초 동안 갱신이 없으면 None.
+        작업이 끝나거나 timeout초가 지나면 종료.
+        """
+        pubsub = self._async_client.pubsub()
+        try:
+            # 구독 후에 현재 상태를 읽어야 그 사이의 갱신을 놓치지 않음
+            await pubsub.subscribe(_channel(job_id))
+            snapshot = _decode(await self._async_client.hgetall(_key(job_id)))
+            if snapshot is not None:
+                yield snapshot
+                if snapshot.get("status") in FINISHED_STATUSES:
+                    return
+
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=heartbeat)
+                if message is None:
+                    yield None
+                    continue
+                snapshot = json.loads(message["data"])
+                yield snapshot
+                if snapshot.get("status") in FINISHED_STATUSES:
+                    return
+        finally:
+            await pubsub.aclose()
+
+
+class InMemoryJobProgress(JobProgress):
+    """
+    프로세스 내부 진행 상황 저장소. 진행 상황용 Redis가 설정되지 않았을 때의 대체 저장소로,
+    워커와 공유되지 않으므로 API는 동작하지만 다른 프로세스의 진행 상황은 보이지 않음. 구독은 주기적으로 조회함.
+    """
+
+    POLL_INTERVAL = 0.5
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def _apply(self, job_id: str, fields: Optional[dict] = None, increment: Optional[str] = None):
+        if not job_id:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            self._data = {key: item for key, item in self._data.items() if item[1] > now}
+            snapshot = dict(self._data[job_id][0]) if job_id in self._data else {}
+            snapshot.update(fields or {})
+            if increment:
+                snapshot[increment] = snapshot.get(increment, 0) + 1
+            snapshot["updated_at"] = time.time()
+            self._data[job_id] = (snapshot, now + self.ttl)
+            return dict(snapshot)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            item = self._data.get(job_id)
+            if item is None or item[1] <= time.monotonic():
+                return None
+            return dict(item[0])
+
+    async def subscribe(self, job_id: str, heartbeat: float, timeout: float) -> AsyncIterator[Optional[dict]]:
+        interval = min(heartbeat, self.POLL_INTERVAL)
+        deadline = time.monotonic() + timeout
+        last = None
+        idle = 0.0
+        while True:
+            snapshot = self.get(job_id)
+            if snapshot is not None and snapshot != last:
+                yield snapshot
+                if snapshot.get("status") in FINISHED_STATUSES:
+                    return
+                last, idle = snapshot, 0.0
+            elif idle >= heartbeat:
+                yield None
+                idle = 0.0
+            if time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(interval)
+            idle += interval
+
+
+def build_job_progress():
+    """
+    설정에 따라 Redis 진행 상황 저장소 또는 프로세스 내부 저장소를 생성
+    """
+    if not Config.JOB_PROGRESS_REDIS_URL:
+        return InMemoryJobProgress(Config.JOB_PROGRESS_TTL)
+    return JobProgress(Config.JOB_PROGRESS_REDIS_URL, Config.JOB_PROGRESS_TTL)
+
+
+job_progress = build_job_progress()
@@ -0,0 +1,141 @@
+import os
+import time
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram, multiprocess
+
+# 여러 프로세스(uvicorn 워커, Celery prefork 워커)가 값을 공유할 때 사용하는 디렉터리.
+# prometheus_client가 임포트 시점에 이 환경 변수를 읽으므로 Config가 아닌 환경 변수로 지정
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# HTTP 요청
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP 요청 수",
+    ["method", "route", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds",
+    "HTTP 요청 처리 시간 (스트리밍 응답은 스트림 종료까지, 초)",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+
+# 메시지 처리 단계 (classify → context → history → generate → persist)
+MESSAGE_STAGE_SECONDS = Histogram(
+    "message_stage_seconds",
+    "메시지 처리 단계별 소요 시간 (초)",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60),
+)
+MESSAGE_TOKENS = Histogram(
+    "message_tokens",
+    "메시지 요청당 토큰 수 (context: LLM에 전달한 학생 context, answer: 답변)",
+    ["kind"],
+    buckets=(50, 100, 250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000),
+)
+
+# OCR 처리 단계 (split → ocr(조각별) → parse → upload → context → persist → index)
+OCR_STAGE_SECONDS = Histogram(
+    "ocr_stage_seconds",
+    "OCR 처리 단계별 소요 시간 (ocr는 조각 하나, persist는 저장 배치 하나 기준, 초)",
+    ["stage"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 60, 120, 300),
+)
+
+# 질문 의도 분류기
+CLASSIFIER_LOCAL_HITS = Counter(
+    "classifier_local_hits_total",
+    "LLM 호출 없이 로컬에서 분류된 질문 수",
+    ["stage"],
+)
+CLASSIFIER_LLM_FALLBACKS = Counter(
+    "classifier_llm_fallbacks_total",
+    "로컬 분류 신뢰도가 낮아 LLM으로 분류한 질문 수",
+)
+
+# 캐시
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "캐시 조회 수 (hit/miss)",
+    ["namespace", "result"],
+)
+
+# 비밀번호 해시 (전용 프로세스 풀)
+PASSWORD_HASH_IN_FLIGHT = Gauge(
+    "password_hash_in_flight",
+    "실행 중이거나 대기 중인 비밀번호 해시 작업 수",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "password_hash_rejected_total",
+    "대기열이 가득 차 거절된 비밀번호 해시 작업 수",
+    ["operation"],
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "password_hash_seconds",
+    "비밀번호 해시 작업 소요 시간 (대기 포함, 초)",
+    ["operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+
+def metrics_registry():
+    """
+    /metrics로 내보낼 레지스트리. 멀티프로세스 모드면 모든 프로세스의 값을 합쳐서 수집
+    """
+    if MULTIPROC_DIR is None:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def mark_process_dead(pid: int):
+    """
+    종료된 프로세스의 livesum 게이지 값을 집계에서 제외
+    """
+    if MULTIPROC_DIR is not None:
+        multiprocess.mark_process_dead(pid)
+
+
+def route_label(scope) -> str:
+    """
+    요청이 매칭된 경로 템플릿. 마운트된 앱(/metrics 등)은 마운트 경로, 매칭되지 않았으면 "unmatched"
+    """
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    if "endpoint" in scope:
+        return scope["root_path"][len(scope.get("app_root_path", "")):] or "/"
+    return "unmatched"
+
+
+class MetricsMiddleware:
+    """
+    요청 수와 처리 시간을 경로 템플릿(/chatrooms/{chatroom_id}/messages 등) 기준으로 기록하는 ASGI 미들웨어.
+    라우팅되지 않은 요청(404)은 경로 대신 "unmatched"로 묶어 라벨 수가 늘어나지 않도록 함
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = route_label(scope)
+            HTTP_REQUEST_SECONDS.labels(scope["method"], route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(scope["method"], route, str(status)).inc()
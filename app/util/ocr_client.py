@@ -0,0 +1,158 @@
+import json
+import logging
+import random
+import time
+import uuid
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import Config
+from util.rate_limit import TokenBucket, RateLimitTimeout
+
+logger = logging.getLogger(__name__)
+
+# 다시 시도하면 성공할 수 있는 응답 코드 (OCR 요청은 같은 파일을 다시 보내도 결과가 같음)
+RETRYABLE_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+
+class OCRError(Exception):
+    """
+    OCR 요청 실패 (재시도해도 성공하지 않는 오류)
+    """
+
+
+class OCRRetryableError(OCRError):
+    """
+    일시적인 OCR 요청 실패 (429, 5xx, 타임아웃, 연결 오류). 태스크 단위로 다시 실행할 수 있음.
+    """
+
+
+def extract_text(response_json: dict) -> str:
+    """
+    OCR 응답에서 텍스트 추출
+    """
+    response_text = ""
+    for image in response_json.get('images', []):
+        for field in image.get('fields', []):
+            response_text += field.get('inferText', '') + " "
+    return response_text
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Retry-After 헤더(초 또는 HTTP 날짜)를 대기 초로 변환
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """
+    지수 백오프(full jitter). 서버가 Retry-After를 주면 그보다 짧게 기다리지 않음
+    """
+    delay = random.uniform(0, min(Config.OCR_BACKOFF_MAX, Config.OCR_BACKOFF_BASE * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, Config.OCR_BACKOFF_MAX))
+    return delay
+
+
+def build_session(pool_size: int) -> requests.Session:
+    """
+    OCR API 호출용 세션. 워커 프로세스 안에서 커넥션(TLS 포함)을 재사용함
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class OCRClient:
+    """
+    OCR API 클라이언트. 요청마다 공유 토큰 버킷으로 초당 요청 수를 제한하고,
+    일시적인 오류는 지수 백오프로 최대 max_attempts번까지 다시 시도.
+    """
+
+    def __init__(self, url: str, secret_key: str, rate_limiter: TokenBucket, session: requests.Session,
+                 max_attempts: int = 3):
+        self.url = url
+        self.secret_key = secret_key
+        self.rate_limiter = rate_limiter
+        self.session = session
+        self.max_attempts = max(max_attempts, 1)
+
+    def _post(self, pdf_bytes: bytes, file_name: str) -> requests.Response:
+        request_json = {
+            "images": [
+                {
+                    "format": "pdf",
+                    "name": file_name,
+                }
+            ],
+            "requestId": str(uuid.uuid4()),
+            "version": "V2",
+            "timestamp": int(round(time.time() * 1000)),
+        }
+        payload = {'message': json.dumps(request_json).encode('UTF-8')}
+        files = [('file', ('split_part.pdf', pdf_bytes, 'application/pdf'))]
+        headers = {
+            'X-OCR-SECRET': self.secret_key
+        }
+        return self.session.post(
+            self.url,
+            headers=headers,
+            data=payload,
+            files=files,
+            timeout=(Config.OCR_CONNECT_TIMEOUT, Config.OCR_READ_TIMEOUT),
+        )
+
+    def recognize(self, pdf_bytes: bytes, file_name: str) -> str:
+        """
+        PDF 조각을 OCR 처리하여 텍스트를 반환
+        """
+        error = None
+        for attempt in range(self.max_attempts):
+            try:
+                self.rate_limiter.acquire(timeout=Config.OCR_RATE_LIMIT_TIMEOUT)
+            except RateLimitTimeout as e:
+                raise OCRRetryableError(str(e))
+
+            retry_after = None
+            try:
+                response = self._post(pdf_bytes, file_name)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = OCRRetryableError(f"OCR request failed: {e}")
+            else:
+                if response.status_code == 200:
+                    return extract_text(response.json())
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise OCRError(f"OCR processing failed: {response.status_code}")
+                error = OCRRetryableError(f"OCR processing failed: {response.status_code}")
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+
+            if attempt + 1 < self.max_attempts:
+                delay = backoff_delay(attempt, retry_after)
+                logger.warning(f"{error} ({file_name}), retrying in {delay:.1f}s "
+                               f"({attempt + 1}/{self.max_attempts})")
+                time.sleep(delay)
+        raise error
+
+
+ocr_client = OCRClient(
+    Config.OCR_API_INVOKE_URL,
+    Config.OCR_SECRET_KEY,
+    TokenBucket(Config.OCR_RATE_LIMIT_REDIS_URL, "yomojomo:ratelimit:ocr", Config.OCR_RATE_LIMIT, Config.OCR_RATE_BURST),
+    build_session(Config.OCR_POOL_SIZE),
+    max_attempts=Config.OCR_MAX_ATTEMPTS,
+)
@@ -0,0 +1,191 @@
+import re
+from collections import defaultdict
+from typing import Dict
+
+# 섹션 이름과 헤더 패턴 (띄어쓰기 유무를 모두 허용). 각 섹션은 다음 번호의 헤더 직전까지
+SECTION_HEADERS = (
+    ("인적사항", r"1\.\s*인적\s*사항"),
+    ("학적사항", r"2\.\s*학적\s*사항"),
+    ("출결사항", r"3\.\s*출결\s*상황"),
+    ("수상경력", r"4\.\s*수\s*상\s*경\s*력"),
+    ("자격증 및 인증 취득상황", r"5\.\s*자격증\s*및\s*인증\s*취득\s*상황"),
+    ("진로희망사항", r"6\.\s*진로\s*희망\s*사항"),
+    ("창의적 체험활동상황", r"7\.\s*창의적\s*체험\s*활동\s*상황"),
+    ("교과학습발달상황", r"8\.\s*교과\s*학습\s*발달\s*상황"),
+    ("독서활동상황", r"9\.\s*독서\s*활동\s*상황"),
+    ("행동특성 및 종합의견", r"10\.\s*행동\s*특성\s*및\s*종합\s*의견"),
+)
+
+# 모든 섹션 헤더를 한 번에 찾는 패턴 (그룹 번호 = 섹션 순서 + 1)
+SECTION_HEADER_PATTERN = re.compile("|".join(f"({header})" for _, header in SECTION_HEADERS))
+
+# 섹션별 종료 헤더 (마지막 섹션은 텍스트 끝까지)
+NEXT_SECTION_PATTERNS = [re.compile(header) for _, header in SECTION_HEADERS[1:]] + [None]
+
+# 불필요한 정보를 제외하기 위한 패턴 정의 (정확히 문서확인번호와 신청인 제거)
+EXCLUDE_PATTERN = re.compile(
+    r"문서확인번호:\s*\d+-\d+-\d+-\d+\s*\(신청인:\s*[\S\s]+?\)\s*|"
+    r"문서확인번호:\s*\d+-\d+-\d+-\d+\s*\(신청인\s*:\s*.*?\)\s*|"
+    r"정부24\s+gov\.kr|"
+    r"\S+고등학교\s*\d{4}년\s*\d{1,2}월\s*\d{1,2}일\s*\d+/\d+\s*반\s*\d+\s*번호\s*\d+\s*이름\s*\S+|"
+    r"본\s증명서는\s열람용이며,\s법적\s효력이\s없습니다\."
+)
+
+# 학년 구분 헤더 ([1학년], [2학년], ...)
+GRADE_HEADER_PATTERN = re.compile(r"\[(\d학년)\]")
+
+# 교과 과목 성적 데이터 패턴 정의
+SUBJECT_ROW = (
+    r"(?P<교과>[\w()]+)\s(?P<과목>[^\s\d]+(?:\s[I]+)?)\s(?P<단위수>\d+)\s(?P<원점수_과목평균>\d+/[\d.]+)\((?P<표준편차>[\d.]+)\)\s("
+    r"?P<성취도>[A-E])\((?P<수강자수>\d+)\)\s(?P<석차>\d+)"
+)
+SUBJECT_PATTERN = re.compile(SUBJECT_ROW, re.DOTALL)
+
+# 토큰 중간에서 시작하는 매칭은 토큰 시작에서도 매칭되므로 토큰 시작 위치에서만 시도
+SUBJECT_START_PATTERN = re.compile(r"(?<![\w()])" + SUBJECT_ROW, re.DOTALL)
+
+# 세부능력 및 특기사항, 체육 및 예술, 특기사항을 인식하기 위한 패턴 정의
+EXTRA_PATTERN = re.compile(
+    r"세부능력및특기사항(.*?)(?=<\s*체육\s*[·.]?\s*예술\s*\(음악/미술\)\s*>|세부능력및특기사항|특기사항|$)|"  # 세부능력 및 특기사항 (중복 허용)
+    r"<\s*체육\s*[·.]?\s*예술\s*\(음악/미술\)\s*>(.*?)(?=특기사항|$)|"  # 체육 및 예술 패턴
+    r"특기사항(.*?)(?=(\[\d학년\]|$))",  # 특기사항 패턴
+    re.DOTALL
+)
+
+# 개별 과목별 세부능력 및 특기사항의 과목명 라벨 (예: "수학I:"). 내용은 다음 라벨 직전까지.
+# 라벨은 한글 단어 중간이 아니라 단어 시작에서만 찾음 (긴 단어에서 위치마다 끝까지 다시 훑지 않도록)
+SUBJECT_LABEL_PATTERN = re.compile(r"(?<![가-힣])([가-힣]+(?:I{1,2}|[A-Z]?)?):\s*")
+
+# 체육 및 예술 섹션에서 학기별로 교과, 과목, 단위수, 성취도를 추출하는 패턴
+PHYSICAL_ARTS_PATTERN = re.compile(
+    r"(?P<교과>체육|예술\(음악/미술\))\s(?P<과목>.+?)\s(?P<단위수_1학기>\d+)\s(?P<성취도_1학기>[A-E])\s(?P<단위수_2학기>\d+)\s(?P<성취도_2학기>[A-E])",
+    re.DOTALL
+)
+
+
+def _text_end(text: str) -> int:
+    # 정규식 `$`와 같은 위치 (마지막 문자가 줄바꿈이면 그 앞)
+    return len(text) - 1 if text.endswith("\n") else len(text)
+
+
+def iter_subject_rows(text: str):
+    """
+    교과 성적 행을 앞에서부터 순서대로 찾음 (SUBJECT_PATTERN.finditer와 같은 결과)
+    """
+    position = 0
+    while True:
+        # 직전 매칭이 토큰 중간에서 끝났을 수 있으므로 현재 위치는 경계 조건 없이 먼저 시도
+        match = SUBJECT_PATTERN.match(text, position) or SUBJECT_START_PATTERN.search(text, position)
+        if match is None:
+            return
+        yield match
+        position = match.end()
+
+
+def split_subject_details(text: str) -> list:
+    """
+    세부능력 및 특기사항을 과목명 라벨 기준으로 잘라 (과목명, 내용) 목록으로 반환
+    """
+    details = []
+    text_end = _text_end(text)
+    label = SUBJECT_LABEL_PATTERN.search(text)
+    while label is not None:
+        next_label = SUBJECT_LABEL_PATTERN.search(text, label.end(), text_end)
+        end = next_label.start() if next_label is not None else text_end
+        details.append((label.group(1), text[label.end():end].strip()))
+        label = next_label
+    return details
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    헤더 위치를 앞에서부터 한 번만 훑으며 섹션을 잘라냄.
+    섹션 본문은 다음 번호의 헤더 직전까지이며, 다음 헤더가 없으면 텍스트 끝까지.
+    """
+    sections = {name: "" for name, _ in SECTION_HEADERS}
+    text_end = _text_end(text)
+    position = 0
+    while True:
+        header = SECTION_HEADER_PATTERN.search(text, position)
+        if header is None:
+            break
+
+        index = header.lastindex - 1
+        end = text_end
+        next_pattern = NEXT_SECTION_PATTERNS[index]
+        if next_pattern is not None:
+            next_header = next_pattern.search(text, header.end(), text_end)
+            if next_header is not None:
+                end = next_header.start()
+
+        section_content = text[header.end():end].strip()
+        sections[SECTION_HEADERS[index][0]] = EXCLUDE_PATTERN.sub("", section_content).strip()
+        position = end
+    return sections
+
+
+def parse_ocr_text(text: str) -> Dict:
+    """
+    OCR로 추출한 텍스트를 파싱하여 학년별 데이터를 반환
+    """
+    split_text = split_sections(text)
+    split_text["교과학습발달상황"] = parse_academic_performance(split_text["교과학습발달상황"])
+    return split_text
+
+
+def parse_academic_performance(text: str) -> Dict:
+
+    # 학년별 데이터를 저장할 딕셔너리 초기화
+    grades_data = defaultdict(lambda: {
+        "성적": [],
+        "세부능력 및 특기사항": [],
+        "체육 및 예술": [],
+        "특기사항": []
+    })
+
+    # 학년별로 데이터를 추출 (각 학년은 다음 학년 헤더 직전까지)
+    text_end = _text_end(text)
+    grade_header = GRADE_HEADER_PATTERN.search(text)
+    while grade_header is not None:
+        grade = grade_header.group(1)  # 학년 (1학년, 2학년, ...)
+        next_header = GRADE_HEADER_PATTERN.search(text, grade_header.end(), text_end)
+        end = next_header.start() if next_header is not None else text_end
+        grade_text = text[grade_header.end():end]  # 해당 학년의 전체 텍스트
+        grade_header = next_header
+
+        # 교과 과목 성적 데이터를 추출
+        for subject_match in iter_subject_rows(grade_text):
+            subject_data = {
+                "교과": subject_match.group("교과"),
+                "과목": subject_match.group("과목"),
+                "단위수": subject_match.group("단위수"),
+                "원점수_과목평균": subject_match.group("원점수_과목평균"),
+                "성취도": subject_match.group("성취도"),
+                "석차": subject_match.group("석차"),
+                "표준편차": subject_match.group("표준편차"),
+                "수강자수": subject_match.group("수강자수"),
+            }
+            grades_data[grade]["성적"].append(subject_data)
+
+        # 세부능력 및 특기사항, 체육 및 예술, 특기사항 추출
+        for match in EXTRA_PATTERN.findall(grade_text):
+            if match[0]:  # 세부능력 및 특기사항이 여러 번 나타날 수 있음
+                for subject_name, subject_details in split_subject_details(match[0].strip()):
+                    formatted_details = f"{subject_name}: {subject_details}"
+                    grades_data[grade]["세부능력 및 특기사항"].append(formatted_details)
+            if match[1]:  # 체육 및 예술이 여러 번 나타날 수 있음
+                physical_arts_text = match[1].strip()
+                for physical_arts_match in PHYSICAL_ARTS_PATTERN.finditer(physical_arts_text):
+                    activity_data = {
+                        "교과": physical_arts_match.group("교과"),
+                        "과목": physical_arts_match.group("과목"),
+                        "단위수_1학기": physical_arts_match.group("단위수_1학기"),
+                        "성취도_1학기": physical_arts_match.group("성취도_1학기"),
+                        "단위수_2학기": physical_arts_match.group("단위수_2학기"),
+                        "성취도_2학기": physical_arts_match.group("성취도_2학기"),
+                    }
+                    grades_data[grade]["체육 및 예술"].append(activity_data)
+            if match[2]:  # 특기사항이 여러 번 나타날 수 있음
+                grades_data[grade]["특기사항"].append(match[2].strip())
+
+    return grades_data
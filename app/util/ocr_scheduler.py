@@ -0,0 +1,47 @@
+import math
+from typing import List, NamedTuple
+
+
+class Chunk(NamedTuple):
+    index: int  # 페이지 순서상 조각 번호
+    start_page: int
+    end_page: int  # 포함하지 않음
+
+    @property
+    def pages(self) -> int:
+        return self.end_page - self.start_page
+
+
+def plan_chunks(total_pages: int, workers: int, max_pages_per_request: int, min_pages_per_chunk: int = 1) -> List[Chunk]:
+    """
+    PDF를 OCR 요청 단위로 나누는 계획을 세움.
+    - 조각 수는 워커 수만큼 병렬로 처리되도록 잡되, 조각당 쪽수는 min_pages_per_chunk 이상 max_pages_per_request 이하
+      (작은 파일은 쪽 단위까지 나누어 병렬 처리)
+    - 조각 크기는 최대 1쪽 차이로 고르게 나누어 가장 긴 조각(임계 경로)을 최소화
+    - 반환 순서는 실행 순서로, 긴 조각부터 먼저 시작되도록 정렬 (같은 길이면 앞쪽 페이지부터)
+    """
+    if total_pages <= 0:
+        return []
+    max_pages = max(max_pages_per_request, 1)
+    min_pages = min(max(min_pages_per_chunk, 1), max_pages)
+
+    # 요청당 쪽수 제한을 지키는 최소 조각 수와, 워커를 모두 쓰는 조각 수 중 큰 값
+    required = math.ceil(total_pages / max_pages)
+    parallel = min(max(workers, 1), total_pages // min_pages or 1)
+    num_chunks = max(required, parallel)
+    # 워커보다 조각이 많으면 워커 수의 배수로 맞춰 마지막 차수에 짧은 조각만 남지 않도록 함
+    if num_chunks > workers > 0:
+        rounded = math.ceil(num_chunks / workers) * workers
+        if total_pages // rounded >= min_pages:
+            num_chunks = rounded
+    num_chunks = min(num_chunks, total_pages)
+
+    base, extra = divmod(total_pages, num_chunks)
+    chunks = []
+    start = 0
+    for index in range(num_chunks):
+        size = base + (1 if index < extra else 0)
+        chunks.append(Chunk(index, start, start + size))
+        start += size
+
+    return sorted(chunks, key=lambda chunk: (-chunk.pages, chunk.index))
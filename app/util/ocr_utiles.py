@@ -1,276 +1,322 @@
-from typing import Dict
-from fastapi import HTTPException
-import requests
-import uuid
-import time
-import json
-import re
-from collections import defaultdict
 from PyPDF2 import PdfReader, PdfWriter
 from celery_config import celery_app
 from config import Config
-from util.s3_utils import S3Service
-from crud.student_record_crud import create_pdf_file
+from util.storage import upload_store
+from util.ocr_parser import parse_ocr_text, parse_academic_performance
+from util.ocr_client import ocr_client, OCRRetryableError
+from util.ocr_scheduler import plan_chunks
+from util.cache import cache, cached_get_sync, make_key
+from util.job_progress import job_progress
+from util.metrics import OCR_STAGE_SECONDS
+from util.passage_index import build_passage_index, copy_passage_index
+from langchainbot.embeddings import embedder
+from util.pending_records import pending_records
+from util.student_context import ContextSnapshot
+from crud.student_record_crud import (
+    create_pdf_file, create_pdf_files, get_pdf_file, get_pdf_file_by_hash, load_record_sections, render_record_contexts,
+)
+import hashlib
 import io
-from database import get_db
+import logging
+import time
+from database import session_scope, release_db
 from celery import chord
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+
+logger = logging.getLogger(__name__)
+
 
+class JobTask(celery_app.Task):
+    """
+    최종 실패 시(재시도 소진 포함) 작업 진행 상황을 FAILURE로 기록하는 태스크.
+    분할 태스크는 자신의 id가, 조각/후속 태스크는 job_id 키워드 인자가 작업 id.
+    """
 
-s3_service = S3Service()
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        job_progress.fail(kwargs.get("job_id", task_id), str(exc))
 
-@celery_app.task
-def process_ocr_results(results, file_bytes, filename, user_id):
+
+def reuse_existing_record(file_hash: str, filename, user_id: int):
+    """
+    같은 내용의 PDF가 이미 처리되었으면 OCR 없이 결과를 재사용.
+    본인이 올린 파일이면 기존 기록을 그대로 반환하고, 다른 사용자의 파일이면 OCR 결과와 URL을 복사한 새 기록을 생성.
     """
-    그룹 태스크 완료 후 결과를 처리하고 S3 업로드 및 DB 저장을 수행하는 태스크
+    with session_scope() as db:
+        record = get_pdf_file_by_hash(db, file_hash, user_id=user_id)
+        if record is not None:
+            return record
+        source = get_pdf_file_by_hash(db, file_hash)
+        if source is None:
+            return None
+        # context 생성(요약 LLM 호출) 동안 조회에 쓴 커넥션을 잡고 있지 않도록 반납
+        release_db(db)
+        record = create_pdf_file(db, filename, source.file_url, user_id, source.text_data, file_hash=file_hash)
+        copy_passage_index(source.id, record.id)
+        return record
+
+
+@celery_app.task(base=JobTask)
+def process_ocr_results(results, staging_key, filename, user_id, file_hash=None, chunk_order=None, job_id=None,
+                        cached_results=None):
     """
-    # 결과 병합
+    그룹 태스크 완료 후 결과를 처리하고 S3 업로드 후 DB 저장 대기열에 넣는 태스크.
+    cached_results는 OCR 태스크 없이 캐시에서 가져온 조각 결과 ([조각 번호, 텍스트] 목록).
+    저장은 persist_pending_records가 여러 작업의 기록을 모아 한 트랜잭션으로 수행.
+    """
+    # 결과 병합 (조각은 긴 것부터 실행되므로 캐시에서 가져온 조각과 합쳐 페이지 순서로 되돌림)
+    job_progress.set_stage(job_id, "parse")
+    if chunk_order is not None:
+        pieces = list(zip(chunk_order, results)) + [tuple(piece) for piece in cached_results or ()]
+        results = [text for _, text in sorted(pieces)]
     combined_text = "".join(results)
-    ocr_data = parse_ocr_text(combined_text)
+    with OCR_STAGE_SECONDS.labels("parse").time():
+        ocr_data = parse_ocr_text(combined_text)
 
-    # S3에 파일 업로드
+    # 스테이징된 원본 파일을 공개 경로로 이동
+    job_progress.set_stage(job_id, "upload")
     try:
-        file_url = s3_service.upload_file(io.BytesIO(file_bytes), filename)
+        with OCR_STAGE_SECONDS.labels("upload").time():
+            file_url = upload_store.publish(staging_key, filename)
+            upload_store.delete(staging_key)
     except Exception as e:
         raise Exception(f"S3 업로드 실패: {str(e)}")
 
-    # DB 저장
+    # 카테고리별 context(요약 LLM 호출 포함)는 DB 커넥션 없이 미리 만들어 두고 저장 대기열에 넣음
+    job_progress.set_stage(job_id, "persist")
+    with OCR_STAGE_SECONDS.labels("context").time():
+        contexts = render_record_contexts(ocr_data)
+    pending_records.push({
+        "job_id": job_id,
+        "record": {
+            "file_name": filename,
+            "file_url": file_url,
+            "user_id": user_id,
+            "ocr_data": ocr_data,
+            "file_hash": file_hash,
+            "contexts": contexts,
+        },
+    })
+    # 잠시 기다렸다가 그 사이 끝난 다른 작업의 기록과 함께 저장
+    persist_pending_records.apply_async(countdown=Config.OCR_PERSIST_BATCH_DELAY)
+    return {"file_url": file_url, "ocr_data": ocr_data}
+
+
+def save_records(items: list) -> list:
+    """
+    대기열 항목을 한 트랜잭션으로 저장하고 항목 순서대로 기록 id를 반환.
+    일부 항목 때문에 실패하면(데이터 오류 등) 한 건씩 다시 저장하고, 저장하지 못한 항목은 작업 실패로 기록하고 None.
+    DB 연결 오류는 그대로 발생시켜 태스크를 다시 실행함.
+    """
+    records = [
+        {**item["record"], "contexts": {
+            category: ContextSnapshot(*snapshot) for category, snapshot in item["record"]["contexts"].items()
+        }}
+        for item in items
+    ]
+    try:
+        with session_scope() as db:
+            return create_pdf_files(db, records)
+    except OperationalError:
+        raise
+    except SQLAlchemyError as e:
+        logger.warning(f"Failed to save {len(items)} records in one batch, saving one by one: {e}")
+
+    ids = []
+    for item, record in zip(items, records):
+        try:
+            with session_scope() as db:
+                ids.extend(create_pdf_files(db, [record]))
+        except OperationalError:
+            raise
+        except SQLAlchemyError as e:
+            job_progress.fail(item["job_id"], f"DB 저장 실패: {str(e)}")
+            ids.append(None)
+    return ids
+
+
+def fail_pending_records(token: str, error: str):
+    """
+    대기열의 모든 항목을 작업 실패로 기록하고 대기열에서 제거 (진행 상황을 기다리는 클라이언트가 끝나도록).
+    조각 OCR 결과는 캐시에 남아 있으므로 다시 업로드하면 OCR 없이 처리됨
+    """
+    count = pending_records.size()
+    if not count:
+        return
+    items = pending_records.peek(count)
+    for item in items:
+        job_progress.fail(item["job_id"], error)
+    pending_records.remove(token, len(items))
+
+
+@celery_app.task(bind=True, max_retries=Config.OCR_TASK_MAX_RETRIES)
+def persist_pending_records(self):
+    """
+    저장 대기열의 기록을 OCR_PERSIST_BATCH_SIZE개씩 한 트랜잭션으로 저장하고, 기록별 문단 인덱스 태스크를 실행.
+    다른 워커가 저장 중이면 대기열이 남아 있을 때만 잠시 후 새 태스크로 다시 실행 (잠금 경합은 재시도 횟수에 포함하지 않음).
+    배치마다 잠금을 연장하고, 잠금을 잃었으면(저장이 OCR_PERSIST_LOCK_TTL보다 오래 걸림) 남은 항목은 잠금을 가진 워커에게 맡김.
+    """
+    token = pending_records.acquire()
+    if token is None:
+        if pending_records.size():
+            persist_pending_records.apply_async(countdown=Config.OCR_PERSIST_BATCH_DELAY)
+        return 0
+
+    saved = 0
+    try:
+        while True:
+            if not pending_records.extend(token):
+                logger.warning("Lost the pending records lock, leaving the queue to the current holder")
+                break
+            items = pending_records.peek(Config.OCR_PERSIST_BATCH_SIZE)
+            if not items:
+                break
+            try:
+                with OCR_STAGE_SECONDS.labels("persist").time():
+                    record_ids = save_records(items)
+            except OperationalError as e:
+                if self.request.retries >= self.max_retries:
+                    fail_pending_records(token, f"DB 저장 실패: {str(e)}")
+                    raise
+                # DB 연결 오류는 대기열을 그대로 두고 점점 길게 기다렸다가 다시 시도
+                raise self.retry(exc=e, countdown=Config.OCR_PERSIST_BATCH_DELAY * 2 ** self.request.retries)
+            if not pending_records.remove(token, len(items)):
+                # 저장 중 잠금이 다른 워커에게 넘어감: 그 워커가 같은 항목을 다시 저장하고(file_hash로 중복 제거) 마무리함
+                logger.warning(f"Lost the pending records lock while saving {len(items)} records")
+                break
+
+            # 인덱스 태스크에는 id만 넘기고 문단은 태스크에서 DB로 조회 (OCR 결과를 브로커로 다시 보내지 않음)
+            for item, record_id in zip(items, record_ids):
+                if record_id is None:
+                    continue
+                index_student_record.delay(record_id, job_id=item["job_id"])
+                saved += 1
+    finally:
+        pending_records.release(token)
+    return saved
+
+
+@celery_app.task(base=JobTask)
+def index_student_record(record_id, job_id=None):
+    """
+    저장된 기록의 질문 관련 문단 검색용 인덱스를 만들고 작업을 완료로 기록.
+    섹션은 DB에서 조회하며, 임베딩 호출 동안 커넥션을 잡고 있지 않도록 조회 후 바로 세션을 닫음.
+    인덱스 생성에 실패해도 검색 없이 전체 context를 사용하므로 작업은 완료로 처리.
+    """
+    job_progress.set_stage(job_id, "index")
+    with session_scope() as db:
+        file_url = get_pdf_file(db, record_id).file_url
+        sections = load_record_sections(db, record_id)
     try:
-        db = next(get_db())  # get_db는 generator이므로 next로 호출
-        create_pdf_file(db, filename, file_url, user_id, ocr_data)
+        with OCR_STAGE_SECONDS.labels("index").time():
+            build_passage_index(record_id, sections, embedder)
     except Exception as e:
-        raise Exception(f"DB 저장 실패: {str(e)}")
+        logger.warning(f"Failed to build passage index for record {record_id}: {e}")
 
-    return {"file_url": file_url, "ocr_data": ocr_data}
+    job_progress.finish(job_id, {"record_id": record_id, "file_url": file_url})
 
 
-@celery_app.task(bind=True)
-def split_and_ocr_pdf_with_celery(self, file_bytes: bytes, filename, user_id: int):
+@celery_app.task(bind=True, base=JobTask)
+def split_and_ocr_pdf_with_celery(self, staging_key: str, filename, user_id: int, file_hash: str = None):
     """
-    PDF 파일을 분할하고 OCR 작업을 비동기로 실행하는 태스크
+    PDF 파일을 분할하고 OCR 작업을 비동기로 실행하는 태스크.
+    브로커에는 파일 대신 스테이징 저장소의 키만 전달됨.
+    이미 처리된 파일(file_hash 일치)이면 분할/OCR 없이 기존 결과로 바로 완료.
+    이 태스크의 id가 작업 id이며, 전체 진행 상황은 job_progress에 기록됨.
     """
-    max_pages = 10
+    job_id = self.request.id
+    if file_hash:
+        record = reuse_existing_record(file_hash, filename, user_id)
+        if record is not None:
+            upload_store.delete(staging_key)
+            job_progress.finish(job_id, {"record_id": record.id, "file_url": record.file_url})
+            return {
+                "message": "중복 파일",
+                "record_id": record.id,
+                "file_url": record.file_url,
+            }
+
+    split_started = time.perf_counter()
+    file_bytes = upload_store.load(staging_key)
     reader = PdfReader(io.BytesIO(file_bytes))
     total_pages = len(reader.pages)
 
     # 작업 상태 초기화
     self.update_state(state="STARTED", meta={"completed": 0, "total": total_pages})
+    job_progress.start(job_id, total_pages)
+
+    # 쪽수, 워커 수, OCR API의 요청당 쪽수 제한으로 조각 계획 (긴 조각부터 실행)
+    chunks = plan_chunks(
+        total_pages,
+        workers=Config.OCR_WORKER_CONCURRENCY,
+        max_pages_per_request=Config.OCR_MAX_PAGES_PER_REQUEST,
+        min_pages_per_chunk=Config.OCR_MIN_PAGES_PER_CHUNK,
+    )
 
     tasks = []
-    num_files = (total_pages + max_pages - 1) // max_pages  # 필요한 파일 수 계산
-
-    for i in range(num_files):
-        writer = PdfWriter()
-        start_page = i * max_pages
-        end_page = min(start_page + max_pages, total_pages)
-
-        for j in range(start_page, end_page):
-            writer.add_page(reader.pages[j])
-
-        # PDF 조각을 메모리로 저장
-        pdf_buffer = io.BytesIO()
-        writer.write(pdf_buffer)
-        pdf_buffer.seek(0)
-
-        # OCR 작업을 태스크로 생성
-        tasks.append(ocr_pdf_from_memory.s(pdf_buffer.read(), f"split_{i + 1}.pdf"))
-
-    # 작업 그룹을 생성하고 후속 태스크를 연결
-    callback = process_ocr_results.s(file_bytes, filename, user_id)
-    chord(tasks)(callback)
+    task_order = []
+    # 이전에 OCR 처리한 조각의 결과 ([조각 번호, 텍스트]. JSON 직렬화를 거치므로 dict 대신 목록 사용)
+    cached_results = []
+    for chunk in chunks:
+        if chunk.pages == total_pages:
+            # 나눌 필요가 없으면 원본을 다시 쓰지 않고 그대로 사용
+            chunk_bytes = file_bytes
+        else:
+            writer = PdfWriter()
+            for j in range(chunk.start_page, chunk.end_page):
+                writer.add_page(reader.pages[j])
+            pdf_buffer = io.BytesIO()
+            writer.write(pdf_buffer)
+            chunk_bytes = pdf_buffer.getvalue()
+
+        # 같은 내용의 조각을 이미 OCR 처리했으면 저장/태스크 생성 없이 결과를 바로 사용
+        chunk_hash = hashlib.sha256(chunk_bytes).hexdigest()
+        cached_text = cached_get_sync("ocr", make_key("ocr", chunk_hash))
+        if cached_text is not None:
+            cached_results.append([chunk.index, cached_text])
+            continue
+
+        # PDF 조각을 스테이징 저장소에 저장하고 OCR 작업을 태스크로 생성
+        chunk_name = f"split_{chunk.index + 1}.pdf"
+        chunk_key = upload_store.save(chunk_bytes, chunk_name)
+        tasks.append(ocr_pdf_from_memory.s(chunk_key, chunk_name, chunk_hash, job_id=job_id))
+        task_order.append(chunk.index)
+
+    # 작업 그룹을 생성하고 후속 태스크를 연결 (모든 조각이 캐시에 있으면 후속 태스크만 실행)
+    OCR_STAGE_SECONDS.labels("split").observe(time.perf_counter() - split_started)
+    job_progress.set_stage(job_id, "ocr", total=len(tasks))
+    callback_args = (staging_key, filename, user_id, file_hash, task_order)
+    callback_kwargs = {"job_id": job_id, "cached_results": cached_results}
+    if tasks:
+        chord(tasks)(process_ocr_results.s(*callback_args, **callback_kwargs))
+    else:
+        process_ocr_results.apply_async(args=([],) + callback_args, kwargs=callback_kwargs)
 
     return {
         "message": "OCR 작업",
         "total_pages": total_pages,
     }
-@celery_app.task
-def ocr_pdf_from_memory(pdf_bytes, file_name="split_part.pdf"):
-    request_json = {
-        "images": [
-            {
-                "format": "pdf",
-                "name": file_name,
-            }
-        ],
-        "requestId": str(uuid.uuid4()),
-        "version": "V2",
-        "timestamp": int(round(time.time() * 1000)),
-    }
-
-    payload = {'message': json.dumps(request_json).encode('UTF-8')}
-    files = [('file', ('split_part.pdf', pdf_bytes, 'application/pdf'))]
-    headers = {
-        'X-OCR-SECRET': Config.OCR_SECRET_KEY
-    }
-
-    response = requests.post(Config.OCR_API_INVOKE_URL, headers=headers, data=payload, files=files)
-    response_text = ""
-    if response.status_code == 200:
-        # OCR 응답에서 텍스트 추출
-        for j in response.json().get('images', []):
-            for i in j.get('fields', []):
-                response_text += i.get('inferText', '') + " "
-    else:
-        raise HTTPException(status_code=500, detail=f"OCR processing failed: {response.status_code}")
-    return response_text
-
-def parse_ocr_text(text: str) -> Dict:
+@celery_app.task(
+    base=JobTask,
+    autoretry_for=(OCRRetryableError,),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    retry_jitter=True,
+    max_retries=Config.OCR_TASK_MAX_RETRIES,
+)
+def ocr_pdf_from_memory(chunk_key, file_name="split_part.pdf", chunk_hash=None, job_id=None):
     """
-    OCR로 추출한 텍스트를 파싱하여 학년별 데이터를 반환
+    스테이징 저장소의 PDF 조각을 OCR 처리. 성공하면 조각 파일은 삭제.
+    일시적인 오류로 실패하면 이 조각만 다시 실행됨 (chord의 나머지 조각은 그대로 유지).
+    같은 내용의 조각을 이미 OCR 처리했으면 OCR API를 호출하지 않고 저장된 결과를 반환.
     """
-
-    # 불필요한 정보를 제외하기 위한 패턴 정의 (정확히 문서확인번호와 신청인 제거)
-    exclude_pattern = re.compile(
-        r"문서확인번호:\s*\d+-\d+-\d+-\d+\s*\(신청인:\s*[\S\s]+?\)\s*|"
-        r"문서확인번호:\s*\d+-\d+-\d+-\d+\s*\(신청인\s*:\s*.*?\)\s*|"
-        r"정부24\s+gov\.kr|"
-        r"\S+고등학교\s*\d{4}년\s*\d{1,2}월\s*\d{1,2}일\s*\d+/\d+\s*반\s*\d+\s*번호\s*\d+\s*이름\s*\S+|"
-        r"본\s증명서는\s열람용이며,\s법적\s효력이\s없습니다\."
-    )
-
-    # 각 섹션을 구분하는 패턴 정의 (띄어쓰기 유무를 모두 허용하도록 수정)
-    pattern = re.compile(
-        r"(1\.\s*인적\s*사항)(.*?)(?=2\.\s*학적\s*사항|$)|"
-        r"(2\.\s*학적\s*사항)(.*?)(?=3\.\s*출결\s*상황|$)|"
-        r"(3\.\s*출결\s*상황)(.*?)(?=4\.\s*수\s*상\s*경\s*력|$)|"
-        r"(4\.\s*수\s*상\s*경\s*력)(.*?)(?=5\.\s*자격증\s*및\s*인증\s*취득\s*상황|$)|"
-        r"(5\.\s*자격증\s*및\s*인증\s*취득\s*상황)(.*?)(?=6\.\s*진로\s*희망\s*사항|$)|"
-        r"(6\.\s*진로\s*희망\s*사항)(.*?)(?=7\.\s*창의적\s*체험\s*활동\s*상황|$)|"
-        r"(7\.\s*창의적\s*체험\s*활동\s*상황)(.*?)(?=8\.\s*교과\s*학습\s*발달\s*상황|$)|"
-        r"(8\.\s*교과\s*학습\s*발달\s*상황)(.*?)(?=9\.\s*독서\s*활동\s*상황|$)|"
-        r"(9\.\s*독서\s*활동\s*상황)(.*?)(?=10\.\s*행동\s*특성\s*및\s*종합\s*의견|$)|"
-        r"(10\.\s*행동\s*특성\s*및\s*종합\s*의견)(.*?)(?=$)",
-        re.DOTALL
-    )
-
-    # 매칭 결과 저장할 딕셔너리 초기화
-    split_text = {
-        "인적사항": "",
-        "학적사항": "",
-        "출결사항": "",
-        "수상경력": "",
-        "자격증 및 인증 취득상황": "",
-        "진로희망사항": "",
-        "창의적 체험활동상황": "",
-        "교과학습발달상황": "",
-        "독서활동상황": "",
-        "행동특성 및 종합의견": ""
-    }
-
-    # 패턴으로 텍스트를 분리하여 딕셔너리에 저장
-    for match in pattern.finditer(text):
-        # 매칭된 그룹 중 None이 아닌 첫 번째 그룹을 사용하여 섹션 내용 추출
-        section_content = next((match.group(i) for i in range(2, 21, 2) if match.group(i)), "").strip()
-
-        # 불필요한 정보 제외
-        section_content = exclude_pattern.sub("", section_content).strip()
-
-        # 각 섹션에 맞는 내용 저장
-        if match.group(1):
-            split_text["인적사항"] = section_content
-        elif match.group(3):
-            split_text["학적사항"] = section_content
-        elif match.group(5):
-            split_text["출결사항"] = section_content
-        elif match.group(7):
-            split_text["수상경력"] = section_content
-        elif match.group(9):
-            split_text["자격증 및 인증 취득상황"] = section_content
-        elif match.group(11):
-            split_text["진로희망사항"] = section_content
-        elif match.group(13):
-            split_text["창의적 체험활동상황"] = section_content
-        elif match.group(15):
-            split_text["교과학습발달상황"] = section_content
-        elif match.group(17):
-            split_text["독서활동상황"] = section_content
-        elif match.group(19):
-            split_text["행동특성 및 종합의견"] = section_content
-
-    split_text["교과학습발달상황"] = parse_academic_performance(split_text["교과학습발달상황"])
-
-    return split_text
-
-
-def parse_academic_performance(text: str) -> Dict:
-
-    # 학년별 데이터를 저장할 딕셔너리 초기화
-    grades_data = defaultdict(lambda: {
-        "성적": [],
-        "세부능력 및 특기사항": [],
-        "체육 및 예술": [],
-        "특기사항": []
-    })
-
-    # 학년별 패턴 정의 (1학년, 2학년, 3학년) 각각을 추출
-    grade_pattern = re.compile(r"\[(\d학년)\](.*?)(?=(\[\d학년\]|$))", re.DOTALL)
-
-    # 교과 과목 성적 데이터 패턴 정의
-    subject_pattern = re.compile(
-        r"(?P<교과>[\w()]+)\s(?P<과목>[^\s\d]+(?:\s[I]+)?)\s(?P<단위수>\d+)\s(?P<원점수_과목평균>\d+/[\d.]+)\((?P<표준편차>[\d.]+)\)\s("
-        r"?P<성취도>[A-E])\((?P<수강자수>\d+)\)\s(?P<석차>\d+)",
-        re.DOTALL
-    )
-
-    # 세부능력 및 특기사항, 체육 및 예술, 특기사항을 인식하기 위한 패턴 정의
-    extra_pattern = re.compile(
-        r"세부능력및특기사항(.*?)(?=<\s*체육\s*[·.]?\s*예술\s*\(음악/미술\)\s*>|세부능력및특기사항|특기사항|$)|"  # 세부능력 및 특기사항 (중복 허용)
-        r"<\s*체육\s*[·.]?\s*예술\s*\(음악/미술\)\s*>(.*?)(?=특기사항|$)|"  # 체육 및 예술 패턴
-        r"특기사항(.*?)(?=(\[\d학년\]|$))",  # 특기사항 패턴
-        re.DOTALL
-    )
-
-    # 개별 과목별 세부능력 및 특기사항 패턴 정의
-    individual_subject_pattern = re.compile(r"([가-힣]+(?:I{1,2}|[A-Z]?)?):\s*(.*?)(?=([가-힣]+(?:I{1,2}|[A-Z]?)?:|$))",
-                                            re.DOTALL)
-
-    # 체육 및 예술 섹션에서 학기별로 교과, 과목, 단위수, 성취도를 추출하는 패턴
-    physical_arts_pattern = re.compile(
-        r"(?P<교과>체육|예술\(음악/미술\))\s(?P<과목>.+?)\s(?P<단위수_1학기>\d+)\s(?P<성취도_1학기>[A-E])\s(?P<단위수_2학기>\d+)\s(?P<성취도_2학기>[A-E])",
-        re.DOTALL
-    )
-
-    # 학년별로 데이터를 추출
-    for grade_match in grade_pattern.finditer(text):
-        grade = grade_match.group(1)  # 학년 (1학년, 2학년, ...)
-        grade_text = grade_match.group(2)  # 해당 학년의 전체 텍스트
-
-        # 교과 과목 성적 데이터를 추출
-        for subject_match in subject_pattern.finditer(grade_text):
-            subject_data = {
-                "교과": subject_match.group("교과"),
-                "과목": subject_match.group("과목"),
-                "단위수": subject_match.group("단위수"),
-                "원점수_과목평균": subject_match.group("원점수_과목평균"),
-                "성취도": subject_match.group("성취도"),
-                "석차": subject_match.group("석차"),
-                "표준편차": subject_match.group("표준편차"),
-                "수강자수": subject_match.group("수강자수"),
-            }
-            grades_data[grade]["성적"].append(subject_data)
-
-        # 세부능력 및 특기사항, 체육 및 예술, 특기사항 추출
-        extra_matches = extra_pattern.findall(grade_text)
-        for match in extra_matches:
-            if match[0]:  # 세부능력 및 특기사항이 여러 번 나타날 수 있음
-                details = match[0].strip()
-                for sub_match in individual_subject_pattern.finditer(details):
-                    subject_name = sub_match.group(1)
-                    subject_details = sub_match.group(2).strip()
-                    formatted_details = f"{subject_name}: {subject_details}"
-                    grades_data[grade]["세부능력 및 특기사항"].append(formatted_details)
-            if match[1]:  # 체육 및 예술이 여러 번 나타날 수 있음
-                physical_arts_text = match[1].strip()
-                for physical_arts_match in physical_arts_pattern.finditer(physical_arts_text):
-                    activity_data = {
-                        "교과": physical_arts_match.group("교과"),
-                        "과목": physical_arts_match.group("과목"),
-                        "단위수_1학기": physical_arts_match.group("단위수_1학기"),
-                        "성취도_1학기": physical_arts_match.group("성취도_1학기"),
-                        "단위수_2학기": physical_arts_match.group("단위수_2학기"),
-                        "성취도_2학기": physical_arts_match.group("성취도_2학기"),
-                    }
-                    grades_data[grade]["체육 및 예술"].append(activity_data)
-            if match[2]:  # 특기사항이 여러 번 나타날 수 있음
-                grades_data[grade]["특기사항"].append(match[2].strip())
-
-    return grades_data
\ No newline at end of file
+    cache_key = make_key("ocr", chunk_hash) if chunk_hash else None
+    response_text = cached_get_sync("ocr", cache_key) if cache_key else None
+    if response_text is None:
+        pdf_bytes = upload_store.load(chunk_key)
+        with OCR_STAGE_SECONDS.labels("ocr").time():
+            response_text = ocr_client.recognize(pdf_bytes, file_name)
+        if cache_key:
+            cache.set(cache_key, response_text, ttl=Config.OCR_RESULT_CACHE_TTL)
+    upload_store.delete(chunk_key)
+    job_progress.chunk_done(job_id)
+    return response_text
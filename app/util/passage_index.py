@@ -0,0 +1,175 @@
+import functools
+import json
+import logging
+import os
+import re
+import shutil
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from config import Config
+from util.student_context import (
+    ACADEMIC_SECTION, CATEGORY_SECTIONS, FREE_TEXT_GRADE_KEYS, FREE_TEXT_SECTIONS,
+    compact, render_outline, strip_boilerplate,
+)
+from util.tokens import count_tokens
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.npy"
+META_FILE = "passages.json"
+RELATED_KEY = "관련 기록"
+SENTENCE_END_PATTERN = re.compile(r"(?<=[.!?])\s+")
+
+
+class Passage(NamedTuple):
+    section: str
+    label: str  # context에 표시할 출처 (섹션 또는 "1학년 세부능력 및 특기사항")
+    text: str
+
+
+class PassageIndex(NamedTuple):
+    embedder: str
+    passages: List[Passage]
+    outlines: dict  # 카테고리별 서술형 항목을 뺀 context
+    vectors: np.ndarray  # (문단 수, 차원), 정규화된 float32 (memory-mapped)
+
+
+def _index_dir(record_id: int) -> str:
+    return os.path.join(Config.PASSAGE_INDEX_DIR, str(int(record_id)))
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    문장 단위로 묶어 max_tokens 안팎의 문단으로 나눔 (한 문장이 더 길면 그대로 한 문단)
+    """
+    chunks, current, current_tokens = [], [], 0
+    for sentence in SENTENCE_END_PATTERN.split(text):
+        tokens = count_tokens(sentence)
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(sentence)
+        current_tokens += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def split_passages(sections: dict) -> List[Passage]:
+    """
+    서술형 항목(창체, 독서, 행동특성, 학년별 세특/특기사항)을 검색 단위 문단으로 나눔
+    """
+    sections = strip_boilerplate(compact(sections) or {}) or {}
+    passages = []
+    for name, value in sections.items():
+        if name in FREE_TEXT_SECTIONS and isinstance(value, str):
+            passages.extend(Passage(name, name, chunk) for chunk in chunk_text(value, Config.PASSAGE_MAX_TOKENS))
+        elif name == ACADEMIC_SECTION and isinstance(value, dict):
+            for grade, grade_data in value.items():
+                if not isinstance(grade_data, dict):
+                    continue
+                for key in FREE_TEXT_GRADE_KEYS:
+                    for item in grade_data.get(key, []):
+                        if isinstance(item, str):
+                            passages.extend(Passage(name, f"{grade} {key}", chunk)
+                                            for chunk in chunk_text(item, Config.PASSAGE_MAX_TOKENS))
+    return passages
+
+
+def _atomic_write(path: str, write):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+    os.replace(tmp_path, path)
+
+
+def build_passage_index(record_id: int, sections: dict, embedder) -> int:
+    """
+    생활기록부 문단을 임베딩하여 인덱스 파일로 저장하고 문단 수를 반환 (서술형 항목이 없으면 만들지 않음)
+    """
+    passages = split_passages(sections)
+    if not passages:
+        return 0
+    vectors = embedder.embed([passage.text for passage in passages])
+    meta = {
+        "embedder": embedder.name,
+        "passages": [passage._asdict() for passage in passages],
+        "outlines": {category: render_outline(sections, category) for category in CATEGORY_SECTIONS},
+    }
+    index_dir = _index_dir(record_id)
+    os.makedirs(index_dir, exist_ok=True)
+    # 읽는 쪽은 메타 파일을 기준으로 하므로 벡터를 먼저 씀
+    _atomic_write(os.path.join(index_dir, VECTORS_FILE), lambda f: np.save(f, vectors.astype(np.float32)))
+    _atomic_write(os.path.join(index_dir, META_FILE), lambda f: f.write(_dumps(meta).encode("utf-8")))
+    return len(passages)
+
+
+def copy_passage_index(source_record_id: int, record_id: int) -> bool:
+    """
+    같은 파일로 만든 기록의 인덱스를 복사 (다시 임베딩하지 않음)
+    """
+    source_dir = _index_dir(source_record_id)
+    if not os.path.exists(os.path.join(source_dir, META_FILE)):
+        return False
+    shutil.copytree(source_dir, _index_dir(record_id), dirs_exist_ok=True)
+    return True
+
+
+@functools.lru_cache(maxsize=128)
+def _load_index(index_dir: str, mtime_ns: int) -> PassageIndex:
+    with open(os.path.join(index_dir, META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+    return PassageIndex(
+        meta["embedder"],
+        [Passage(**passage) for passage in meta["passages"]],
+        meta["outlines"],
+        np.load(os.path.join(index_dir, VECTORS_FILE), mmap_mode="r"),
+    )
+
+
+def load_passage_index(record_id: int) -> Optional[PassageIndex]:
+    index_dir = _index_dir(record_id)
+    try:
+        mtime_ns = os.stat(os.path.join(index_dir, META_FILE)).st_mtime_ns
+        return _load_index(index_dir, mtime_ns)
+    except (OSError, ValueError, KeyError) as e:
+        if not isinstance(e, FileNotFoundError):
+            logger.warning(f"Failed to load passage index for record {record_id}: {e}")
+        return None
+
+
+def retrieve_context(record_id: int, category: str, question: str, embedder) -> Optional[str]:
+    """
+    카테고리 섹션의 문단 중 질문과 가까운 RETRIEVAL_TOP_K개를 골라 서술형 항목을 뺀 context에 붙임.
+    인덱스가 없거나 다른 임베딩으로 만들어졌으면 None.
+    """
+    index = load_passage_index(record_id)
+    if index is None or index.embedder != embedder.name:
+        return None
+    sections = CATEGORY_SECTIONS[category]
+    candidates = np.array([i for i, passage in enumerate(index.passages) if passage.section in sections], dtype=np.int64)
+    if not len(candidates):
+        return None
+
+    query = embedder.embed([question])[0]
+    scores = np.asarray(index.vectors[candidates]) @ query
+    ranked = candidates[np.argsort(-scores, kind="stable")[:Config.RETRIEVAL_TOP_K]]
+
+    outline = index.outlines.get(category) or {}
+    remaining = Config.CONTEXT_TOKEN_BUDGETS[category] - count_tokens(_dumps(outline))
+    selected = []
+    for i in ranked:
+        passage = index.passages[i]
+        tokens = count_tokens(passage.text) + count_tokens(passage.label)
+        if tokens <= remaining:
+            selected.append(i)
+            remaining -= tokens
+    # 학년 순서(추세)가 드러나도록 문서 순서로 정렬
+    related = [f"[{index.passages[i].label}] {index.passages[i].text}" for i in sorted(selected)]
+    return _dumps({**outline, RELATED_KEY: related})
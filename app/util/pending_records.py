@@ -0,0 +1,101 @@
+import json
+import uuid
+from typing import List, Optional
+
+import redis
+
+from config import Config
+
+KEY_PREFIX = "yomojomo:pending_records"
+
+# 잠금을 잡은 쪽(token 일치)만 해제
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# 잠금을 잡은 쪽(token 일치)만 만료 시간 연장
+_EXTEND_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# 잠금을 잡은 쪽(token 일치)만 대기열 앞쪽 제거
+_REMOVE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('LTRIM', KEYS[2], ARGV[2], -1)
+    return 1
+end
+return 0
+"""
+
+
+class PendingRecords:
+    """
+    OCR이 끝나 DB 저장을 기다리는 기록의 Redis 대기열. 여러 작업의 기록을 모아 한 트랜잭션으로 저장하기 위함.
+    한 번에 한 워커만 잠금을 잡고 대기열 앞에서부터 저장하며, 저장이 끝난 항목만 대기열에서 제거함.
+    저장 도중 워커가 죽으면 잠금이 만료된 뒤 다음 저장 태스크가 같은 항목을 다시 저장함 (create_pdf_files가 중복을 거름).
+    잠금은 배치마다 extend로 연장하며, 만료되어 다른 워커에게 넘어갔으면 연장/제거 모두 실패하므로
+    앞쪽 항목을 두 워커가 함께 지우는 일이 없음.
+    """
+
+    def __init__(self, url: Optional[str], lock_ttl: int):
+        self.url = url
+        self.lock_ttl = lock_ttl
+        self._queue_key = f"{KEY_PREFIX}:queue"
+        self._lock_key = f"{KEY_PREFIX}:lock"
+        self._client = None
+        # 대기열은 Celery 워커에서만 사용하므로 Redis가 설정되지 않아도 API는 불러올 수 있도록 함
+        if url:
+            self._client = redis.Redis.from_url(url, socket_timeout=5, socket_connect_timeout=5, decode_responses=True)
+            self._release = self._client.register_script(_RELEASE_SCRIPT)
+            self._extend = self._client.register_script(_EXTEND_SCRIPT)
+            self._remove = self._client.register_script(_REMOVE_SCRIPT)
+
+    @property
+    def client(self) -> redis.Redis:
+        # 잠금 스크립트(release/extend/remove)는 acquire 이후에만 호출되므로 여기서 한 번 확인됨
+        if self._client is None:
+            raise RuntimeError("OCR_PERSIST_REDIS_URL is not configured")
+        return self._client
+
+    def push(self, item: dict):
+        self.client.rpush(self._queue_key, json.dumps(item, ensure_ascii=False))
+
+    def size(self) -> int:
+        return self.client.llen(self._queue_key)
+
+    def acquire(self) -> Optional[str]:
+        """
+        저장 잠금을 잡고 token을 반환. 다른 워커가 저장 중이면 None
+        """
+        token = uuid.uuid4().hex
+        if self.client.set(self._lock_key, token, nx=True, ex=self.lock_ttl):
+            return token
+        return None
+
+    def release(self, token: str):
+        self._release(keys=[self._lock_key], args=[token])
+
+    def extend(self, token: str) -> bool:
+        """
+        잠금 만료 시간을 lock_ttl로 다시 설정. 잠금을 이미 잃었으면 False
+        """
+        return bool(self._extend(keys=[self._lock_key], args=[token, self.lock_ttl]))
+
+    def peek(self, count: int) -> List[dict]:
+        return [json.loads(raw) for raw in self.client.lrange(self._queue_key, 0, count - 1)]
+
+    def remove(self, token: str, count: int) -> bool:
+        """
+        저장을 마친 앞쪽 count개를 대기열에서 제거. 잠금을 아직 잡고 있을 때만 제거하며(그 사이 앞쪽은 바뀌지 않음),
+        잠금을 잃었으면 제거하지 않고 False
+        """
+        return bool(self._remove(keys=[self._lock_key, self._queue_key], args=[token, count]))
+
+
+pending_records = PendingRecords(Config.OCR_PERSIST_REDIS_URL, Config.OCR_PERSIST_LOCK_TTL)
@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from typing import Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# 토큰 버킷 갱신 스크립트. 워커마다 시계가 다를 수 있으므로 Redis 서버 시간을 사용.
+# 토큰이 있으면 하나 꺼내고 0을, 없으면 다음 토큰까지 기다려야 하는 초를 반환 (Lua 숫자는 정수로 잘리므로 문자열)
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RateLimitTimeout(Exception):
+    pass
+
+
+class LocalTokenBucket:
+    """
+    프로세스 내부 토큰 버킷. Redis를 사용할 수 없을 때의 대체 구현.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+
+class TokenBucket:
+    """
+    Redis에 상태를 두어 여러 워커 프로세스가 함께 쓰는 토큰 버킷 (초당 rate개, 최대 capacity개 누적).
+    Redis 오류 시에는 프로세스 내부 버킷으로 대체. rate가 0 이하이면 제한하지 않음.
+    """
+
+    def __init__(self, redis_url: Optional[str], key: str, rate: float, capacity: int):
+        self.key = key
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.fallback = LocalTokenBucket(rate, self.capacity) if rate > 0 else None
+        self._script = None
+        if redis_url and rate > 0:
+            client = redis.Redis.from_url(redis_url, socket_timeout=1, socket_connect_timeout=1)
+            self._script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def take(self) -> float:
+        """
+        토큰을 하나 꺼내 보고, 꺼냈으면 0을, 아니면 다시 시도하기까지 기다릴 초를 반환
+        """
+        if self._script is None:
+            return self.fallback.take()
+        try:
+            return float(self._script(keys=[self.key], args=[self.rate, self.capacity]))
+        except redis.RedisError as e:
+            logger.warning(f"Redis rate limiter unavailable, using in-process bucket: {e}")
+            return self.fallback.take()
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        토큰을 얻을 때까지 대기. timeout 안에 얻지 못하면 RateLimitTimeout
+        """
+        if self.rate <= 0:
+            return
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        while True:
+            wait = self.take()
+            if wait <= 0:
+                return
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(f"Rate limit {self.key} not acquired within {timeout}s")
+            time.sleep(wait)
@@ -1,12 +1,11 @@
 import boto3
 from botocore.exceptions import NoCredentialsError, ClientError
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from uuid import uuid4
 import os
 import logging
 from config import Config
 
-# 로깅 설정
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -39,19 +38,118 @@ class S3Service:
                 file, self.bucket_name, unique_file_name
             )
 
-            # URL 생성 (CloudFront 우선)
-            if self.cloudfront_url:
-                file_url = f"{self.cloudfront_url}/{unique_file_name}"
-            else:
-                # S3 URL 생성
-                file_url = f"{self.bucket_name}.s3.{os.getenv('AWS_REGION')}.amazonaws.com/{unique_file_name}"
-
+            file_url = self.build_url(unique_file_name)
             logger.info(f"File uploaded successfully: {file_url}")
             return file_url
         except (NoCredentialsError, ClientError) as e:
             logger.error(f"Failed to upload file: {e}")
             raise
 
+    def build_url(self, key):
+        """
+        S3 키에 대한 공개 URL 생성 (CloudFront 우선)
+        """
+        if self.cloudfront_url:
+            return f"{self.cloudfront_url}/{key}"
+        # S3 URL 생성
+        return f"{self.bucket_name}.s3.{os.getenv('AWS_REGION')}.amazonaws.com/{key}"
+
+    def put_object(self, key, data: bytes):
+        """
+        바이트 데이터를 지정한 키로 업로드 (임시 저장용, URL 미생성)
+        """
+        try:
+            self.s3.put_object(Bucket=self.bucket_name, Key=key, Body=data)
+        except (NoCredentialsError, ClientError) as e:
+            logger.error(f"Failed to put object {key}: {e}")
+            raise
+
+    def upload_stream(self, fileobj, key, part_size, max_concurrency=4) -> int:
+        """
+        파일 객체를 part_size 단위로 읽어 S3 멀티파트 업로드 (파트는 병렬 업로드).
+        메모리에는 동시에 최대 max_concurrency개의 파트만 유지하며, 한 파트보다 작은 파일은 단일 업로드.
+
+        :param fileobj: read(size)를 지원하는 파일 객체
+        :param key: 업로드할 S3 키
+        :param part_size: 파트 크기 (마지막 파트를 제외하고 5MB 이상이어야 함)
+        :param max_concurrency: 동시에 업로드할 파트 수
+        :return: 업로드한 바이트 수
+        """
+        chunk = fileobj.read(part_size)
+        if len(chunk) < part_size:
+            self.put_object(key, chunk)
+            return len(chunk)
+
+        upload_id = self.s3.create_multipart_upload(Bucket=self.bucket_name, Key=key)["UploadId"]
+        parts = []
+        total_size = 0
+        try:
+            with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+                pending = set()
+                part_number = 1
+                while chunk:
+                    # 업로드 중인 파트가 가득 차면 하나가 끝날 때까지 다음 파트를 읽지 않음
+                    if len(pending) >= max_concurrency:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        parts.extend(future.result() for future in done)
+                    pending.add(executor.submit(self._upload_part, key, upload_id, part_number, chunk))
+                    total_size += len(chunk)
+                    part_number += 1
+                    chunk = fileobj.read(part_size)
+                parts.extend(future.result() for future in pending)
+
+            self.s3.complete_multipart_upload(
+                Bucket=self.bucket_name,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={"Parts": sorted(parts, key=lambda part: part["PartNumber"])},
+            )
+        except BaseException as e:
+            logger.error(f"Multipart upload failed for {key}, aborting: {e}")
+            self.s3.abort_multipart_upload(Bucket=self.bucket_name, Key=key, UploadId=upload_id)
+            raise
+        return total_size
+
+    def _upload_part(self, key, upload_id, part_number, data: bytes) -> dict:
+        response = self.s3.upload_part(
+            Bucket=self.bucket_name, Key=key, UploadId=upload_id, PartNumber=part_number, Body=data
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    def get_object(self, key) -> bytes:
+        """
+        지정한 키의 객체를 바이트로 다운로드
+        """
+        try:
+            return self.s3.get_object(Bucket=self.bucket_name, Key=key)["Body"].read()
+        except (NoCredentialsError, ClientError) as e:
+            logger.error(f"Failed to get object {key}: {e}")
+            raise
+
+    def delete_key(self, key):
+        """
+        지정한 키의 객체 삭제
+        """
+        try:
+            self.s3.delete_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as e:
+            logger.error(f"Failed to delete object {key}: {e}")
+            raise
+
+    def copy_file(self, source_key, file_name, folder=""):
+        """
+        버킷 내 객체를 서버 측 복사로 공개 경로에 저장하고 URL 반환 (재업로드 없음)
+        """
+        try:
+            unique_file_name = f"{folder}/{uuid4()}-{file_name}" if folder else f"{uuid4()}-{file_name}"
+            self.s3.copy({"Bucket": self.bucket_name, "Key": source_key}, self.bucket_name, unique_file_name)
+            file_url = self.build_url(unique_file_name)
+            logger.info(f"File copied successfully: {file_url}")
+            return file_url
+        except (NoCredentialsError, ClientError) as e:
+            logger.error(f"Failed to copy file: {e}")
+            raise
+
     def delete_file(self, file_url):
         """
         S3에서 파일 삭제.
@@ -0,0 +1,11 @@
+import json
+
+# 프록시(nginx 등)가 이벤트를 버퍼링하지 않도록 하는 헤더
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def format_sse(event: str, data: dict) -> str:
+    """
+    Server-Sent Events 형식의 문자열 생성
+    """
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
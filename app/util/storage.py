@@ -0,0 +1,154 @@
+import hashlib
+import os
+import shutil
+from typing import NamedTuple
+from uuid import uuid4
+
+from config import Config
+from util.s3_utils import S3Service
+
+
+def _staging_key(file_name: str) -> str:
+    # 사용자 파일명에 경로가 섞여 들어와도 스테이징 영역을 벗어나지 않도록 basename만 사용
+    return f"{Config.UPLOAD_STAGING_PREFIX}{uuid4()}/{os.path.basename(file_name) or 'upload.pdf'}"
+
+
+class UploadTooLargeError(Exception):
+    def __init__(self, max_size: int):
+        super().__init__(f"Upload exceeds {max_size} bytes")
+        self.max_size = max_size
+
+
+class StagedFile(NamedTuple):
+    key: str
+    sha256: str
+    size: int
+
+
+class LimitedReader:
+    """
+    읽은 바이트 수를 세면서 max_size를 넘으면 UploadTooLargeError를 발생시키는 파일 래퍼.
+    업로드 도중에 중단되므로 전체 파일을 받기 전에 크기 제한을 적용할 수 있음.
+    읽는 동안 SHA-256도 함께 계산하여 중복 파일 확인에 사용.
+    """
+
+    def __init__(self, fileobj, max_size: int = None):
+        self.fileobj = fileobj
+        self.max_size = max_size
+        self.bytes_read = 0
+        self.sha256 = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.fileobj.read(size)
+        self.bytes_read += len(data)
+        if self.max_size and self.bytes_read > self.max_size:
+            raise UploadTooLargeError(self.max_size)
+        self.sha256.update(data)
+        return data
+
+
+class S3UploadStore:
+    """
+    업로드 파일을 S3 스테이징 경로에 저장. Celery 태스크에는 파일 대신 키만 전달됨.
+    """
+
+    def __init__(self, s3_service: S3Service):
+        self.s3_service = s3_service
+
+    def save(self, data: bytes, file_name: str) -> str:
+        key = _staging_key(file_name)
+        self.s3_service.put_object(key, data)
+        return key
+
+    def save_stream(self, fileobj, file_name: str, max_size: int = None) -> StagedFile:
+        """
+        파일 객체를 메모리에 모두 올리지 않고 멀티파트로 스테이징 경로에 업로드
+        """
+        key = _staging_key(file_name)
+        reader = LimitedReader(fileobj, max_size)
+        self.s3_service.upload_stream(
+            reader,
+            key,
+            part_size=Config.UPLOAD_PART_SIZE,
+            max_concurrency=Config.UPLOAD_PART_CONCURRENCY,
+        )
+        return StagedFile(key, reader.sha256.hexdigest(), reader.bytes_read)
+
+    def load(self, key: str) -> bytes:
+        return self.s3_service.get_object(key)
+
+    def delete(self, key: str):
+        self.s3_service.delete_key(key)
+
+    def publish(self, key: str, file_name: str) -> str:
+        """
+        스테이징 파일을 공개 경로로 옮기고 URL 반환 (S3 내부 복사)
+        """
+        return self.s3_service.copy_file(key, file_name)
+
+
+class LocalUploadStore:
+    """
+    API와 워커가 공유하는 로컬 볼륨에 업로드 파일을 저장 (개발/테스트용)
+    """
+
+    def __init__(self, root_dir: str, s3_service: S3Service):
+        self.root_dir = root_dir
+        self.s3_service = s3_service
+
+    def _path(self, key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root_dir, key))
+        if not path.startswith(os.path.abspath(self.root_dir) + os.sep):
+            raise ValueError(f"Invalid staging key: {key}")
+        return path
+
+    def save(self, data: bytes, file_name: str) -> str:
+        key = _staging_key(file_name)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return key
+
+    def save_stream(self, fileobj, file_name: str, max_size: int = None) -> StagedFile:
+        key = _staging_key(file_name)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        reader = LimitedReader(fileobj, max_size)
+        try:
+            with open(path, "wb") as f:
+                shutil.copyfileobj(reader, f, Config.UPLOAD_PART_SIZE)
+        except Exception:
+            self.delete(key)
+            raise
+        return StagedFile(key, reader.sha256.hexdigest(), reader.bytes_read)
+
+    def load(self, key: str) -> bytes:
+        with open(self._path(key), "rb") as f:
+            return f.read()
+
+    def delete(self, key: str):
+        path = self._path(key)
+        if os.path.exists(path):
+            os.remove(path)
+        try:
+            os.rmdir(os.path.dirname(path))
+        except OSError:
+            pass
+
+    def publish(self, key: str, file_name: str) -> str:
+        with open(self._path(key), "rb") as f:
+            return self.s3_service.upload_file(f, file_name)
+
+
+def get_upload_store():
+    """
+    UPLOAD_STORAGE 설정에 따라 업로드 스테이징 저장소 생성 (s3 | local)
+    """
+    s3_service = S3Service()
+    if Config.UPLOAD_STORAGE == "local":
+        return LocalUploadStore(Config.UPLOAD_STAGING_DIR, s3_service)
+    return S3UploadStore(s3_service)
+
+
+upload_store = get_upload_store()
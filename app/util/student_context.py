@@ -0,0 +1,236 @@
+import json
+import logging
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from config import Config
+from util.cache import make_key
+from util.tokens import count_tokens, truncate_tokens
+
+logger = logging.getLogger(__name__)
+
+# 카테고리별로 context에 넣을 생활기록부 섹션 (순서대로)
+CATEGORY_SECTIONS = {
+    "performance": ("교과학습발달상황",),
+    "summary": ("독서활동상황", "창의적 체험활동상황", "행동특성 및 종합의견", "자격증 및 인증 취득상황"),
+    "counseling": ("인적사항", "교과학습발달상황", "행동특성 및 종합의견"),
+    "recommendation": ("진로희망사항", "교과학습발달상황", "독서활동상황", "수상경력"),
+}
+
+ACADEMIC_SECTION = "교과학습발달상황"
+
+# 예산을 넘을 때 요약하는 서술형 항목 (섹션 / 교과학습발달상황의 학년별 항목)
+SUMMARY_SECTIONS = ("행동특성 및 종합의견",)
+SUMMARY_GRADE_KEYS = ("세부능력 및 특기사항",)
+
+# 요약 후에도 예산을 넘을 때 비율대로 줄이는 서술형 항목
+FREE_TEXT_SECTIONS = ("창의적 체험활동상황", "독서활동상황", "행동특성 및 종합의견")
+FREE_TEXT_GRADE_KEYS = ("세부능력 및 특기사항", "특기사항")
+
+# 쪽마다 반복되는 머리말/꼬리말 판별 기준: 숫자를 정규화한 BOILERPLATE_WINDOW 단어 묶음이
+# BOILERPLATE_MIN_REPEATS개 이상의 항목에 나타나고 숫자(날짜, 쪽 번호, 문서번호)를 포함하면 제거
+BOILERPLATE_WINDOW = 6
+BOILERPLATE_MIN_REPEATS = 3
+DIGITS_PATTERN = re.compile(r"\d+")
+
+Slot = Tuple[Any, Any]  # (컨테이너, 키) - container[key]가 문자열
+
+
+class ContextSnapshot(NamedTuple):
+    content: str
+    token_count: int
+
+
+def context_cache_key(record_id: int, category: str) -> str:
+    return make_key("context", record_id, category)
+
+
+def compact(value: Any) -> Any:
+    """
+    OCR 결과의 공백을 정리하고 빈 값(빈 문자열/목록/딕셔너리)을 제거. 남는 내용이 없으면 None.
+    """
+    if isinstance(value, str):
+        return " ".join(value.split()) or None
+    if isinstance(value, dict):
+        items = {key: compact(item) for key, item in value.items()}
+        return {key: item for key, item in items.items() if item is not None} or None
+    if isinstance(value, (list, tuple)):
+        items = [compact(item) for item in value]
+        return [item for item in items if item is not None] or None
+    return value
+
+
+def _string_slots(value: Any) -> Iterator[Slot]:
+    items = value.items() if isinstance(value, dict) else enumerate(value) if isinstance(value, list) else ()
+    for key, item in items:
+        if isinstance(item, str):
+            yield value, key
+        else:
+            yield from _string_slots(item)
+
+
+def strip_boilerplate(value: Any) -> Any:
+    """
+    EXCLUDE_PATTERN이 놓친 머리말/꼬리말(OCR 띄어쓰기 차이 등)을 제거.
+    여러 항목에 반복되는 숫자 포함 단어 묶음만 지우므로, 한 항목 안의 반복(수상 목록 등)이나
+    숫자 없는 상투 표현은 남음.
+    """
+    slots = list(_string_slots(value))
+    words = [container[key].split() for container, key in slots]
+    normalized = [[DIGITS_PATTERN.sub("#", word) for word in slot_words] for slot_words in words]
+
+    counts = Counter()
+    for slot_words in normalized:
+        counts.update({
+            tuple(slot_words[i:i + BOILERPLATE_WINDOW]) for i in range(len(slot_words) - BOILERPLATE_WINDOW + 1)
+        })
+
+    for (container, key), slot_words, slot_normalized in zip(slots, words, normalized):
+        covered = [False] * len(slot_words)
+        for i in range(len(slot_words) - BOILERPLATE_WINDOW + 1):
+            if counts[tuple(slot_normalized[i:i + BOILERPLATE_WINDOW])] >= BOILERPLATE_MIN_REPEATS:
+                covered[i:i + BOILERPLATE_WINDOW] = [True] * BOILERPLATE_WINDOW
+        if not any(covered):
+            continue
+
+        kept = []
+        i = 0
+        while i < len(slot_words):
+            if not covered[i]:
+                kept.append(slot_words[i])
+                i += 1
+                continue
+            j = i
+            while j < len(slot_words) and covered[j]:
+                j += 1
+            run = slot_words[i:j]
+            if not any(DIGITS_PATTERN.search(word) for word in run):
+                kept.extend(run)
+            i = j
+        container[key] = " ".join(kept)
+    return compact(value)
+
+
+def _free_text_slots(filtered: dict, sections: tuple, grade_keys: tuple) -> Iterator[Slot]:
+    for name in sections:
+        if isinstance(filtered.get(name), str):
+            yield filtered, name
+    academic = filtered.get(ACADEMIC_SECTION)
+    if isinstance(academic, dict):
+        for grade_data in academic.values():
+            if not isinstance(grade_data, dict):
+                continue
+            for grade_key in grade_keys:
+                items = grade_data.get(grade_key)
+                if isinstance(items, list):
+                    yield from ((items, index) for index, item in enumerate(items) if isinstance(item, str))
+
+
+def _dumps(filtered: dict) -> str:
+    return json.dumps(filtered, ensure_ascii=False, separators=(",", ":"))
+
+
+def _summarize_long_texts(filtered: dict, budget: int, summarize: Callable[[str], str]):
+    """
+    예산을 넘으면 긴 세특/행동특성 항목부터 요약문으로 바꿈 (세특의 "과목: " 머리는 유지)
+    """
+    total = count_tokens(_dumps(filtered))
+    slots = sorted(
+        ((count_tokens(container[key]), container, key)
+         for container, key in _free_text_slots(filtered, SUMMARY_SECTIONS, SUMMARY_GRADE_KEYS)),
+        key=lambda slot: -slot[0],
+    )
+    for tokens, container, key in slots:
+        if total <= budget or tokens < Config.CONTEXT_SUMMARY_MIN_TOKENS:
+            return
+        prefix, text = "", container[key]
+        if isinstance(key, int):
+            label, separator, rest = text.partition(": ")
+            if separator:
+                prefix, text = label + separator, rest
+        try:
+            summary = " ".join((summarize(text) or "").split())
+        except Exception as e:
+            logger.warning(f"Failed to summarize student record passage: {e}")
+            return
+        summarized = prefix + summary
+        summarized_tokens = count_tokens(summarized)
+        if summary and summarized_tokens < tokens:
+            container[key] = summarized
+            total -= tokens - summarized_tokens
+
+
+def _trim_free_texts(filtered: dict, budget: int):
+    """
+    그래도 예산을 넘으면 서술형 항목을 줄여 모든 항목(과목)이 context에 남도록 함.
+    짧은 항목은 그대로 두고 긴 항목부터 같은 길이(cap)로 자름.
+    """
+    excess = count_tokens(_dumps(filtered)) - budget
+    if excess <= 0:
+        return
+    slots = sorted(
+        ((count_tokens(container[key]), container, key)
+         for container, key in _free_text_slots(filtered, FREE_TEXT_SECTIONS, FREE_TEXT_GRADE_KEYS)),
+        key=lambda slot: slot[0],
+    )
+    remaining = sum(tokens for tokens, _, _ in slots) - excess
+    cap = None
+    for index, (tokens, _, _) in enumerate(slots):
+        if tokens * (len(slots) - index) > remaining:
+            cap = max(remaining, 0) // (len(slots) - index)
+            break
+        remaining -= tokens
+    if cap is None:
+        return
+    for tokens, container, key in slots:
+        if tokens > cap:
+            container[key] = truncate_tokens(container[key], cap).rstrip() + "…"
+
+
+def render_context(sections: Dict[str, Any], category: str,
+                   summarize: Optional[Callable[[str], str]] = None) -> ContextSnapshot:
+    """
+    카테고리에 필요한 섹션만 골라 압축한 context 문자열과 토큰 수를 생성.
+    sections는 머리말/꼬리말을 제거한 값(render_contexts 참고)이어야 함.
+    (예산 초과 시) 긴 서술형 요약 → 비율대로 축약 순으로 카테고리별 토큰 예산(CONTEXT_TOKEN_BUDGETS)에 맞춤.
+    """
+    budget = Config.CONTEXT_TOKEN_BUDGETS[category]
+    filtered = {}
+    for name in CATEGORY_SECTIONS[category]:
+        value = compact(sections.get(name))
+        if value is not None:
+            filtered[name] = value
+
+    if summarize is not None:
+        _summarize_long_texts(filtered, budget, summarize)
+    _trim_free_texts(filtered, budget)
+
+    content = truncate_tokens(_dumps(filtered), budget)
+    return ContextSnapshot(content, count_tokens(content))
+
+
+def render_outline(sections: Dict[str, Any], category: str) -> dict:
+    """
+    서술형 항목을 뺀 카테고리 context (성적, 인적사항, 진로희망 등). 질문과 관련된 문단을 검색해 붙일 때 사용.
+    """
+    filtered = compact({name: sections.get(name) for name in CATEGORY_SECTIONS[category] if name not in FREE_TEXT_SECTIONS})
+    academic = (filtered or {}).get(ACADEMIC_SECTION)
+    if isinstance(academic, dict):
+        for grade_data in academic.values():
+            if isinstance(grade_data, dict):
+                for key in FREE_TEXT_GRADE_KEYS:
+                    grade_data.pop(key, None)
+    return compact(filtered) or {}
+
+
+def render_contexts(sections: Dict[str, Any],
+                    summarize: Optional[Callable[[str], str]] = None,
+                    categories: Iterable[str] = CATEGORY_SECTIONS) -> Dict[str, ContextSnapshot]:
+    """
+    카테고리별 context를 생성 (생활기록부 저장 시 한 번 계산).
+    머리말/꼬리말은 문서 전체 기준으로 한 번만 제거하고(카테고리별로 다시 판별하면 학년마다 반복되는
+    정상 항목까지 지워짐), 요약문은 캐시되어 카테고리 간에 재사용됨.
+    """
+    sections = strip_boilerplate(compact(sections) or {}) or {}
+    return {category: render_context(sections, category, summarize) for category in categories}
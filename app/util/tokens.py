@@ -0,0 +1,61 @@
+import logging
+import math
+
+try:
+    import tiktoken
+except ImportError:  # tiktoken이 없으면 근사치 사용
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# gpt-4o 계열이 사용하는 인코딩
+ENCODING_NAME = "o200k_base"
+
+_encoding = None
+_encoding_loaded = False
+
+
+def get_encoding():
+    """
+    tiktoken 인코딩을 한 번만 로드. 인코딩 파일을 받을 수 없는 환경에서는 None.
+    """
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        _encoding_loaded = True
+        if tiktoken is not None:
+            try:
+                _encoding = tiktoken.get_encoding(ENCODING_NAME)
+            except Exception as e:
+                logger.warning(f"tiktoken encoding unavailable, using estimate: {e}")
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """
+    텍스트의 토큰 수를 반환. tiktoken을 쓸 수 없으면 근사치
+    (영문/숫자 4글자당 1토큰, 한글 등 그 외 문자는 1글자당 1토큰).
+    """
+    if not text:
+        return 0
+    encoding = get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text))
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    텍스트를 앞에서부터 max_tokens 토큰까지만 남김 (count_tokens와 같은 기준)
+    """
+    if count_tokens(text) <= max_tokens:
+        return text
+    encoding = get_encoding()
+    if encoding is not None:
+        return encoding.decode(encoding.encode(text)[:max_tokens], errors="ignore")
+    used = 0.0
+    for index, ch in enumerate(text):
+        used += 0.25 if ord(ch) < 128 else 1
+        if used > max_tokens:
+            return text[:index]
+    return text